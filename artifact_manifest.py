@@ -0,0 +1,248 @@
+"""
+프로젝트별 산출물(artifact) 목록
+단계 사이에 txt 파일(tts_file_list.txt, transition_video_log.txt 등)을 주고받는 대신
+생성된 파일을 종류, 길이, 해시, 부모 산출물과 함께 SQLite에 기록하고 키로 조회
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from file_hash import file_sha256
+
+ARTIFACT_DB_PATH = os.getenv("ARTIFACT_DB_PATH", os.path.join("cache", "artifacts.sqlite3"))
+
+# 산출물 종류
+ARTIFACT_KINDS = ("audio", "video", "subtitle", "render_plan", "image")
+
+# 단계 사이에서 주고받는 대표 키
+KEY_TTS_SCENE = "tts_scene"            # 7단계 장면별 TTS (scene_number로 구분)
+KEY_COMBINED_TTS = "combined_tts"      # 장면별 TTS를 이어 붙인 내레이션 트랙
+KEY_TRANSITION_VIDEO = "transition_video"  # 6단계 트랜지션(+BGM) 영상
+KEY_RENDER_PLAN = "render_plan"        # 6단계 렌더 계획 (8단계 단일 패스 렌더링용)
+KEY_SUBTITLE = "subtitle"              # 8단계 자막
+KEY_FINAL_VIDEO = "final_video"        # 8단계 최종 영상
+
+
+@dataclass
+class Artifact:
+    """단계가 만든 파일 하나"""
+    artifact_id: str
+    project_id: str
+    key: str
+    kind: str
+    path: str
+    url: Optional[str] = None
+    duration: Optional[float] = None
+    sha256: Optional[str] = None
+    size: Optional[int] = None
+    parents: List[str] = field(default_factory=list)  # 이 파일을 만드는 데 사용한 산출물 ID
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def exists(self) -> bool:
+        return bool(self.path) and os.path.exists(self.path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ArtifactManifest:
+    """SQLite 기반 산출물 목록 (워커 스레드에서도 사용 가능)"""
+
+    def __init__(self, db_path: str = ARTIFACT_DB_PATH):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+        """
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    artifact_id TEXT PRIMARY KEY,
+                    project_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    url TEXT,
+                    duration REAL,
+                    sha256 TEXT,
+                    size INTEGER,
+                    parents TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_key ON artifacts (project_id, key, created_at)")
+
+    @staticmethod
+    def _row_to_artifact(row: sqlite3.Row) -> Artifact:
+        return Artifact(
+            artifact_id=row["artifact_id"],
+            project_id=row["project_id"],
+            key=row["key"],
+            kind=row["kind"],
+            path=row["path"],
+            url=row["url"],
+            duration=row["duration"],
+            sha256=row["sha256"],
+            size=row["size"],
+            parents=json.loads(row["parents"]),
+            metadata=json.loads(row["metadata"]),
+            created_at=row["created_at"]
+        )
+
+    def register(
+        self,
+        project_id: str,
+        key: str,
+        kind: str,
+        path: str,
+        url: Optional[str] = None,
+        duration: Optional[float] = None,
+        parents: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        compute_hash: bool = True
+    ) -> Artifact:
+        """
+        생성된 파일을 산출물로 기록
+
+        Args:
+            project_id: 프로젝트 ID
+            key: 단계 사이에서 조회할 키 (KEY_* 상수)
+            kind: 산출물 종류 (ARTIFACT_KINDS)
+            path: 파일 경로 (절대 경로로 저장)
+            url: 브라우저에서 접근할 URL
+            duration: 길이 (초, 오디오/비디오)
+            parents: 입력으로 사용한 산출물 ID 목록
+            metadata: 단계별 추가 정보 (장면 번호, 원본 텍스트, BGM 설정 등)
+            compute_hash: 파일 내용 해시 계산 여부
+
+        Returns:
+            Artifact: 기록된 산출물
+        """
+        if kind not in ARTIFACT_KINDS:
+            raise ValueError(f"알 수 없는 산출물 종류입니다: {kind}")
+        path = os.path.abspath(path)
+        size = os.path.getsize(path) if os.path.exists(path) else None
+        sha256 = file_sha256(path) if compute_hash and size is not None else None
+
+        artifact = Artifact(
+            artifact_id=uuid.uuid4().hex,
+            project_id=project_id,
+            key=key,
+            kind=kind,
+            path=path,
+            url=url,
+            duration=duration,
+            sha256=sha256,
+            size=size,
+            parents=list(parents or []),
+            metadata=dict(metadata or {})
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO artifacts (
+                    artifact_id, project_id, key, kind, path, url, duration,
+                    sha256, size, parents, metadata, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    artifact.artifact_id, project_id, key, kind, path, url, duration,
+                    sha256, size, json.dumps(artifact.parents),
+                    json.dumps(artifact.metadata, ensure_ascii=False, default=str), artifact.created_at
+                )
+            )
+        return artifact
+
+    def get(self, project_id: str, key: str, must_exist: bool = True) -> Optional[Artifact]:
+        """
+        키로 가장 최근 산출물 조회
+
+        Args:
+            project_id: 프로젝트 ID
+            key: 산출물 키
+            must_exist: 파일이 지워진 산출물은 건너뛸지 여부
+
+        Returns:
+            Optional[Artifact]: 산출물 (없으면 None)
+        """
+        for artifact in self.list(project_id, key=key):
+            if not must_exist or artifact.exists:
+                return artifact
+        return None
+
+    def get_by_id(self, artifact_id: str) -> Optional[Artifact]:
+        """산출물 ID로 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM artifacts WHERE artifact_id = ?", (artifact_id,)).fetchone()
+        return self._row_to_artifact(row) if row else None
+
+    def list(self, project_id: Optional[str] = None, key: Optional[str] = None, kind: Optional[str] = None) -> List[Artifact]:
+        """조건에 맞는 산출물 목록 (최신순)"""
+        conditions, values = [], []
+        for column, value in (("project_id", project_id), ("key", key), ("kind", kind)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        query = "SELECT * FROM artifacts"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC"
+        with self._lock:
+            rows = self._conn.execute(query, values).fetchall()
+        return [self._row_to_artifact(row) for row in rows]
+
+    def project_ids(self) -> List[str]:
+        """산출물이 기록된 프로젝트 ID 목록 (프로젝트 저장소가 비어 있어도 조회 가능)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT project_id FROM artifacts").fetchall()
+        return [row["project_id"] for row in rows]
+
+    def latest_generation(self, project_id: str, key: str) -> List[Artifact]:
+        """
+        가장 최근 실행에서 같은 키로 기록된 산출물 묶음 (예: 7단계 장면별 TTS 전체)
+        metadata의 "generation" 값이 같은 산출물을 생성 순서대로 반환
+        """
+        artifacts = self.list(project_id, key=key)
+        if not artifacts:
+            return []
+        generation = artifacts[0].metadata.get("generation")
+        same_generation = [a for a in artifacts if a.metadata.get("generation") == generation]
+        return sorted(same_generation, key=lambda a: (a.metadata.get("order", 0), a.created_at))
+
+    def remove(self, project_id: str, key: Optional[str] = None) -> int:
+        """프로젝트 산출물 기록 삭제 (파일은 그대로 둠)"""
+        with self._lock, self._conn:
+            if key is None:
+                cursor = self._conn.execute("DELETE FROM artifacts WHERE project_id = ?", (project_id,))
+            else:
+                cursor = self._conn.execute("DELETE FROM artifacts WHERE project_id = ? AND key = ?", (project_id, key))
+        return cursor.rowcount
+
+    def remove_path(self, path: str) -> int:
+        """파일 경로를 가리키는 산출물 기록 삭제 (파일이 정리된 뒤 호출)"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM artifacts WHERE path = ?", (os.path.abspath(path),))
+        return cursor.rowcount
+
+
+_artifact_manifest: Optional[ArtifactManifest] = None
+
+
+def get_artifact_manifest() -> ArtifactManifest:
+    """공용 산출물 목록 인스턴스 반환"""
+    global _artifact_manifest
+    if _artifact_manifest is None:
+        _artifact_manifest = ArtifactManifest(ARTIFACT_DB_PATH)
+    return _artifact_manifest
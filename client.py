@@ -15,24 +15,24 @@ from models import (
 # LLM 유틸리티 함수들을 별도 파일에서 import
 from workflows import (
     generate_persona, create_ad_concept,
-    generate_scene_prompts, generate_images_sequentially
+    generate_scene_prompts, generate_images_concurrently
 )
 
 # TTS 관련 함수들을 별도 파일에서 import
 from storyboard_to_tts import generate_complete_tts_from_scratch
 
+# 프로젝트별 단계 결과 저장소
+from project_store import DEFAULT_PROJECT_ID, ProjectState, get_project_store
+
 # 웹 애플리케이션 객체 생성
 app = FastAPI(title="Storyboard API", version="1.0.0")
 
-# 전역 변수로 데이터 임시 저장
-current_project = {
-    "persona": None,
-    "reference_images": [],
-    "analyzed_images": None,
-    "ad_concept": None,
-    "user_video_input": None,
-    "storyboard": None
-}
+def _load_project(project_id: str) -> ProjectState:
+    """프로젝트 ID로 단계 결과 조회 (없으면 새로 생성, 잘못된 ID면 400)"""
+    try:
+        return get_project_store().get(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/")
 async def root():
@@ -44,12 +44,13 @@ async def root():
 # ==================================================================================
 
 @app.post("/step1/target-customer")
-async def submit_target_customer(customer: TargetCustomer):
+async def submit_target_customer(customer: TargetCustomer, project_id: str = DEFAULT_PROJECT_ID):
     """타겟 고객 정보를 받아 LLM으로 페르소나 생성"""
+    project = _load_project(project_id)
     # LLM으로 페르소나 생성
     persona_data = await generate_persona(customer)
     # 프로젝트 상태에 저장
-    current_project["persona"] = persona_data.model_dump()
+    project["persona"] = persona_data.model_dump()
     
     return {
         "message": "타겟 고객 분석하여 페르소나가 생성되었습니다.",
@@ -64,18 +65,19 @@ async def submit_target_customer(customer: TargetCustomer):
 이미지 분석이 들어가기 때문에 돈을 좀 더 받아서 이 기능을 하게 하는것도 좋을 거 같음
 """
 @app.post("/step2/generate-ad-concept-with-images")
-async def generate_ad_concept_with_images(reference_images: Optional[List[ReferenceImage]] = Body(None)):
-    if not current_project["persona"]:
+async def generate_ad_concept_with_images(reference_images: Optional[List[ReferenceImage]] = Body(None), project_id: str = DEFAULT_PROJECT_ID):
+    project = _load_project(project_id)
+    if not project["persona"]:
         raise HTTPException(status_code=400, detail="먼저 1단계를 완료해주세요.")
     
-    persona = PersonaData(**current_project["persona"])
+    persona = PersonaData(**project["persona"])
     
     processed_reference_images = []
     if reference_images:
-        current_project["reference_images"] = [img.model_dump() for img in reference_images]
+        project["reference_images"] = [img.model_dump() for img in reference_images]
         processed_reference_images = reference_images
     else:
-        current_project["reference_images"] = []
+        project["reference_images"] = []
     
     # LLM을 사용하여 광고 컨셉 생성
     concept_result = await create_ad_concept(persona, processed_reference_images)
@@ -83,8 +85,8 @@ async def generate_ad_concept_with_images(reference_images: Optional[List[Refere
     image_analyses_result = concept_result["image_analyses"]
 
     # 3. 현재 프로젝트 상태에 각각 저장
-    current_project["ad_concept"] = ad_concept
-    current_project["analyzed_images"] = image_analyses_result
+    project["ad_concept"] = ad_concept
+    project["analyzed_images"] = image_analyses_result
     
     return {
         "message": "참조 이미지 분석 및 광고 컨셉이 생성되었습니다.",
@@ -99,21 +101,22 @@ async def generate_ad_concept_with_images(reference_images: Optional[List[Refere
 사용자가 AI가 생성한 광고 컨셉을 보고 수정한 내용을 받음 ->사용자의 광고 아이디어
 """
 @app.post("/step3/video-input")
-async def set_user_video_input(video_input: UserVideoInput):
+async def set_user_video_input(video_input: UserVideoInput, project_id: str = DEFAULT_PROJECT_ID):
     """사용자가 광고 컨셉을 수정하여 최종 확정한 비디오 내용 입력"""
-    if not current_project["persona"]:
+    project = _load_project(project_id)
+    if not project["persona"]:
         raise HTTPException(status_code=400, detail="먼저 1단계를 완료해주세요.")
     
     # 사용자가 입력하지 않았거나 빈 문자열인 경우, 2단계 ad_concept을 기본값으로 사용
     if not video_input.user_description or not video_input.user_description.strip():
-        if current_project.get("ad_concept"):
-            video_input.user_description = current_project["ad_concept"]
+        if project.get("ad_concept"):
+            video_input.user_description = project["ad_concept"]
         else:
             raise HTTPException(status_code=400, detail="광고 컨셉이 없습니다. 먼저 2단계를 완료하거나 직접 입력해주세요.")
     
     # 사용자 입력 저장
-    current_project["user_video_input"] = video_input.model_dump()
-    stored_reference_images = current_project.get("analyzed_images", [])
+    project["user_video_input"] = video_input.model_dump()
+    stored_reference_images = project.get("analyzed_images", [])
     return {
         "message": "광고 영상 제작을 위한 최종 프롬프트가 저장되었습니다.",
         "video_input": video_input,
@@ -125,19 +128,20 @@ async def set_user_video_input(video_input: UserVideoInput):
     3단계 : LLM이 광고 영상 제작 아이디어를 보고 장면별 프롬프트를 생성
 """
 @app.post("/step3/generate-storyboard")
-async def generate_storyboard_prompts():
+async def generate_storyboard_prompts(project_id: str = DEFAULT_PROJECT_ID):
+    project = _load_project(project_id)
     # 필요한 데이터가 모두 있는지 확인
-    if not current_project["persona"]:
+    if not project["persona"]:
         raise HTTPException(status_code=400, detail="먼저 1단계(페르소나 생성)를 완료해주세요.")
     
-    if not current_project["user_video_input"]:
+    if not project["user_video_input"]:
         raise HTTPException(status_code=400, detail="사용자로부터 광고 영상 제작 아이디어를 입력받으세요.")
     
     # 모든 필요한 데이터 수집
-    persona_data = current_project.get("persona")
-    ad_concept = current_project.get("ad_concept", "")
-    user_input = current_project.get("user_video_input")
-    analyzed_images = current_project.get("analyzed_images", [])
+    persona_data = project.get("persona")
+    ad_concept = project.get("ad_concept", "")
+    user_input = project.get("user_video_input")
+    analyzed_images = project.get("analyzed_images", [])
 
     # 사용자 입력 데이터 추출
     user_input_text = user_input["user_description"]
@@ -183,7 +187,7 @@ async def generate_storyboard_prompts():
     )
     
     # StoryboardOutput 출력구조로 스토리보드 각 장면별 데이터 저장
-    current_project["storyboard"] = storyboard_prompts.model_dump()
+    project["storyboard"] = storyboard_prompts.model_dump()
     
     return {
         "message": "스토리보드가 성공적으로 생성되었습니다.",
@@ -196,17 +200,19 @@ async def generate_storyboard_prompts():
 
 @app.post("/step4/generate-images")
 async def run_image_generation(
-    scenes_input: Optional[List[SceneImagePrompt]] = Body(None, alias="scenes")
+    scenes_input: Optional[List[SceneImagePrompt]] = Body(None, alias="scenes"),
+    project_id: str = DEFAULT_PROJECT_ID  # 프로젝트 ID (없으면 기본 프로젝트)
 ):
     """스토리보드를 바탕으로 Runway API로 이미지 생성"""
+    project = _load_project(project_id)
     
     # --- 1. 생성할 장면 리스트 준비 ---
     scenes_to_process = []
     
     # 우선순위: 저장된 스토리보드 > 요청 본문
-    if current_project.get("storyboard"):
+    if project.get("storyboard"):
         print("✅ 저장된 스토리보드에서 장면을 가져와 이미지 생성을 시작합니다.")
-        storyboard_data = current_project["storyboard"]
+        storyboard_data = project["storyboard"]
         scenes_to_process = [SceneImagePrompt(**scene_data) for scene_data in storyboard_data.get("scenes", [])]
         print(f"📊 총 {len(scenes_to_process)}개 장면을 처리합니다.")
         
@@ -251,7 +257,7 @@ async def run_image_generation(
 
     # --- 3. Runway API 호출 ---
     try:
-        generated_images = await generate_images_sequentially(
+        generated_images = await generate_images_concurrently(
             scenes=scenes_to_process,
             api_key=runway_api_key
         )
@@ -262,9 +268,9 @@ async def run_image_generation(
         total_scenes = len(generated_images)
         success_rate = f"{(successful_count / total_scenes) * 100:.1f}%" if total_scenes > 0 else "0%"
 
-        # 🔥 4단계 결과를 current_project에 저장 (5단계에서 사용하기 위함)
-        current_project["images"] = generated_images
-        print(f"✅ 4단계 결과를 current_project에 저장했습니다. ({successful_count}개 성공)")
+        # 🔥 4단계 결과를 프로젝트 상태에 저장 (5단계에서 사용하기 위함)
+        project["images"] = generated_images
+        print(f"✅ 4단계 결과를 프로젝트 상태에 저장했습니다. ({successful_count}개 성공)")
 
         return {
             "message": "스토리보드 이미지 생성이 완료되었습니다.",
@@ -285,27 +291,28 @@ async def run_image_generation(
 새로운 단계: 사용자가 생성한 스토리보드를 기반으로 TTS 대본과 오디오 파일을 생성
 """
 @app.post("/video/create-tts-from-storyboard")
-async def create_tts_from_storyboard():
+async def create_tts_from_storyboard(project_id: str = DEFAULT_PROJECT_ID):
     """스토리보드를 기반으로 TTS 대본 및 오디오 생성"""
+    project = _load_project(project_id)
     
     # 필요한 데이터가 모두 있는지 확인
-    if not current_project.get("persona"):
+    if not project.get("persona"):
         raise HTTPException(status_code=400, detail="먼저 1단계(페르소나 생성)를 완료해주세요.")
     
-    if not current_project.get("storyboard"):
+    if not project.get("storyboard"):
         raise HTTPException(status_code=400, detail="먼저 스토리보드를 생성해주세요.")
     
     try:
-        # current_project에서 필요한 데이터 추출
-        persona_data = current_project.get("persona", {})
-        storyboard_data = current_project.get("storyboard", {})
+        # 프로젝트 상태에서 필요한 데이터 추출
+        persona_data = project.get("persona", {})
+        storyboard_data = project.get("storyboard", {})
         
         # 페르소나 정보 추출
         persona_description = persona_data.get("persona_description", "")
         marketing_insights = persona_data.get("marketing_insights", "")
         
         # 광고 컨셉 추출 (2단계에서 생성된 것 또는 기본값)
-        ad_concept = current_project.get("ad_concept", "효과적인 광고 컨셉")
+        ad_concept = project.get("ad_concept", "효과적인 광고 컨셉")
         
         # 스토리보드 장면 추출
         storyboard_scenes = storyboard_data.get("scenes", [])
@@ -327,8 +334,8 @@ async def create_tts_from_storyboard():
             storyboard_scenes=storyboard_scenes
         )
         
-        # 결과를 current_project에 저장
-        current_project["tts_result"] = tts_result
+        # 결과를 프로젝트 상태에 저장
+        project["tts_result"] = tts_result
         
         return {
             "message": "TTS 대본 및 오디오 생성이 완료되었습니다.",
@@ -348,29 +355,41 @@ async def create_tts_from_storyboard():
 # 유틸리티 엔드포인트들
 # ==================================================================================
 
+@app.post("/projects")
+async def create_project(project_id: Optional[str] = None):
+    """새 프로젝트 생성 (ID를 주지 않으면 자동 발급) - 이후 각 단계 요청에 project_id로 전달"""
+    try:
+        project = get_project_store().create(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "message": "새 프로젝트가 생성되었습니다.",
+        "project_id": project.project_id
+    }
+
+@app.get("/projects")
+async def list_projects():
+    """저장된 프로젝트 목록과 완료된 단계"""
+    return {"projects": get_project_store().list()}
+
 @app.get("/project")
-async def get_current_project():
-    """현재 프로젝트의 모든 데이터 반환"""
+async def get_current_project(project_id: str = DEFAULT_PROJECT_ID):
+    """프로젝트의 모든 데이터 반환 (이전 단계 결과를 다시 생성하지 않고 조회)"""
+    project = _load_project(project_id)
     return {
         "message": "현재 프로젝트 상태입니다.",
-        "project": current_project
+        "project_id": project_id,
+        "project": project
     }
 
 @app.delete("/project/reset")
-async def reset_project():
+async def reset_project(project_id: str = DEFAULT_PROJECT_ID):
     """프로젝트 초기화"""
-    global current_project
-    current_project = {
-        "persona": None,
-        "reference_images": [],
-        "analyzed_images": None,
-        "ad_concept": None,
-        "user_video_input": None,
-        "storyboard": None
-    }
+    _load_project(project_id).reset()
     
     return {
-        "message": "프로젝트가 초기화되었습니다."
+        "message": "프로젝트가 초기화되었습니다.",
+        "project_id": project_id
     }
 
 # ==================================================================================
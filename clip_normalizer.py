@@ -0,0 +1,197 @@
+"""
+정규화 클립 캐시
+트랜지션에 들어가는 클립을 목표 해상도/fps/픽셀 포맷으로 FFmpeg scale 한 번에 맞춰 두고
+(원본 내용 해시, 목표 크기)로 저장해 같은 클립을 다시 변환하지 않음
+트랜지션 코드는 이미 목표 크기인 프레임을 받으므로 프레임마다 cv2.resize를 하지 않음
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ffmpeg_executor import FFMPEG_MAX_CONCURRENCY, run_ffmpeg
+from file_hash import file_sha256
+from media_probe import probe_media
+from mp4_validator import validate_video_file
+from video_models import VideoConfig
+
+NORMALIZED_CLIP_CACHE_DIR = os.getenv("NORMALIZED_CLIP_CACHE_DIR", os.path.join("cache", "normalized_clips"))
+NORMALIZED_CLIP_CACHE_MAX_MB = int(os.getenv("NORMALIZED_CLIP_CACHE_MAX_MB", "2048"))
+NORMALIZED_CLIP_PRESET = os.getenv("NORMALIZED_CLIP_PRESET", "fast")
+NORMALIZED_CLIP_CRF = int(os.getenv("NORMALIZED_CLIP_CRF", "18"))
+NORMALIZED_PIX_FMT = "yuv420p"
+
+
+class NormalizedClipCache:
+    """(원본 SHA-256, 목표 크기, fps, 픽셀 포맷) 기준 정규화 클립 캐시 - 용량 초과시 LRU 방식으로 정리"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Args:
+            cache_dir: 정규화된 클립을 저장할 디렉토리
+            max_bytes: 캐시 최대 용량 (바이트)
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}  # (경로, 수정 시각, 크기) → 내용 해시
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(source_sha256: str, size: Tuple[int, int], fps: float, pix_fmt: str = NORMALIZED_PIX_FMT) -> str:
+        """캐시 키 생성 (결과 영상에 영향을 주는 인코딩 설정도 포함)"""
+        key_source = json.dumps({
+            "source_sha256": source_sha256,
+            "size": list(size),
+            "fps": float(fps),
+            "pix_fmt": pix_fmt,
+            "preset": NORMALIZED_CLIP_PRESET,
+            "crf": NORMALIZED_CLIP_CRF
+        }, sort_keys=True)
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def _source_hash(self, path: str) -> str:
+        """원본 내용 해시 (파일이 바뀌지 않았으면 다시 읽지 않음)"""
+        stat = os.stat(path)
+        stat_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(stat_key)
+        if cached is None:
+            cached = file_sha256(path)
+            with self._lock:
+                self._hashes[stat_key] = cached
+        return cached
+
+    def normalize(
+        self,
+        path: str,
+        size: Tuple[int, int] = (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT),
+        fps: float = VideoConfig.FPS,
+        ffmpeg_path: str = "ffmpeg"
+    ) -> Optional[str]:
+        """
+        클립을 목표 크기/fps/픽셀 포맷으로 맞춘 파일 경로 반환
+
+        Args:
+            path: 원본 클립 경로
+            size: 목표 (가로, 세로)
+            fps: 목표 fps
+            ffmpeg_path: FFmpeg 실행 파일 경로
+
+        Returns:
+            Optional[str]: 이미 맞으면 원본 경로, 아니면 캐시된 정규화 클립 경로 (변환 실패시 None)
+        """
+        width, height = size
+        info = probe_media(path, ffmpeg_path)
+        if (
+            info["width"] == width and info["height"] == height and info["pix_fmt"] == NORMALIZED_PIX_FMT
+            and info["fps"] and abs(info["fps"] - fps) < 0.01
+        ):
+            return path
+
+        key = self.make_key(self._source_hash(path), size, fps)
+        cached_path = self._path(key)
+        if os.path.exists(cached_path):
+            os.utime(cached_path, None)  # 최근 사용 시각 갱신 (LRU)
+            print(f"💾 정규화 클립 캐시 적중: {os.path.basename(path)}")
+            return cached_path
+
+        temp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp.mp4"
+        cmd = [
+            ffmpeg_path, '-y', '-i', path, '-map', '0:v:0', '-map', '0:a:0?',
+            '-vf', f"fps={fps},scale={width}:{height},format={NORMALIZED_PIX_FMT}",
+            '-c:v', 'libx264', '-preset', NORMALIZED_CLIP_PRESET, '-crf', str(NORMALIZED_CLIP_CRF),
+            '-c:a', 'aac', '-movflags', '+faststart', temp_path
+        ]
+        try:
+            result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=300)
+            if result.returncode != 0:
+                print(f"⚠️ 클립 정규화 실패 ({os.path.basename(path)}): {result.stderr[-300:]}")
+                return None
+            is_valid, error = validate_video_file(temp_path)
+            if not is_valid:
+                print(f"⚠️ 정규화 클립 검증 실패 ({os.path.basename(path)}): {error}")
+                return None
+            os.replace(temp_path, cached_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        print(f"📐 클립 정규화 완료: {os.path.basename(path)} → {width}x{height}@{fps:g}")
+        self.evict()
+        return cached_path
+
+    def evict(self):
+        """최대 용량을 넘으면 가장 오래 사용하지 않은 클립부터 삭제"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            for filename in os.listdir(self.cache_dir):
+                if not filename.endswith(".mp4") or filename.endswith(".tmp.mp4"):
+                    continue
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+            if total_size <= self.max_bytes:
+                return
+
+            removed = 0
+            for _, size, path in sorted(entries):  # 최근 사용 시각이 오래된 순
+                if total_size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                removed += 1
+
+            print(f"🧹 정규화 클립 캐시 정리: {removed}개 삭제 (현재 {total_size / (1024 * 1024):.1f} MB)")
+
+
+_normalized_clip_cache: Optional[NormalizedClipCache] = None
+_normalized_clip_cache_lock = threading.Lock()
+
+
+def get_normalized_clip_cache() -> NormalizedClipCache:
+    """공용 정규화 클립 캐시 인스턴스 반환"""
+    global _normalized_clip_cache
+    with _normalized_clip_cache_lock:
+        if _normalized_clip_cache is None:
+            _normalized_clip_cache = NormalizedClipCache(NORMALIZED_CLIP_CACHE_DIR, NORMALIZED_CLIP_CACHE_MAX_MB * 1024 * 1024)
+        return _normalized_clip_cache
+
+
+def normalize_clip(
+    path: str,
+    size: Tuple[int, int] = (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT),
+    fps: float = VideoConfig.FPS,
+    ffmpeg_path: str = "ffmpeg"
+) -> str:
+    """클립을 목표 크기/fps로 맞춘 경로 (변환에 실패하면 원본 경로를 그대로 반환)"""
+    try:
+        return get_normalized_clip_cache().normalize(path, size, fps, ffmpeg_path) or path
+    except OSError as e:
+        print(f"⚠️ 클립 정규화 오류 ({os.path.basename(path)}): {e}")
+        return path
+
+
+def normalize_clips(
+    paths: List[str],
+    size: Tuple[int, int] = (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT),
+    fps: float = VideoConfig.FPS,
+    ffmpeg_path: str = "ffmpeg"
+) -> List[str]:
+    """여러 클립을 동시에 정규화 (동시 실행 수는 공용 FFmpeg 실행기가 제한)"""
+    with ThreadPoolExecutor(max_workers=max(1, min(FFMPEG_MAX_CONCURRENCY, len(paths)))) as pool:
+        return list(pool.map(lambda path: normalize_clip(path, size, fps, ffmpeg_path), paths))
@@ -6,12 +6,10 @@ load_dotenv()
 
 import asyncio
 import os
-import subprocess
 import re
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import tempfile
-import httpx
 
 # 기존 모듈들 import
 from workflows import generate_scene_prompts, generate_images_sequentially, generate_persona, create_ad_concept
@@ -19,6 +17,8 @@ from models import StoryboardOutput, ReferenceImageWithDescription, TargetCustom
 from tts_utils import create_tts_audio, get_recommended_voice, detect_language, TTSConfig
 from subtitle_utils import transcribe_audio_with_whisper, add_subtitles_to_video_ffmpeg, SubtitleResult
 from video_merger import VideoTransitionMerger
+from whisper_cache import transcribe_with_cache
+from ffmpeg_executor import run_ffmpeg_async
 import time
 
 class FullVideoWorkflow:
@@ -210,7 +210,8 @@ class FullVideoWorkflow:
                         if subtitle_result.success:
                             # FFmpeg로 자막을 비디오에 합성
                             from subtitle_utils import add_subtitles_to_video_ffmpeg
-                            final_result = add_subtitles_to_video_ffmpeg(
+                            final_result = await asyncio.to_thread(
+                                add_subtitles_to_video_ffmpeg,
                                 video_file_path=merged_video_path,
                                 subtitle_file_path=subtitle_result.subtitle_file_path,
                                 language="ko"
@@ -380,12 +381,7 @@ class FullVideoWorkflow:
                     temp_merged_audio
                 ]
                 
-                result = subprocess.run(
-                    concat_cmd,
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8'
-                )
+                result = await run_ffmpeg_async(concat_cmd)  # 공용 실행기 (이벤트 루프를 막지 않음)
                 
                 if result.returncode != 0:
                     raise Exception(f"FFmpeg 음성 합치기 실패: {result.stderr}")
@@ -395,61 +391,43 @@ class FullVideoWorkflow:
             # 2단계: Whisper로 전사하여 .srt 생성
             print("🤖 Whisper AI로 음성 전사 및 .srt 생성 중...")
             
-            # OpenAI Whisper API 호출
-            headers = {
-                "Authorization": f"Bearer {self.api_keys['openai']}"
-            }
+            # OpenAI Whisper API 호출 (같은 음성이면 캐시된 .srt 응답 사용)
+            srt_content = await transcribe_with_cache(
+                temp_merged_audio,
+                self.api_keys['openai'],
+                response_format="srt",  # .srt 형식으로 직접 요청
+                language="ko"  # 한국어로 설정
+            )
             
-            with open(temp_merged_audio, "rb") as audio_file:
-                files = {
-                    "file": audio_file,
-                    "model": (None, "whisper-1"),
-                    "response_format": (None, "srt"),  # .srt 형식으로 직접 요청
-                    "language": (None, "ko")  # 한국어로 설정
-                }
-                
-                async with httpx.AsyncClient(timeout=120.0) as client:
-                    response = await client.post(
-                        "https://api.openai.com/v1/audio/transcriptions",
-                        headers=headers,
-                        files=files
-                    )
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"Whisper API 호출 실패: {response.status_code} - {response.text}")
-                    
-                    # .srt 형식의 응답 직접 저장
-                    srt_content = response.text
-                    
-                    # .srt 파일 저장
-                    os.makedirs(os.path.dirname(output_srt_path), exist_ok=True)
-                    with open(output_srt_path, "w", encoding="utf-8") as f:
-                        f.write(srt_content)
-                    
-                    print(f"✅ .srt 자막 파일 생성 완료: {output_srt_path}")
-                    
-                    # 3단계: 임시 파일 정리
-                    if temp_merged_audio != tts_audio_files[0]:  # 합친 파일인 경우에만 삭제
-                        try:
-                            os.remove(temp_merged_audio)
-                        except:
-                            pass
-                    
-                    # 전사된 텍스트 추출 (SRT에서 타임스탬프 제거)
-                    import re
-                    transcription_lines = []
-                    for line in srt_content.split('\n'):
-                        if not re.match(r'^\d+$', line.strip()) and not re.match(r'^[\d:,\s\-\>]+$', line.strip()) and line.strip():
-                            transcription_lines.append(line.strip())
-                    
-                    transcription = ' '.join(transcription_lines)
-                    
-                    return SubtitleResult(
-                        success=True,
-                        subtitle_file_path=output_srt_path,
-                        transcription=transcription,
-                        language="ko"
-                    )
+            # .srt 파일 저장
+            os.makedirs(os.path.dirname(output_srt_path), exist_ok=True)
+            with open(output_srt_path, "w", encoding="utf-8") as f:
+                f.write(srt_content)
+            
+            print(f"✅ .srt 자막 파일 생성 완료: {output_srt_path}")
+            
+            # 3단계: 임시 파일 정리
+            if temp_merged_audio != tts_audio_files[0]:  # 합친 파일인 경우에만 삭제
+                try:
+                    os.remove(temp_merged_audio)
+                except:
+                    pass
+            
+            # 전사된 텍스트 추출 (SRT에서 타임스탬프 제거)
+            import re
+            transcription_lines = []
+            for line in srt_content.split('\n'):
+                if not re.match(r'^\d+$', line.strip()) and not re.match(r'^[\d:,\s\-\>]+$', line.strip()) and line.strip():
+                    transcription_lines.append(line.strip())
+            
+            transcription = ' '.join(transcription_lines)
+            
+            return SubtitleResult(
+                success=True,
+                subtitle_file_path=output_srt_path,
+                transcription=transcription,
+                language="ko"
+            )
         
         except Exception as e:
             error_msg = f"TTS에서 .srt 생성 실패: {e}"
@@ -0,0 +1,104 @@
+"""
+트랜지션 효과음 뱅크
+effect/*.mp3를 한 번만 디코딩해 NumPy 배열로 메모리에 두고 트랜지션마다 잘라서 사용
+(트랜지션마다 AudioFileClip을 만들며 FFmpeg 리더 프로세스를 띄우지 않음)
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from ffmpeg_executor import run_ffmpeg
+from transition_renderer import TRANSITION_AUDIO_RATE, TRANSITION_EFFECT_SOUNDS
+
+EFFECT_SOUND_CHANNELS = 2
+
+
+class EffectSoundBank:
+    """디코딩한 효과음 샘플(float32, 스테레오)을 경로별로 보관 (워커 스레드에서도 사용 가능)"""
+
+    def __init__(self, sample_rate: int = TRANSITION_AUDIO_RATE, ffmpeg_path: str = "ffmpeg"):
+        """
+        Args:
+            sample_rate: 디코딩할 샘플레이트
+            ffmpeg_path: FFmpeg 실행 파일 경로
+        """
+        self.sample_rate = sample_rate
+        self.ffmpeg_path = ffmpeg_path
+        self._sounds: Dict[str, Optional[np.ndarray]] = {}  # 디코딩 실패한 파일은 None으로 기록해 다시 시도하지 않음
+        self._lock = threading.Lock()
+
+    def _decode(self, path: str) -> Optional[np.ndarray]:
+        """효과음 파일을 (샘플 수, 채널) float32 배열로 디코딩"""
+        if not os.path.exists(path):
+            print(f"⚠️ 효과음 파일이 없습니다: {path}")
+            return None
+        cmd = [
+            self.ffmpeg_path, '-v', 'error', '-i', path, '-vn',
+            '-f', 'f32le', '-acodec', 'pcm_f32le', '-ac', str(EFFECT_SOUND_CHANNELS), '-ar', str(self.sample_rate), 'pipe:1'
+        ]
+        result = run_ffmpeg(cmd, capture_output=True, text=False, timeout=30)
+        if result.returncode != 0 or not result.stdout:
+            print(f"⚠️ 효과음 디코딩 실패 ({os.path.basename(path)}): {result.stderr.decode('utf-8', errors='replace')[-300:]}")
+            return None
+        samples = np.frombuffer(result.stdout, dtype='<f4').reshape(-1, EFFECT_SOUND_CHANNELS).astype(np.float32)
+        samples.setflags(write=False)  # 여러 트랜지션이 같은 배열을 잘라 쓰므로 읽기 전용
+        return samples
+
+    def get(self, path: str) -> Optional[np.ndarray]:
+        """
+        효과음 샘플 반환 (처음 요청할 때 한 번만 디코딩)
+
+        Args:
+            path: 효과음 파일 경로
+
+        Returns:
+            Optional[np.ndarray]: (샘플 수, 2) float32 배열, 파일이 없거나 디코딩 실패시 None
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            if key in self._sounds:
+                return self._sounds[key]
+        samples = self._decode(path)
+        with self._lock:
+            self._sounds[key] = samples
+        return samples
+
+    def slice(self, path: str, duration: float) -> Optional[np.ndarray]:
+        """효과음 앞부분을 duration초만큼 자른 샘플 (효과음이 더 짧으면 전체, 복사하지 않음)"""
+        samples = self.get(path)
+        if samples is None:
+            return None
+        return samples[:max(1, int(round(duration * self.sample_rate)))]
+
+    def preload(self, paths=None) -> Dict[str, Optional[float]]:
+        """
+        효과음 미리 디코딩 (서버 시작시 호출)
+
+        Args:
+            paths: 효과음 경로 목록 (None이면 트랜지션 효과음 전체)
+
+        Returns:
+            Dict[str, Optional[float]]: 경로별 길이 (초, 실패시 None)
+        """
+        durations = {}
+        for path in paths or TRANSITION_EFFECT_SOUNDS.values():
+            samples = self.get(path)
+            durations[path] = len(samples) / self.sample_rate if samples is not None else None
+        loaded = sum(1 for duration in durations.values() if duration is not None)
+        print(f"🔊 트랜지션 효과음 {loaded}/{len(durations)}개 메모리에 로드")
+        return durations
+
+
+_effect_sound_bank: Optional[EffectSoundBank] = None
+_effect_sound_bank_lock = threading.Lock()
+
+
+def get_effect_sound_bank() -> EffectSoundBank:
+    """공용 효과음 뱅크 인스턴스 반환"""
+    global _effect_sound_bank
+    with _effect_sound_bank_lock:
+        if _effect_sound_bank is None:
+            _effect_sound_bank = EffectSoundBank()
+        return _effect_sound_bank
@@ -9,12 +9,18 @@ import shutil
 import tempfile
 from typing import Optional
 from video_tts_subtitle_api import api_create_enhanced_video
+from media_index import get_media_index, index_media_file
 
 app = FastAPI(title="TTS + Whisper AI 자막 통합 서비스", version="1.0.0")
 
 # 정적 파일 서빙
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+@app.on_event("startup")
+async def sync_media_index():
+    """서버 시작시 static/ 디렉토리를 한 번 훑어 미디어 인덱스와 맞춤"""
+    get_media_index().reconcile()
+
 @app.get("/")
 async def root():
     return {
@@ -63,6 +69,7 @@ async def create_video_with_tts_subtitles(
             pass
         
         if result["success"]:
+            index_media_file(os.path.join("static", "videos", result["output_filename"]))
             return JSONResponse(content={
                 "success": True,
                 "message": "비디오 생성 완료",
@@ -107,6 +114,7 @@ async def create_video_with_existing_video(
         )
         
         if result["success"]:
+            index_media_file(os.path.join("static", "videos", result["output_filename"]))
             return JSONResponse(content={
                 "success": True,
                 "message": "비디오 생성 완료",
@@ -144,20 +152,15 @@ async def download_file(filename: str):
 async def list_videos():
     """사용 가능한 비디오 파일 목록"""
     try:
-        video_dir = os.path.join("static", "videos")
-        if not os.path.exists(video_dir):
-            return {"videos": []}
-        
-        videos = []
-        for filename in os.listdir(video_dir):
-            if filename.endswith(('.mp4', '.avi', '.mov')):
-                file_path = os.path.join(video_dir, filename)
-                file_size = os.path.getsize(file_path)
-                videos.append({
-                    "filename": filename,
-                    "size": file_size,
-                    "url": f"/static/videos/{filename}"
-                })
+        entries = get_media_index().query(category="videos", extensions=[".mp4", ".avi", ".mov"])
+        videos = [
+            {
+                "filename": entry["filename"],
+                "size": entry["size"],
+                "url": entry["url"]
+            }
+            for entry in entries
+        ]
         
         return {"videos": videos}
         
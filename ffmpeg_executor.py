@@ -0,0 +1,181 @@
+"""
+FFmpeg 작업 실행기
+동시에 실행되는 FFmpeg 인코딩 수를 CPU 코어 수에 맞춰 제한하고, async 코드에서는 이벤트 루프를 막지 않고 실행
+"""
+import asyncio
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# libx264는 인코딩 하나가 여러 스레드를 쓰므로 기본값은 코어 수의 절반
+FFMPEG_MAX_CONCURRENCY = int(os.getenv("FFMPEG_MAX_CONCURRENCY", str(max(1, (os.cpu_count() or 2) // 2))))
+
+
+class FFmpegExecutor:
+    """프로세스 전체에서 공유하는 FFmpeg 실행 슬롯 관리자 (스레드/이벤트 루프 모두에서 사용 가능)"""
+
+    def __init__(self, max_concurrency: int = FFMPEG_MAX_CONCURRENCY):
+        """
+        Args:
+            max_concurrency: 동시에 실행할 최대 FFmpeg 프로세스 수
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self.running = 0  # 실행 중인 작업 수
+        self.waiting = 0  # 슬롯을 기다리는 작업 수
+        self.completed = 0  # 완료된 작업 수
+
+    def _enter(self):
+        with self._lock:
+            self.waiting -= 1
+            self.running += 1
+
+    def _exit(self):
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+        self._slots.release()
+
+    @contextmanager
+    def slot(self):
+        """
+        슬롯 하나를 잡고 있는 동안 실행 (다른 프로세스에 맡긴 FFmpeg 작업도 공용 동시 실행 한도에 포함시킬 때 사용)
+
+        예: with get_ffmpeg_executor().slot(): pool.submit(task).result()
+        """
+        with self._lock:
+            self.waiting += 1
+        self._slots.acquire()
+        self._enter()
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def run(
+        self,
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        capture_output: bool = True,
+        text: bool = True,
+        **kwargs
+    ) -> subprocess.CompletedProcess:
+        """
+        슬롯을 얻은 뒤 FFmpeg 실행 (subprocess.run과 같은 인자/결과, 작업 스레드에서 호출)
+
+        Args:
+            cmd: 실행할 명령
+            timeout: 최대 실행 시간 (초, 슬롯 대기 시간은 제외)
+            check: 실패시 CalledProcessError 발생 여부
+            capture_output: 표준 출력/오류 캡처 여부
+            text: 출력을 문자열로 받을지 여부
+            **kwargs: subprocess.run에 그대로 전달할 추가 인자 (env, encoding 등)
+
+        Returns:
+            subprocess.CompletedProcess: 실행 결과
+        """
+        with self.slot():
+            return subprocess.run(cmd, capture_output=capture_output, text=text, timeout=timeout, check=check, **kwargs)
+
+    async def run_async(
+        self,
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        text: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        이벤트 루프를 막지 않고 FFmpeg 실행 (asyncio.create_subprocess_exec 사용)
+
+        Args:
+            cmd: 실행할 명령
+            timeout: 최대 실행 시간 (초, 슬롯 대기 시간은 제외)
+            check: 실패시 CalledProcessError 발생 여부
+            text: 출력을 문자열로 받을지 여부
+
+        Returns:
+            subprocess.CompletedProcess: 실행 결과
+        """
+        with self._lock:
+            self.waiting += 1
+        # 슬롯이 빌 때까지 이벤트 루프를 양보하며 대기 (대기 중 취소되면 대기 수만 되돌림)
+        wait_seconds = 0.05
+        try:
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(wait_seconds)
+                wait_seconds = min(wait_seconds * 2, 1.0)
+        except BaseException:
+            with self._lock:
+                self.waiting -= 1
+            raise
+        self._enter()
+
+        try:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            except NotImplementedError:
+                # Windows SelectorEventLoop 등 서브프로세스를 지원하지 않는 루프에서는 스레드로 실행
+                return await asyncio.to_thread(
+                    subprocess.run, cmd, capture_output=True, text=text, timeout=timeout, check=check
+                )
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                # 시간 초과뿐 아니라 요청이 취소된 경우에도 FFmpeg 프로세스를 종료하고 회수
+                if process.returncode is None:
+                    process.kill()
+                await asyncio.shield(process.wait())
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                raise subprocess.TimeoutExpired(cmd, timeout)
+
+            if text:
+                stdout = stdout.decode('utf-8', errors='replace')
+                stderr = stderr.decode('utf-8', errors='replace')
+            result = subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+            if check:
+                result.check_returncode()
+            return result
+        finally:
+            self._exit()
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 실행/대기 중인 작업 수"""
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": self.running,
+                "waiting": self.waiting,
+                "completed": self.completed
+            }
+
+
+_executor: Optional[FFmpegExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_ffmpeg_executor() -> FFmpegExecutor:
+    """공용 FFmpeg 실행기 인스턴스 반환"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FFmpegExecutor()
+            print(f"⚙️ FFmpeg 실행기 준비: 최대 동시 작업 {_executor.max_concurrency}개")
+        return _executor
+
+
+def run_ffmpeg(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """공용 실행기로 FFmpeg 실행 (동기 코드/작업 스레드용, subprocess.run과 같은 인자)"""
+    return get_ffmpeg_executor().run(cmd, **kwargs)
+
+
+async def run_ffmpeg_async(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """공용 실행기로 FFmpeg 실행 (async 코드용, 이벤트 루프를 막지 않음)"""
+    return await get_ffmpeg_executor().run_async(cmd, **kwargs)
@@ -0,0 +1,13 @@
+"""
+파일 내용 해시 (Whisper 캐시, 산출물 목록, 정규화 클립 캐시에서 공용으로 사용)
+"""
+import hashlib
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,411 @@
+"""
+백그라운드 작업 큐
+오래 걸리는 파이프라인 단계(5, 6, 8단계)를 작업 ID로 접수하고 제한된 수의 워커에서 실행
+작업 상태는 SQLite에 저장되어 서버가 재시작되어도 대기 중인 작업이 다시 실행됨
+"""
+import asyncio
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "2"))  # 동시에 실행할 최대 작업 수
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join("cache", "jobs.sqlite3"))
+# 재시작 복구시 작업별 최대 실행 시도 횟수 (프로세스를 죽이는 작업이 재시작마다 반복 실행되지 않도록)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# 현재 실행 중인 작업 (asyncio 태스크와 asyncio.to_thread 스레드로 전파됨)
+_current_job: contextvars.ContextVar[Optional["Job"]] = contextvars.ContextVar("current_job", default=None)
+
+
+class Job:
+    """작업 하나의 상태와 결과"""
+
+    def __init__(
+        self,
+        job_id: str,
+        kind: str,
+        params: Optional[Dict[str, Any]] = None,
+        status: str = "queued",
+        progress: int = 0,
+        current_step: str = "",
+        current_file: str = "",
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Dict[str, Any]] = None,
+        created_at: Optional[float] = None,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        attempts: int = 0
+    ):
+        self.job_id = job_id
+        self.kind = kind
+        self.params = params or {}
+        self.status = status
+        self.progress = progress
+        self.current_step = current_step
+        self.current_file = current_file
+        self.result = result
+        self.error = error
+        self.created_at = created_at or time.time()
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.attempts = attempts  # 실행 시도 횟수 (재시작 후 다시 실행되면 증가)
+        self.recovered = False  # 서버 재시작 후 저장소에서 복구된 작업인지 여부
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 딕셔너리 (진행률, 소요 시간, 결과 URL 포함)"""
+        now = time.time()
+        timings = {
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queued_seconds": round((self.started_at or now) - self.created_at, 2),
+            "elapsed_seconds": round((self.finished_at or now) - self.started_at, 2) if self.started_at else None
+        }
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "current_step": self.current_step,
+            "current_file": self.current_file,
+            "timings": timings,
+            "attempts": self.attempts,
+            "result_urls": collect_result_urls(self.result),
+            "result": self.result,
+            "error": self.error
+        }
+
+
+def collect_result_urls(result: Any) -> List[str]:
+    """작업 결과에서 'url'로 끝나는 키의 값(영상/파일 URL)을 모두 추출"""
+    urls = []
+
+    def visit(value: Any, key: str = ""):
+        if isinstance(value, dict):
+            for child_key, child_value in value.items():
+                visit(child_value, str(child_key))
+        elif isinstance(value, list):
+            for item in value:
+                visit(item, key)
+        elif isinstance(value, str) and key.lower().endswith("url") and value and value not in urls:
+            urls.append(value)
+
+    visit(result)
+    return urls
+
+
+class JobStore:
+    """SQLite 기반 작업 저장소 (워커 스레드에서도 사용 가능)"""
+
+    def __init__(self, db_path: str = JOB_DB_PATH):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+        """
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    current_step TEXT NOT NULL DEFAULT '',
+                    current_file TEXT NOT NULL DEFAULT '',
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            job_id=row["job_id"],
+            kind=row["kind"],
+            params=json.loads(row["params"]),
+            status=row["status"],
+            progress=row["progress"],
+            current_step=row["current_step"],
+            current_file=row["current_file"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=json.loads(row["error"]) if row["error"] else None,
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            attempts=row["attempts"]
+        )
+
+    def save(self, job: Job):
+        """작업 전체 상태 저장 (없으면 추가)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO jobs (
+                    job_id, kind, params, status, progress, current_step, current_file,
+                    result, error, created_at, started_at, finished_at, attempts
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job.job_id, job.kind, json.dumps(job.params, ensure_ascii=False, default=str),
+                    job.status, job.progress, job.current_step, job.current_file,
+                    json.dumps(job.result, ensure_ascii=False, default=str) if job.result is not None else None,
+                    json.dumps(job.error, ensure_ascii=False, default=str) if job.error is not None else None,
+                    job.created_at, job.started_at, job.finished_at, job.attempts
+                )
+            )
+
+    def save_progress(self, job: Job):
+        """진행 상태만 저장 (실행 중 자주 호출됨)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, current_step = ?, current_file = ? WHERE job_id = ?",
+                (job.progress, job.current_step, job.current_file, job.job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """최근 작업 목록 (최신순)"""
+        with self._lock:
+            if status:
+                rows = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def pending(self) -> List[Job]:
+        """완료되지 않은 작업 목록 (접수 순서대로, 재시작 복구용)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+
+JobHandler = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    """제한된 수의 asyncio 워커로 작업을 실행하는 큐"""
+
+    def __init__(self, store: JobStore, max_workers: int = JOB_MAX_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS):
+        """
+        Args:
+            store: 작업 상태를 저장할 JobStore
+            max_workers: 동시에 실행할 최대 작업 수
+            max_attempts: 재시작 복구시 작업별 최대 실행 시도 횟수 (넘으면 실패 처리)
+        """
+        self.store = store
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, Job] = {}  # 대기/실행 중인 작업 (진행 상태를 메모리에서 바로 조회)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: JobHandler):
+        """
+        작업 종류별 실행 함수 등록
+
+        Args:
+            kind: 작업 종류 (예: "step5", "step6", "step8")
+            handler: Job을 받아 결과 딕셔너리를 반환하는 async 함수
+        """
+        self._handlers[kind] = handler
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """워커 시작 및 이전 실행에서 끝나지 않은 작업 복구"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+
+        recovered = failed = 0
+        for job in self.store.pending():
+            if job.attempts >= self.max_attempts:
+                # 실행 도중 서버가 죽은 횟수가 한도에 도달한 작업은 다시 실행하지 않고 실패 처리
+                job.status = "failed"
+                job.error = {
+                    "status_code": 500,
+                    "detail": f"작업이 {job.attempts}번 실행 도중 중단되어 더 이상 재시도하지 않습니다. (JOB_MAX_ATTEMPTS={self.max_attempts})"
+                }
+                job.current_step = "오류 발생"
+                job.finished_at = time.time()
+                self.store.save(job)
+                failed += 1
+                print(f"❌ 작업 복구 중단: {job.kind} ({job.job_id}) - 시도 {job.attempts}회")
+                continue
+            job.status = "queued"
+            job.progress = 0
+            job.current_step = "서버 재시작 후 다시 대기 중"
+            job.recovered = True
+            self.store.save(job)
+            self._jobs[job.job_id] = job
+            self._queue.put_nowait(job.job_id)
+            recovered += 1
+
+        self._workers = [asyncio.create_task(self._worker(i + 1)) for i in range(self.max_workers)]
+        print(
+            f"🧵 작업 큐 시작: 워커 {self.max_workers}개 "
+            f"(복구된 작업 {recovered}개, 시도 한도 초과 {failed}개, 저장소: {self.store.db_path})"
+        )
+
+    async def stop(self):
+        """워커 종료 (실행 중이던 작업은 다음 시작 때 다시 실행됨)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        작업 접수 (즉시 반환, 실행은 워커가 담당)
+
+        Args:
+            kind: 등록된 작업 종류
+            params: 작업 실행에 필요한 값 (JSON으로 저장 가능해야 함)
+
+        Returns:
+            Job: 접수된 작업
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류입니다: {kind}")
+        if not self._workers:
+            await self.start()
+
+        job = Job(job_id=uuid.uuid4().hex, kind=kind, params=params or {})
+        job.current_step = "대기 중"
+        self.store.save(job)
+        self._jobs[job.job_id] = job
+        self._queue.put_nowait(job.job_id)
+        print(f"📥 작업 접수: {kind} ({job.job_id}) - 대기 {self._queue.qsize()}개")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회 (대기/실행 중이면 메모리, 끝났으면 저장소에서)"""
+        return self._jobs.get(job_id) or self.store.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """워커 수와 대기/실행 중인 작업 수"""
+        active = list(self._jobs.values())
+        return {
+            "max_workers": self.max_workers,
+            "queued": sum(1 for job in active if job.status == "queued"),
+            "running": sum(1 for job in active if job.status == "running")
+        }
+
+    async def _worker(self, worker_number: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id) or self.store.get(job_id)
+                if job:
+                    await self._run_job(job, worker_number)
+            finally:
+                self._jobs.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _run_job(self, job: Job, worker_number: int):
+        handler = self._handlers.get(job.kind)
+        job.status = "running"
+        job.started_at = time.time()
+        job.finished_at = None
+        job.attempts += 1
+        job.current_step = "실행 중"
+        self.store.save(job)
+        print(f"▶️ 작업 시작 [워커 {worker_number}]: {job.kind} ({job.job_id})")
+
+        token = _current_job.set(job)
+        try:
+            if handler is None:
+                raise ValueError(f"등록되지 않은 작업 종류입니다: {job.kind}")
+            result = await handler(job)
+            job.result = result if isinstance(result, dict) else {"result": result}
+            job.status = "succeeded"
+            job.progress = 100
+            job.current_step = "완료"
+        except asyncio.CancelledError:
+            # 서버 종료로 중단된 작업은 대기 상태로 남겨 다음 시작 때 다시 실행 (정상 종료는 시도 횟수에서 제외)
+            job.status = "queued"
+            job.attempts -= 1
+            self.store.save(job)
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = {
+                "status_code": getattr(e, "status_code", 500),
+                "detail": getattr(e, "detail", None) or str(e)
+            }
+            job.current_step = "오류 발생"
+            print(f"❌ 작업 실패: {job.kind} ({job.job_id}) - {job.error['detail']}")
+            if not hasattr(e, "status_code"):
+                traceback.print_exc()
+        finally:
+            _current_job.reset(token)
+
+        job.finished_at = time.time()
+        self.store.save(job)
+        print(f"✅ 작업 종료: {job.kind} ({job.job_id}) - {job.status}, {job.finished_at - job.started_at:.1f}초")
+
+
+def report_job_progress(current_step: Optional[str] = None, progress: Optional[int] = None, current_file: Optional[str] = None):
+    """
+    현재 실행 중인 작업의 진행 상태 갱신 (작업 밖에서 호출되면 무시)
+
+    Args:
+        current_step: 현재 단계 설명
+        progress: 진행률 (0-100)
+        current_file: 처리 중인 파일
+    """
+    job = _current_job.get()
+    if job is None:
+        return
+    if current_step is not None:
+        job.current_step = current_step
+    if progress is not None:
+        job.progress = int(progress)
+    if current_file is not None:
+        job.current_file = current_file
+    if _job_queue is not None:
+        try:
+            _job_queue.store.save_progress(job)
+        except sqlite3.Error as e:
+            print(f"⚠️ 작업 진행 상태 저장 실패: {e}")
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """공용 작업 큐 인스턴스 반환"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(JobStore(JOB_DB_PATH), JOB_MAX_WORKERS)
+    return _job_queue
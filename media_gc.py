@@ -0,0 +1,288 @@
+"""
+생성된 미디어 정리 (static/ 보존 정책)
+나이와 전체 용량 한도를 넘은 파일을 오래된 순으로 삭제하되,
+살아 있는 프로젝트가 참조하는 산출물(각 키의 최신 산출물과 그 부모, 프로젝트 상태에 기록된 파일)은 지우지 않음
+6단계 렌더 계획 디렉토리(cache/render_plans/<출력 이름>)도 참조되지 않으면 통째로 삭제
+"""
+import asyncio
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from artifact_manifest import KEY_TTS_SCENE, get_artifact_manifest
+from media_index import get_media_index
+from project_store import get_project_store
+from render_plan import RENDER_PLAN_DIR, RENDER_PLAN_FILENAME
+
+MEDIA_GC_MAX_AGE_HOURS = float(os.getenv("MEDIA_GC_MAX_AGE_HOURS", "72"))  # 0이면 나이 제한 없음
+MEDIA_GC_MAX_BYTES = int(float(os.getenv("MEDIA_GC_MAX_GB", "5")) * 1024 ** 3)  # 0이면 용량 제한 없음
+MEDIA_GC_GRACE_SECONDS = int(os.getenv("MEDIA_GC_GRACE_SECONDS", "900"))  # 방금 만든(작업 중일 수 있는) 파일 보호
+MEDIA_GC_INTERVAL_SECONDS = int(os.getenv("MEDIA_GC_INTERVAL_SECONDS", "3600"))  # 0이면 주기 실행 안 함
+MEDIA_GC_CATEGORIES = tuple(
+    category.strip() for category in os.getenv("MEDIA_GC_CATEGORIES", "videos,audio").split(",") if category.strip()
+)
+
+
+def _collect_state_paths(value: Any, found: Set[str]):
+    """프로젝트 상태에 기록된 static/ 파일 경로와 URL 수집 (중첩된 dict/list 순회)"""
+    if isinstance(value, dict):
+        for item in value.values():
+            _collect_state_paths(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_state_paths(item, found)
+    elif isinstance(value, str) and "static/" in value.replace("\\", "/"):
+        rel_path = value.replace("\\", "/").split("static/", 1)[1].split("?", 1)[0]
+        found.add(os.path.abspath(os.path.join(get_media_index().root, *rel_path.split("/"))))
+
+
+class MediaGarbageCollector:
+    """참조를 확인하며 static/ 미디어를 정리하는 보존 정책"""
+
+    def __init__(
+        self,
+        max_age_hours: float = MEDIA_GC_MAX_AGE_HOURS,
+        max_bytes: int = MEDIA_GC_MAX_BYTES,
+        grace_seconds: int = MEDIA_GC_GRACE_SECONDS,
+        categories: tuple = MEDIA_GC_CATEGORIES,
+        render_plan_dir: str = RENDER_PLAN_DIR
+    ):
+        """
+        Args:
+            max_age_hours: 이보다 오래된 미참조 파일 삭제 (0이면 나이 제한 없음)
+            max_bytes: 대상 디렉토리 전체 용량 한도 (넘으면 오래된 미참조 파일부터 삭제, 0이면 제한 없음)
+            grace_seconds: 생성 후 이 시간 안의 파일은 참조가 없어도 보호
+            categories: 정리할 static/ 하위 디렉토리
+            render_plan_dir: 렌더 계획 디렉토리 (하위 디렉토리마다 원본 클립 + render_plan.json)
+        """
+        self.max_age_hours = max_age_hours
+        self.max_bytes = max_bytes
+        self.grace_seconds = grace_seconds
+        self.categories = categories
+        self.render_plan_dir = render_plan_dir
+        self._lock = threading.Lock()  # 주기 실행과 수동 실행이 겹치지 않도록
+        self._task: Optional[asyncio.Task] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def referenced_paths(self) -> Set[str]:
+        """
+        살아 있는 프로젝트가 참조하는 파일 경로 (절대 경로)
+
+        Returns:
+            Set[str]: 각 키의 최신 산출물과 그 부모 산출물, 프로젝트 상태에 기록된 파일
+        """
+        manifest = get_artifact_manifest()
+        referenced: Set[str] = set()
+        # 메모리 저장소는 재시작하면 비므로 산출물 목록에 남은 프로젝트도 살아 있는 것으로 취급
+        project_ids = [summary["project_id"] for summary in get_project_store().list()]
+        project_ids += [project_id for project_id in manifest.project_ids() if project_id not in project_ids]
+        for project_id in project_ids:
+            project = get_project_store().get(project_id, create=False)
+            if project is not None:
+                _collect_state_paths(dict(project), referenced)
+
+            # 키별 최신 산출물 (장면별 TTS는 최근 실행 묶음 전체)
+            live = {}
+            for artifact in manifest.list(project_id):
+                if artifact.key == KEY_TTS_SCENE or artifact.key in live:
+                    continue
+                live[artifact.key] = artifact
+            pending = list(live.values()) + manifest.latest_generation(project_id, KEY_TTS_SCENE)
+
+            # 부모 산출물까지 따라가며 보호
+            seen: Set[str] = set()
+            while pending:
+                artifact = pending.pop()
+                if artifact.artifact_id in seen:
+                    continue
+                seen.add(artifact.artifact_id)
+                referenced.add(os.path.abspath(artifact.path))
+                for parent_id in artifact.parents:
+                    parent = manifest.get_by_id(parent_id)
+                    if parent is not None:
+                        pending.append(parent)
+        return referenced
+
+    def _collect_render_plans(self, referenced: Set[str], now: float, dry_run: bool) -> Dict[str, Any]:
+        """
+        참조되지 않는 렌더 계획 디렉토리 정리
+        프로젝트마다 최신 render_plan 산출물(과 최신 최종 영상의 부모)만 참조되므로 이전 계획은 유예 시간이 지나면 삭제
+
+        Returns:
+            Dict: 렌더 계획 정리 결과 (삭제 대상 디렉토리, 해제 용량)
+        """
+        candidates, failed = [], []
+        protected_count = 0
+        if os.path.isdir(self.render_plan_dir):
+            for name in sorted(os.listdir(self.render_plan_dir)):
+                plan_dir = os.path.abspath(os.path.join(self.render_plan_dir, name))
+                if not os.path.isdir(plan_dir):
+                    continue
+                plan_path = os.path.join(plan_dir, RENDER_PLAN_FILENAME)
+                try:
+                    stats = [os.stat(os.path.join(plan_dir, f)) for f in os.listdir(plan_dir)]
+                    modified_at = max([os.path.getmtime(plan_dir)] + [stat.st_mtime for stat in stats])
+                    size = sum(stat.st_size for stat in stats)
+                except OSError:
+                    continue
+                if plan_path in referenced or now - modified_at < self.grace_seconds:
+                    protected_count += 1
+                    continue
+                candidates.append({
+                    "path": plan_dir,
+                    "size": size,
+                    "age_hours": round((now - modified_at) / 3600, 2)
+                })
+
+        deleted = []
+        if not dry_run:
+            manifest = get_artifact_manifest()
+            for candidate in candidates:
+                try:
+                    shutil.rmtree(candidate["path"])
+                    manifest.remove_path(os.path.join(candidate["path"], RENDER_PLAN_FILENAME))
+                    deleted.append(candidate)
+                except OSError as e:
+                    candidate["error"] = str(e)
+                    failed.append(candidate)
+
+        return {
+            "protected_dirs": protected_count,
+            "candidates": candidates,
+            "deleted_dirs": len(deleted),
+            "failed": failed,
+            "freed_bytes": sum(candidate["size"] for candidate in (candidates if dry_run else deleted))
+        }
+
+    def collect(self, dry_run: bool = True) -> Dict[str, Any]:
+        """
+        보존 정책 실행
+
+        Args:
+            dry_run: True면 삭제할 파일 목록만 계산하고 실제로 지우지 않음
+
+        Returns:
+            Dict: 정리 보고서 (삭제 대상/결과, 용량 변화, 보호된 파일 수)
+        """
+        with self._lock:
+            started_at = time.time()
+            media_index = get_media_index()
+            referenced = self.referenced_paths()
+
+            entries: List[Dict[str, Any]] = []
+            for category in self.categories:
+                entries.extend(media_index.query(category=category, order="oldest"))
+            entries.sort(key=lambda entry: entry["created_at"])
+
+            total_bytes = sum(entry["size"] for entry in entries)
+            remaining_bytes = total_bytes
+            max_age_seconds = self.max_age_hours * 3600
+            protected_count = 0
+            candidates = []
+
+            for entry in entries:
+                age_seconds = started_at - entry["created_at"]
+                if os.path.abspath(entry["path"]) in referenced or age_seconds < self.grace_seconds:
+                    protected_count += 1
+                    continue
+                if self.max_age_hours and age_seconds > max_age_seconds:
+                    reason = "age"
+                elif self.max_bytes and remaining_bytes > self.max_bytes:
+                    reason = "quota"
+                else:
+                    continue
+                remaining_bytes -= entry["size"]
+                candidates.append({
+                    "path": entry["path"],
+                    "url": entry["url"],
+                    "role": entry["role"],
+                    "size": entry["size"],
+                    "age_hours": round(age_seconds / 3600, 2),
+                    "reason": reason
+                })
+
+            deleted, failed = [], []
+            if not dry_run:
+                manifest = get_artifact_manifest()
+                for candidate in candidates:
+                    try:
+                        os.remove(candidate["path"])
+                        media_index.remove(candidate["path"])
+                        manifest.remove_path(candidate["path"])
+                        deleted.append(candidate)
+                    except FileNotFoundError:
+                        media_index.remove(candidate["path"])
+                        manifest.remove_path(candidate["path"])
+                    except OSError as e:
+                        candidate["error"] = str(e)
+                        failed.append(candidate)
+
+            freed_bytes = sum(candidate["size"] for candidate in (candidates if dry_run else deleted))
+            render_plans = self._collect_render_plans(referenced, started_at, dry_run)
+            report = {
+                "dry_run": dry_run,
+                "policy": {
+                    "max_age_hours": self.max_age_hours,
+                    "max_bytes": self.max_bytes,
+                    "grace_seconds": self.grace_seconds,
+                    "categories": list(self.categories),
+                    "render_plan_dir": self.render_plan_dir
+                },
+                "total_files": len(entries),
+                "total_bytes": total_bytes,
+                "protected_files": protected_count,
+                "candidates": candidates,
+                "deleted_files": len(deleted),
+                "failed": failed,
+                "freed_bytes": freed_bytes,
+                "bytes_after": total_bytes - freed_bytes,
+                "render_plans": render_plans,
+                "finished_at": time.time(),
+                "elapsed_seconds": round(time.time() - started_at, 3)
+            }
+            if not dry_run:
+                self.last_report = report
+                print(
+                    f"🧹 미디어 정리: {len(deleted)}개 삭제 ({freed_bytes / (1024 * 1024):.1f} MB), "
+                    f"보호 {protected_count}개, 실패 {len(failed)}개, "
+                    f"렌더 계획 {render_plans['deleted_dirs']}개 삭제 ({render_plans['freed_bytes'] / (1024 * 1024):.1f} MB)"
+                )
+            return report
+
+    async def _run_periodically(self, interval_seconds: int):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.collect, False)
+            except Exception as e:
+                print(f"⚠️ 미디어 정리 실패: {e}")
+
+    async def start(self, interval_seconds: int = MEDIA_GC_INTERVAL_SECONDS):
+        """주기적 정리 시작 (interval_seconds가 0이면 실행하지 않음)"""
+        if self._task or interval_seconds <= 0:
+            return
+        self._task = asyncio.create_task(self._run_periodically(interval_seconds))
+        print(
+            f"🧹 미디어 정리 주기 실행: {interval_seconds}초마다 "
+            f"(최대 {self.max_age_hours}시간, {self.max_bytes / 1024 ** 3:.1f} GB)"
+        )
+
+    async def stop(self):
+        """주기적 정리 중지"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_media_gc: Optional[MediaGarbageCollector] = None
+
+
+def get_media_gc() -> MediaGarbageCollector:
+    """공용 미디어 정리기 인스턴스 반환"""
+    global _media_gc
+    if _media_gc is None:
+        _media_gc = MediaGarbageCollector()
+    return _media_gc
@@ -0,0 +1,292 @@
+"""
+static/ 미디어 파일 인덱스
+요청마다 os.listdir + getctime으로 디렉토리 전체를 훑는 대신 SQLite 인덱스로
+"프로젝트 X의 최신 BGM", "프로젝트 X의 TTS 클립 순서대로" 같은 조회를 처리
+파일을 만드는 곳에서 바로 기록(write-through)하고, 서버 시작시 한 번 디렉토리와 맞춤
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", "static")
+MEDIA_INDEX_DB_PATH = os.getenv("MEDIA_INDEX_DB_PATH", os.path.join("cache", "media_index.sqlite3"))
+
+# 파일명 접두사로 구분하는 역할 (긴 접두사부터 비교)
+KNOWN_ROLES = (
+    "merged_ai_videos_with_bgm",
+    "merged_ai_videos",
+    "custom_subtitle_video",
+    "frame_transitions",
+    "tts_with_subtitle",
+    "combined_tts",
+    "suno_bgm",
+    "tts_list",
+    "tts",
+)
+
+_TRAILING_ID_PATTERN = re.compile(r'(_(\d+|[0-9a-f]{6,}))+$')
+
+
+def infer_role(filename: str) -> str:
+    """
+    파일명으로 역할 추정 (suno_bgm_1a2b3c4d.mp3 → suno_bgm, tts_1712345678901.mp3 → tts)
+
+    Args:
+        filename: 파일명
+
+    Returns:
+        str: 역할 (알 수 없으면 타임스탬프/ID를 뗀 파일명)
+    """
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    for role in sorted(KNOWN_ROLES, key=len, reverse=True):
+        if stem == role or stem.startswith(role + "_"):
+            return role
+    return _TRAILING_ID_PATTERN.sub("", stem) or stem
+
+
+class MediaIndex:
+    """static/ 아래 파일들의 SQLite 인덱스 (워커 스레드에서도 사용 가능)"""
+
+    def __init__(self, root: str = MEDIA_ROOT, db_path: str = MEDIA_INDEX_DB_PATH):
+        """
+        Args:
+            root: 인덱싱할 미디어 루트 디렉토리
+            db_path: SQLite 데이터베이스 파일 경로
+        """
+        self.root = os.path.abspath(root)
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS media (
+                    rel_path TEXT PRIMARY KEY,
+                    category TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    extension TEXT NOT NULL,
+                    project_id TEXT,
+                    sequence INTEGER,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_media_role ON media (category, role, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_media_project ON media (project_id, role, sequence, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_media_extension ON media (category, extension, created_at)")
+
+    def _relative_path(self, path: str) -> Optional[str]:
+        """루트 기준 상대 경로 (루트 밖이면 None)"""
+        abs_path = os.path.abspath(path)
+        if os.path.commonpath([abs_path, self.root]) != self.root:
+            return None
+        return os.path.relpath(abs_path, self.root).replace("\\", "/")
+
+    def _row_to_entry(self, row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        entry["path"] = os.path.join(self.root, *entry["rel_path"].split("/"))
+        entry["filename"] = os.path.basename(entry["rel_path"])
+        entry["url"] = f"/{os.path.basename(self.root)}/{entry['rel_path']}"
+        return entry
+
+    def add(
+        self,
+        path: str,
+        role: Optional[str] = None,
+        project_id: Optional[str] = None,
+        sequence: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        파일을 인덱스에 기록 (이미 있으면 갱신, 프로젝트/순서는 새 값이 있을 때만 덮어씀)
+
+        Args:
+            path: 파일 경로 (루트 밖의 파일은 무시)
+            role: 역할 (없으면 파일명으로 추정)
+            project_id: 파일을 만든 프로젝트 ID
+            sequence: 같은 역할 안에서의 순서 (장면 번호 등)
+
+        Returns:
+            Optional[Dict]: 기록된 항목 (기록하지 않았으면 None)
+        """
+        rel_path = self._relative_path(path)
+        if rel_path is None or "/" not in rel_path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        category = rel_path.split("/", 1)[0]
+        filename = os.path.basename(rel_path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO media (rel_path, category, role, extension, project_id, sequence, size, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(rel_path) DO UPDATE SET
+                    role = excluded.role,
+                    project_id = COALESCE(excluded.project_id, media.project_id),
+                    sequence = COALESCE(excluded.sequence, media.sequence),
+                    size = excluded.size
+                """,
+                (
+                    rel_path, category, role or infer_role(filename), os.path.splitext(filename)[1].lower(),
+                    project_id, sequence, stat.st_size, stat.st_mtime
+                )
+            )
+            row = self._conn.execute("SELECT * FROM media WHERE rel_path = ?", (rel_path,)).fetchone()
+        return self._row_to_entry(row)
+
+    def remove(self, path: str):
+        """인덱스에서 파일 제거 (파일을 지운 뒤 호출)"""
+        rel_path = self._relative_path(path)
+        if rel_path is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM media WHERE rel_path = ?", (rel_path,))
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        role: Optional[str] = None,
+        project_id: Optional[str] = None,
+        extensions: Optional[Iterable[str]] = None,
+        order: str = "newest",
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        조건에 맞는 파일 목록 (인덱스를 사용하므로 디렉토리 크기와 무관)
+
+        Args:
+            category: static/ 바로 아래 디렉토리 (audio, videos 등)
+            role: 역할 (suno_bgm, tts 등)
+            project_id: 프로젝트 ID
+            extensions: 확장자 목록 (예: [".mp4", ".mov"])
+            order: "newest"(최신순), "oldest"(오래된 순), "sequence"(순서 번호순)
+            limit: 최대 개수
+
+        Returns:
+            List[Dict]: 항목 목록 (path, url, size, created_at 등 포함, 지워진 파일은 제외)
+        """
+        entries, missing = [], []
+        for row in self._select(category, role, project_id, extensions, order, limit):
+            entry = self._row_to_entry(row)
+            if os.path.exists(entry["path"]):
+                entries.append(entry)
+            else:
+                missing.append(entry["path"])
+        for path in missing:  # 인덱스 밖에서 지워진 파일 정리
+            self.remove(path)
+        return entries
+
+    def _select(self, category, role, project_id, extensions, order, limit) -> List[sqlite3.Row]:
+        conditions, values = [], []
+        for column, value in (("category", category), ("role", role), ("project_id", project_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        if extensions:
+            extensions = [ext.lower() for ext in extensions]
+            conditions.append(f"extension IN ({', '.join('?' for _ in extensions)})")
+            values.extend(extensions)
+
+        order_by = {
+            "newest": "created_at DESC",
+            "oldest": "created_at ASC",
+            "sequence": "sequence ASC, created_at ASC"
+        }.get(order, "created_at DESC")
+        sql = "SELECT * FROM media"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by}"
+        if limit:
+            sql += " LIMIT ?"
+            values.append(int(limit))
+
+        with self._lock:
+            return self._conn.execute(sql, values).fetchall()
+
+    def latest(
+        self,
+        category: Optional[str] = None,
+        role: Optional[str] = None,
+        project_id: Optional[str] = None,
+        extensions: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """조건에 맞는 가장 최근 파일 (없으면 None)"""
+        while True:
+            rows = self._select(category, role, project_id, extensions, "newest", 1)
+            if not rows:
+                return None
+            entry = self._row_to_entry(rows[0])
+            if os.path.exists(entry["path"]):
+                return entry
+            self.remove(entry["path"])  # 인덱스 밖에서 지워진 파일이면 정리 후 다음 항목 조회
+
+    def reconcile(self, category: Optional[str] = None) -> Dict[str, int]:
+        """
+        디렉토리를 한 번 훑어 인덱스와 맞춤 (서버 시작시 또는 외부에서 파일을 바꾼 뒤 호출)
+
+        Args:
+            category: 특정 하위 디렉토리만 맞출 때 지정 (None이면 전체)
+
+        Returns:
+            Dict[str, int]: 추가/삭제된 항목 수
+        """
+        started_at = time.time()
+        base_dir = os.path.join(self.root, category) if category else self.root
+        found = set()
+        added = 0
+
+        with self._lock:
+            if category:
+                rows = self._conn.execute("SELECT rel_path FROM media WHERE category = ?", (category,)).fetchall()
+            else:
+                rows = self._conn.execute("SELECT rel_path FROM media").fetchall()
+        indexed = {row["rel_path"] for row in rows}
+
+        if os.path.isdir(base_dir):
+            for dir_path, _, filenames in os.walk(base_dir):
+                for filename in filenames:
+                    if filename.startswith(".") or filename.endswith(".tmp"):
+                        continue
+                    path = os.path.join(dir_path, filename)
+                    rel_path = self._relative_path(path)
+                    if rel_path is None or "/" not in rel_path:
+                        continue
+                    found.add(rel_path)
+                    if rel_path not in indexed and self.add(path):
+                        added += 1
+
+        stale = indexed - found
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM media WHERE rel_path = ?", [(rel_path,) for rel_path in stale])
+
+        print(f"🗃️ 미디어 인덱스 동기화: {len(found)}개 파일 (추가 {added}, 삭제 {len(stale)}, {time.time() - started_at:.2f}초)")
+        return {"files": len(found), "added": added, "removed": len(stale)}
+
+
+_media_index: Optional[MediaIndex] = None
+_media_index_lock = threading.Lock()
+
+
+def get_media_index() -> MediaIndex:
+    """공용 미디어 인덱스 인스턴스 반환"""
+    global _media_index
+    with _media_index_lock:
+        if _media_index is None:
+            _media_index = MediaIndex(MEDIA_ROOT, MEDIA_INDEX_DB_PATH)
+        return _media_index
+
+
+def index_media_file(path: str, role: Optional[str] = None, project_id: Optional[str] = None, sequence: Optional[int] = None):
+    """파일을 만든 직후 인덱스에 기록 (인덱스 오류가 본 작업을 막지 않도록 예외는 로그만 남김)"""
+    try:
+        return get_media_index().add(path, role=role, project_id=project_id, sequence=sequence)
+    except sqlite3.Error as e:
+        print(f"⚠️ 미디어 인덱스 기록 실패 ({os.path.basename(path)}): {e}")
+        return None
@@ -0,0 +1,242 @@
+"""
+미디어 정보 조회 (ffprobe 한 번 + 결과 캐시)
+길이, 해상도, fps, 오디오/비디오 스트림 유무를 `ffprobe -show_streams -show_format -of json` 한 번으로 확인하고
+(경로, 수정 시각, 크기)가 같은 동안은 다시 프로세스를 띄우지 않고 캐시된 결과를 반환
+"""
+import json
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+MEDIA_PROBE_CACHE_SIZE = int(os.getenv("MEDIA_PROBE_CACHE_SIZE", "1024"))  # 캐시할 최대 파일 수
+MEDIA_PROBE_TIMEOUT = int(os.getenv("MEDIA_PROBE_TIMEOUT", "30"))  # ffprobe 제한 시간 (초)
+
+
+def get_ffprobe_path(ffmpeg_path: str) -> str:
+    """FFmpeg 경로에 대응하는 ffprobe 경로"""
+    return ffmpeg_path.replace('ffmpeg', 'ffprobe')
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """ffprobe 프레임레이트 문자열 변환 ("30000/1001" → 29.97, "0/0"이면 None)"""
+    if not rate:
+        return None
+    try:
+        if '/' in rate:
+            num, den = rate.split('/', 1)
+            return float(num) / float(den) if float(den) != 0 else None
+        return float(rate)
+    except ValueError:
+        return None
+
+
+def _empty_info() -> Dict[str, Any]:
+    return {
+        "ok": False,
+        "duration": None,
+        "width": None,
+        "height": None,
+        "fps": None,
+        "has_video": False,
+        "has_audio": False,
+        "video_codec": None,
+        "pix_fmt": None,
+        "audio_codec": None,
+        "sample_rate": None,
+        "format_name": None
+    }
+
+
+def parse_ffprobe_output(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ffprobe JSON 출력을 미디어 정보로 변환
+
+    Args:
+        data: `ffprobe -show_streams -show_format -of json` 결과
+
+    Returns:
+        Dict[str, Any]: ok, duration, width, height, fps, has_video, has_audio, 코덱 정보
+    """
+    info = _empty_info()
+    info["ok"] = True
+    fmt = data.get('format', {})
+    info["format_name"] = fmt.get('format_name')
+    if fmt.get('duration'):
+        info["duration"] = float(fmt['duration'])
+
+    for stream in data.get('streams', []):
+        codec_type = stream.get('codec_type')
+        if codec_type == 'video' and not info["has_video"]:
+            # 앨범 커버 같은 정지 이미지 스트림은 비디오로 보지 않음
+            if stream.get('disposition', {}).get('attached_pic'):
+                continue
+            info["has_video"] = True
+            info["video_codec"] = stream.get('codec_name')
+            info["pix_fmt"] = stream.get('pix_fmt')
+            info["width"] = stream.get('width')
+            info["height"] = stream.get('height')
+            info["fps"] = _parse_rate(stream.get('avg_frame_rate')) or _parse_rate(stream.get('r_frame_rate'))
+            if info["duration"] is None and stream.get('duration'):
+                info["duration"] = float(stream['duration'])
+        elif codec_type == 'audio' and not info["has_audio"]:
+            info["has_audio"] = True
+            info["audio_codec"] = stream.get('codec_name')
+            if stream.get('sample_rate'):
+                info["sample_rate"] = int(stream['sample_rate'])
+            if info["duration"] is None and stream.get('duration'):
+                info["duration"] = float(stream['duration'])
+    return info
+
+
+class MediaProbe:
+    """(경로, 수정 시각, 크기)로 결과를 캐시하는 ffprobe 래퍼 (워커 스레드에서도 사용 가능)"""
+
+    def __init__(self, cache_size: int = MEDIA_PROBE_CACHE_SIZE):
+        """
+        Args:
+            cache_size: 캐시할 최대 파일 수 (오래 안 쓴 항목부터 제거)
+        """
+        self.cache_size = max(1, cache_size)
+        self._cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._keyframe_cache: "OrderedDict[Tuple[str, int, int], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, path: str, ffmpeg_path: str = "ffmpeg") -> Dict[str, Any]:
+        """
+        미디어 정보 조회 (같은 파일이 바뀌지 않았으면 캐시 사용)
+
+        Args:
+            path: 미디어 파일 경로
+            ffmpeg_path: FFmpeg 실행 파일 경로 (같은 위치의 ffprobe 사용)
+
+        Returns:
+            Dict[str, Any]: ok, duration, width, height, fps, has_video, has_audio 등 (확인 못한 값은 None, 실패시 ok=False)
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return _empty_info()
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return dict(cached)
+            self.misses += 1
+
+        cmd = [
+            get_ffprobe_path(ffmpeg_path), '-v', 'quiet', '-of', 'json',
+            '-show_format', '-show_streams', path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=MEDIA_PROBE_TIMEOUT)
+            if result.returncode != 0:
+                return _empty_info()
+            info = parse_ffprobe_output(json.loads(result.stdout))
+        except (subprocess.SubprocessError, OSError, ValueError):
+            return _empty_info()
+
+        # 성공한 결과만 캐시 (실패는 아직 쓰는 중인 파일일 수 있어 다음 호출에서 다시 확인)
+        with self._lock:
+            self._cache[key] = info
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(info)
+
+    def keyframes(self, path: str, ffmpeg_path: str = "ffmpeg") -> Optional[List[float]]:
+        """
+        첫 비디오 스트림의 키프레임 시각 (패킷 플래그만 읽고 디코딩하지 않음, 결과 캐시)
+
+        Args:
+            path: 미디어 파일 경로
+            ffmpeg_path: FFmpeg 실행 파일 경로 (같은 위치의 ffprobe 사용)
+
+        Returns:
+            Optional[List[float]]: 키프레임 시각 (초, 오름차순), 확인 실패시 None
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._keyframe_cache.get(key)
+            if cached is not None:
+                self._keyframe_cache.move_to_end(key)
+                return list(cached)
+
+        cmd = [
+            get_ffprobe_path(ffmpeg_path), '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=MEDIA_PROBE_TIMEOUT)
+            if result.returncode != 0:
+                return None
+        except (subprocess.SubprocessError, OSError):
+            return None
+
+        times = []
+        for line in result.stdout.splitlines():
+            pts_time, _, flags = line.partition(',')
+            if 'K' in flags and pts_time not in ('', 'N/A'):
+                times.append(float(pts_time))
+        times.sort()
+
+        with self._lock:
+            self._keyframe_cache[key] = times
+            while len(self._keyframe_cache) > self.cache_size:
+                self._keyframe_cache.popitem(last=False)
+        return list(times)
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 크기와 적중/미스 횟수"""
+        with self._lock:
+            return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._cache.clear()
+            self._keyframe_cache.clear()
+
+
+_media_probe: Optional[MediaProbe] = None
+_media_probe_lock = threading.Lock()
+
+
+def get_media_probe() -> MediaProbe:
+    """공용 미디어 정보 조회기 인스턴스 반환"""
+    global _media_probe
+    with _media_probe_lock:
+        if _media_probe is None:
+            _media_probe = MediaProbe(MEDIA_PROBE_CACHE_SIZE)
+        return _media_probe
+
+
+def probe_media(path: str, ffmpeg_path: str = "ffmpeg") -> Dict[str, Any]:
+    """
+    미디어 정보 조회 (ffprobe 한 번, 파일이 바뀌지 않았으면 캐시 사용)
+
+    Returns:
+        Dict[str, Any]: ok, duration, width, height, fps, has_video, has_audio 등 (확인 못한 값은 None)
+    """
+    return get_media_probe().probe(path, ffmpeg_path)
+
+
+def get_media_duration(path: str, ffmpeg_path: str = "ffmpeg") -> Optional[float]:
+    """미디어 길이 (초, 확인 못하면 None)"""
+    return probe_media(path, ffmpeg_path)["duration"]
+
+
+def probe_keyframes(path: str, ffmpeg_path: str = "ffmpeg") -> Optional[List[float]]:
+    """첫 비디오 스트림의 키프레임 시각 (초, 확인 못하면 None)"""
+    return get_media_probe().keyframes(path, ffmpeg_path)
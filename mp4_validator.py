@@ -0,0 +1,218 @@
+"""
+MP4 컨테이너 검증 (프레임 디코딩 없이 박스 헤더만 읽음)
+다운로드한 클립이 온전한지, 영상에 오디오 트랙이 있는지를 `ffmpeg -f null`로 디코딩하지 않고
+ftyp/moov/mdat 박스 구조와 moov 안의 트랙 헤더(tkhd, mdhd, hdlr, stsd, stsz)로 확인
+"""
+import os
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from media_probe import probe_media
+
+MP4_MAX_MOOV_BYTES = int(os.getenv("MP4_MAX_MOOV_BYTES", str(64 * 1024 * 1024)))  # moov 박스 최대 크기
+
+MP4_EXTENSIONS = (".mp4", ".m4v", ".m4a", ".mov")
+
+# 자식 박스를 가지는 컨테이너 박스
+_CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"mvex"}
+
+
+class MP4ValidationError(ValueError):
+    """MP4 구조가 잘못되었거나 파일이 잘린 경우"""
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[bytes, int, int]]:
+    """메모리에 읽은 박스 목록 순회 (박스 종류, 내용 시작, 내용 끝)"""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack(">I4s", data[offset:offset + 8])
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                raise MP4ValidationError(f"{box_type!r} 박스 헤더가 잘렸습니다")
+            size = struct.unpack(">Q", data[offset + 8:offset + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise MP4ValidationError(f"{box_type!r} 박스 크기가 잘못되었습니다 ({size} bytes)")
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _iter_file_boxes(f: BinaryIO, file_size: int) -> Iterator[Tuple[bytes, int, int]]:
+    """파일 최상위 박스 순회 (내용은 읽지 않고 헤더만 읽고 건너뜀)"""
+    offset = 0
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        header = f.read(16)
+        size, box_type = struct.unpack(">I4s", header[:8])
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                raise MP4ValidationError(f"{box_type!r} 박스 헤더가 잘렸습니다")
+            size = struct.unpack(">Q", header[8:16])[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - offset
+        if size < header_size:
+            raise MP4ValidationError(f"{box_type!r} 박스 크기가 잘못되었습니다 ({size} bytes)")
+        if offset + size > file_size:
+            raise MP4ValidationError(
+                f"파일이 잘렸습니다: {box_type.decode('latin-1')} 박스가 {offset + size - file_size} bytes 모자랍니다"
+            )
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+
+def _parse_time_header(payload: bytes) -> Tuple[int, int]:
+    """mvhd/mdhd에서 (timescale, duration) 읽기"""
+    version = payload[0]
+    if version == 1:
+        timescale, duration = struct.unpack(">IQ", payload[20:32])
+    else:
+        timescale, duration = struct.unpack(">II", payload[12:20])
+    return timescale, duration
+
+
+def _parse_track(data: bytes, start: int, end: int) -> Dict[str, Any]:
+    """trak 박스에서 트랙 종류, 코덱, 해상도, 길이, 샘플 수 읽기"""
+    track: Dict[str, Any] = {
+        "handler": None, "codec": None, "width": None, "height": None, "duration": None, "sample_count": None
+    }
+
+    def walk(walk_start: int, walk_end: int):
+        for box_type, box_start, box_end in _iter_boxes(data, walk_start, walk_end):
+            payload = data[box_start:box_end]
+            if box_type in _CONTAINER_BOXES:
+                walk(box_start, box_end)
+            elif box_type == b"tkhd" and len(payload) >= 84:
+                width, height = struct.unpack(">II", payload[-8:])
+                track["width"], track["height"] = width >> 16, height >> 16
+            elif box_type == b"mdhd" and len(payload) >= 20:
+                timescale, duration = _parse_time_header(payload)
+                if timescale:
+                    track["duration"] = duration / timescale
+            elif box_type == b"hdlr" and len(payload) >= 12:
+                track["handler"] = payload[8:12].decode("latin-1")
+            elif box_type == b"stsd" and len(payload) >= 16:
+                track["codec"] = payload[12:16].decode("latin-1")
+            elif box_type == b"stsz" and len(payload) >= 12:
+                track["sample_count"] = struct.unpack(">I", payload[8:12])[0]
+
+    walk(start, end)
+    return track
+
+
+def inspect_mp4(path: str) -> Dict[str, Any]:
+    """
+    MP4 박스 구조와 트랙 헤더 확인 (프레임을 디코딩하지 않음)
+
+    Args:
+        path: MP4 파일 경로
+
+    Returns:
+        Dict[str, Any]: valid, error, duration, has_video, has_audio, video_codec, audio_codec,
+            width, height, faststart(moov가 mdat 앞에 있는지), tracks
+    """
+    info: Dict[str, Any] = {
+        "valid": False,
+        "error": None,
+        "duration": None,
+        "has_video": False,
+        "has_audio": False,
+        "video_codec": None,
+        "audio_codec": None,
+        "width": None,
+        "height": None,
+        "faststart": None,
+        "tracks": []
+    }
+    try:
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            top_level = []
+            moov_data = None
+            for box_type, box_start, box_end in _iter_file_boxes(f, file_size):
+                top_level.append(box_type)
+                if box_type == b"moov":
+                    if box_end - box_start > MP4_MAX_MOOV_BYTES:
+                        raise MP4ValidationError(f"moov 박스가 너무 큽니다 ({box_end - box_start} bytes)")
+                    f.seek(box_start)
+                    moov_data = f.read(box_end - box_start)
+
+        if b"ftyp" not in top_level:
+            raise MP4ValidationError("ftyp 박스가 없습니다 (MP4 파일이 아님)")
+        if moov_data is None:
+            raise MP4ValidationError("moov 박스가 없습니다 (다운로드가 끝나지 않았거나 손상된 파일)")
+        if b"mdat" not in top_level:
+            raise MP4ValidationError("mdat 박스가 없습니다 (미디어 데이터 없음)")
+        info["faststart"] = top_level.index(b"moov") < top_level.index(b"mdat")
+        fragmented = b"moof" in top_level
+
+        for box_type, box_start, box_end in _iter_boxes(moov_data):
+            if box_type == b"mvhd":
+                timescale, duration = _parse_time_header(moov_data[box_start:box_end])
+                if timescale and duration:
+                    info["duration"] = duration / timescale
+            elif box_type == b"trak":
+                info["tracks"].append(_parse_track(moov_data, box_start, box_end))
+    except MP4ValidationError as e:
+        info["error"] = str(e)
+        return info
+    except (OSError, struct.error, IndexError) as e:
+        info["error"] = f"MP4 헤더를 읽을 수 없습니다: {e}"
+        return info
+
+    for track in info["tracks"]:
+        # 조각(fragmented) MP4는 샘플이 moof에 있으므로 stsz 샘플 수가 0일 수 있음
+        has_samples = fragmented or bool(track["sample_count"])
+        if track["handler"] == "vide" and has_samples and not info["has_video"]:
+            info["has_video"] = True
+            info["video_codec"] = track["codec"]
+            info["width"], info["height"] = track["width"], track["height"]
+        elif track["handler"] == "soun" and has_samples and not info["has_audio"]:
+            info["has_audio"] = True
+            info["audio_codec"] = track["codec"]
+        if info["duration"] is None and track["duration"]:
+            info["duration"] = track["duration"]
+
+    if not info["tracks"]:
+        info["error"] = "트랙이 없습니다"
+        return info
+    info["valid"] = True
+    return info
+
+
+def validate_video_file(path: str) -> Tuple[bool, Optional[str]]:
+    """
+    다운로드한 영상이 재생 가능한 MP4인지 헤더로 확인
+
+    Returns:
+        Tuple[bool, Optional[str]]: (통과 여부, 실패 사유)
+    """
+    info = inspect_mp4(path)
+    if not info["valid"]:
+        return False, info["error"]
+    if not info["has_video"]:
+        return False, "비디오 트랙이 없거나 비어 있습니다"
+    return True, None
+
+
+def has_audio_stream(path: str, ffmpeg_path: str = "ffmpeg") -> bool:
+    """
+    영상에 오디오 트랙이 있는지 확인 (MP4는 헤더만 읽고, 다른 형식은 캐시된 ffprobe 결과 사용)
+
+    Args:
+        path: 미디어 파일 경로
+        ffmpeg_path: MP4가 아닐 때 사용할 FFmpeg 경로
+
+    Returns:
+        bool: 오디오 트랙 존재 여부
+    """
+    if path.lower().endswith(MP4_EXTENSIONS):
+        info = inspect_mp4(path)
+        if info["valid"]:
+            return info["has_audio"]
+    return probe_media(path, ffmpeg_path)["has_audio"]
@@ -0,0 +1,250 @@
+"""
+프로젝트 상태 저장소
+모듈 전역 current_project 대신 프로젝트 ID별로 파이프라인 단계 결과를 보관
+메모리(기본), JSON 파일, SQLite 중 하나를 백엔드로 사용하며 디스크 백엔드는 서버 재시작 후에도 이전 단계 결과를 재사용 가능
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_STORE_BACKEND = os.getenv("PROJECT_STORE_BACKEND", "memory").lower()  # memory, json, sqlite
+PROJECT_STORE_PATH = os.getenv("PROJECT_STORE_PATH", os.path.join("cache", "projects"))
+
+DEFAULT_PROJECT_ID = "default"  # project_id 없이 호출한 기존 클라이언트가 사용하는 프로젝트
+
+_PROJECT_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def new_project_state() -> Dict[str, Any]:
+    """빈 프로젝트 상태 (1-8단계 결과 자리)"""
+    return {
+        "persona": None,
+        "reference_images": [],
+        "analyzed_images": None,
+        "ad_concept": None,
+        "user_video_input": None,
+        "storyboard": None,
+        "images": None,
+        "generated_videos": None,
+        "tts_result": None
+    }
+
+
+def validate_project_id(project_id: str) -> str:
+    """프로젝트 ID 검증 (파일명/키로 안전한 영문, 숫자, '-', '_'만 허용)"""
+    if not project_id or not _PROJECT_ID_PATTERN.match(project_id):
+        raise ValueError(f"잘못된 프로젝트 ID입니다: {project_id!r} (영문, 숫자, '-', '_' 최대 64자)")
+    return project_id
+
+
+class ProjectState(dict):
+    """프로젝트 상태 딕셔너리 - 최상위 키를 바꾸면 저장소에 바로 기록"""
+
+    def __init__(self, project_id: str, data: Dict[str, Any], on_change: Optional[Callable[["ProjectState"], None]] = None):
+        super().__init__(data)
+        self.project_id = project_id
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change(self)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def reset(self):
+        """모든 단계 결과 초기화"""
+        super().clear()
+        super().update(new_project_state())
+        self._changed()
+
+
+class ProjectStore:
+    """프로젝트 ID별 상태 저장소 (메모리 캐시 + 선택적 디스크 백엔드)"""
+
+    def __init__(self, backend: str = PROJECT_STORE_BACKEND, path: str = PROJECT_STORE_PATH):
+        """
+        Args:
+            backend: "memory", "json" (프로젝트별 JSON 파일), "sqlite" 중 하나
+            path: json 백엔드는 디렉토리, sqlite 백엔드는 디렉토리 안의 projects.sqlite3 파일 사용
+        """
+        if backend not in ("memory", "json", "sqlite"):
+            print(f"⚠️ 알 수 없는 프로젝트 저장소 백엔드({backend}) - 메모리 저장소를 사용합니다.")
+            backend = "memory"
+        self.backend = backend
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._projects: Dict[str, ProjectState] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if backend != "memory":
+            os.makedirs(self.path, exist_ok=True)
+        if backend == "sqlite":
+            self._conn = sqlite3.connect(os.path.join(self.path, "projects.sqlite3"), check_same_thread=False)
+            with self._conn:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS projects (
+                        project_id TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                """)
+        print(f"🗂️ 프로젝트 저장소: {backend}" + (f" ({self.path})" if backend != "memory" else ""))
+
+    def _json_path(self, project_id: str) -> str:
+        return os.path.join(self.path, f"{project_id}.json")
+
+    def _load(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """디스크 백엔드에서 프로젝트 상태 읽기"""
+        try:
+            if self.backend == "json":
+                path = self._json_path(project_id)
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        return json.load(f)
+            elif self.backend == "sqlite":
+                with self._lock:
+                    row = self._conn.execute("SELECT data FROM projects WHERE project_id = ?", (project_id,)).fetchone()
+                if row:
+                    return json.loads(row[0])
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"⚠️ 프로젝트 상태 로드 실패 ({project_id}): {e}")
+        return None
+
+    def _persist(self, project: ProjectState):
+        """프로젝트 상태를 디스크 백엔드에 기록 (메모리 백엔드는 시각만 갱신)"""
+        now = time.time()
+        with self._lock:
+            self._updated_at[project.project_id] = now
+            if self.backend == "memory":
+                return
+            data = json.dumps(dict(project), ensure_ascii=False, default=str)
+            try:
+                if self.backend == "json":
+                    path = self._json_path(project.project_id)
+                    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    with open(temp_path, "w", encoding="utf-8") as f:
+                        f.write(data)
+                    os.replace(temp_path, path)
+                else:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO projects (project_id, data, updated_at) VALUES (?, ?, ?)",
+                            (project.project_id, data, now)
+                        )
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ 프로젝트 상태 저장 실패 ({project.project_id}): {e}")
+
+    def exists(self, project_id: str) -> bool:
+        """프로젝트 존재 여부"""
+        return project_id in self._projects or self._load(project_id) is not None
+
+    def get(self, project_id: str = DEFAULT_PROJECT_ID, create: bool = True) -> Optional[ProjectState]:
+        """
+        프로젝트 상태 반환 (메모리 → 디스크 순으로 조회)
+
+        Args:
+            project_id: 프로젝트 ID
+            create: 없으면 빈 프로젝트를 새로 만들지 여부
+
+        Returns:
+            Optional[ProjectState]: 프로젝트 상태 (create=False이고 없으면 None)
+        """
+        validate_project_id(project_id)
+        project = self._projects.get(project_id)
+        if project is not None:
+            return project
+
+        data = self._load(project_id)
+        if data is None and not create:
+            return None
+
+        state = new_project_state()
+        state.update(data or {})
+        with self._lock:
+            project = self._projects.setdefault(project_id, ProjectState(project_id, state, self._persist))
+        if data is None:
+            self._persist(project)
+        return project
+
+    def create(self, project_id: Optional[str] = None) -> ProjectState:
+        """새 프로젝트 생성 (ID를 주지 않으면 임의로 발급)"""
+        project_id = validate_project_id(project_id) if project_id else uuid.uuid4().hex[:12]
+        if self.exists(project_id):
+            raise ValueError(f"이미 존재하는 프로젝트입니다: {project_id}")
+        return self.get(project_id)
+
+    def delete(self, project_id: str) -> bool:
+        """프로젝트 삭제"""
+        validate_project_id(project_id)
+        existed = self.exists(project_id)
+        with self._lock:
+            self._projects.pop(project_id, None)
+            self._updated_at.pop(project_id, None)
+            try:
+                if self.backend == "json" and os.path.exists(self._json_path(project_id)):
+                    os.remove(self._json_path(project_id))
+                elif self.backend == "sqlite":
+                    with self._conn:
+                        self._conn.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ 프로젝트 삭제 실패 ({project_id}): {e}")
+        return existed
+
+    def list(self) -> List[Dict[str, Any]]:
+        """프로젝트 목록과 완료된 단계 요약 (최근 수정순)"""
+        project_ids = set(self._projects)
+        if self.backend == "json":
+            project_ids.update(name[:-5] for name in os.listdir(self.path) if name.endswith(".json"))
+        elif self.backend == "sqlite":
+            with self._lock:
+                rows = self._conn.execute("SELECT project_id, updated_at FROM projects").fetchall()
+            for project_id, updated_at in rows:
+                project_ids.add(project_id)
+                self._updated_at.setdefault(project_id, updated_at)
+
+        summaries = []
+        for project_id in project_ids:
+            project = self.get(project_id, create=False)
+            if project is None:
+                continue
+            updated_at = self._updated_at.get(project_id)
+            if updated_at is None and self.backend == "json":
+                updated_at = os.path.getmtime(self._json_path(project_id))
+            summaries.append({
+                "project_id": project_id,
+                "completed_steps": [key for key, value in project.items() if value],
+                "updated_at": updated_at
+            })
+        return sorted(summaries, key=lambda item: item["updated_at"] or 0, reverse=True)
+
+
+_project_store: Optional[ProjectStore] = None
+
+
+def get_project_store() -> ProjectStore:
+    """공용 프로젝트 저장소 인스턴스 반환"""
+    global _project_store
+    if _project_store is None:
+        _project_store = ProjectStore(PROJECT_STORE_BACKEND, PROJECT_STORE_PATH)
+    return _project_store
+
+
+def get_project(project_id: str = DEFAULT_PROJECT_ID) -> ProjectState:
+    """프로젝트 상태 반환 (없으면 생성)"""
+    return get_project_store().get(project_id)
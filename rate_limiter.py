@@ -0,0 +1,126 @@
+"""
+외부 API 호출을 위한 비동기 토큰 버킷 속도 제한기
+OpenAI 응답의 rate-limit 헤더와 429 응답을 반영하여 호출 속도를 자동 조절
+"""
+import asyncio
+import re
+import time
+from typing import Mapping, Optional
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    OpenAI rate-limit reset 헤더 값을 초 단위로 변환
+
+    Args:
+        value: "1s", "6m0s", "20ms", "0.5" 형식의 문자열
+
+    Returns:
+        Optional[float]: 초 단위 시간 (파싱 실패시 None)
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return float(value)  # 단위 없는 숫자 (Retry-After 형식)
+    except ValueError:
+        pass
+
+    units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    matches = re.findall(r'(\d+(?:\.\d+)?)(ms|s|m|h)', value)
+    if not matches:
+        return None
+    return sum(float(number) * units[unit] for number, unit in matches)
+
+
+class TokenBucketLimiter:
+    """토큰 버킷 방식의 비동기 속도 제한기"""
+
+    def __init__(self, requests_per_minute: float, capacity: Optional[int] = None, name: str = "API"):
+        """
+        Args:
+            requests_per_minute: 분당 허용 요청 수 (토큰 충전 속도)
+            capacity: 버킷 크기 (한 번에 보낼 수 있는 최대 요청 수)
+            name: 로그에 표시할 API 이름
+        """
+        self.rate = max(requests_per_minute, 1.0) / 60.0  # 초당 충전되는 토큰 수
+        self.capacity = capacity or max(1, int(requests_per_minute))
+        self.tokens = float(self.capacity)
+        self.name = name
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0  # 429 또는 잔여 요청 0일 때 대기해야 하는 시각
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰 충전"""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait_seconds = self._blocked_until - now
+                if wait_seconds <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait_seconds = (1 - self.tokens) / self.rate
+
+            await asyncio.sleep(wait_seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        응답의 x-ratelimit-* 헤더로 버킷 상태 보정
+
+        Args:
+            headers: HTTP 응답 헤더
+        """
+        limit = headers.get("x-ratelimit-limit-requests")
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        reset_seconds = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+        now = time.monotonic()
+
+        try:
+            if limit is not None and int(limit) > 0:
+                self.rate = int(limit) / 60.0  # 서버가 알려준 분당 한도로 충전 속도 갱신
+        except ValueError:
+            pass
+
+        try:
+            if remaining is not None:
+                remaining_count = int(remaining)
+                self._refill(now)
+                self.tokens = min(self.tokens, float(remaining_count))
+                if remaining_count <= 0 and reset_seconds:
+                    self._blocked_until = max(self._blocked_until, now + reset_seconds)
+        except ValueError:
+            pass
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        429 응답을 받았을 때 버킷을 비우고 지정 시간 동안 요청 중단
+
+        Args:
+            retry_after: 대기 시간 (초), 없으면 토큰 하나가 충전되는 시간
+        """
+        now = time.monotonic()
+        wait_seconds = retry_after if retry_after and retry_after > 0 else 1.0 / self.rate
+        self._refill(now)
+        self.tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + wait_seconds)
+        print(f"⏳ {self.name} 요청 한도 초과 - {wait_seconds:.1f}초 동안 요청을 멈춥니다.")
+
+
+def get_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """429 응답 헤더에서 재시도 대기 시간(초) 추출"""
+    return (
+        parse_reset_duration(headers.get("retry-after"))
+        or parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+    )
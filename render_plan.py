@@ -0,0 +1,398 @@
+"""
+단일 패스 FFmpeg 렌더 계획
+장면 클립, 트랜지션, BGM, TTS, 자막을 하나의 filter_complex로 묶어 최종 영상을 한 번만 인코딩
+"""
+import json
+import os
+import random
+import shutil
+from typing import Any, Dict, List, Optional
+
+from ffmpeg_executor import run_ffmpeg
+from media_probe import probe_media
+from transition_filters import CUSTOM_XFADE_TRANSITIONS, transition_pix_fmt, xfade_filter
+
+# FFmpeg xfade 필터에서 지원하는 트랜지션 목록
+XFADE_TRANSITIONS = [
+    'fade', 'fadeblack', 'fadewhite', 'distance', 'wipeleft', 'wiperight',
+    'wipeup', 'wipedown', 'slideleft', 'slideright', 'slideup', 'slidedown',
+    'smoothleft', 'smoothright', 'smoothup', 'smoothdown', 'circleopen',
+    'circleclose', 'vertopen', 'vertclose', 'horzopen', 'horzclose',
+    'dissolve', 'pixelize', 'radial', 'hblur'
+]
+
+DEFAULT_RENDER_SIZE = (1280, 720)  # 해상도 확인 실패시 사용할 기본 해상도
+
+# 6단계에서 원본 클립과 렌더 계획(JSON)을 보관하는 디렉토리 (출력 파일마다 하위 디렉토리, media_gc가 정리)
+RENDER_PLAN_DIR = os.getenv("RENDER_PLAN_DIR", os.path.join("cache", "render_plans"))
+RENDER_PLAN_FILENAME = "render_plan.json"
+
+# 6단계 transition_style 옵션별 랜덤 트랜지션 후보
+# smooth/mixed는 VideoTransitions.create_transition의 줌/패닝/회전을 custom xfade 식으로 단일 인코딩 안에서 렌더링
+# (픽셀마다 식을 계산하고 체인 전체를 gbrp로 변환하므로 기본값은 xfade 기본 트랜지션만 사용)
+TRANSITION_STYLES = {
+    "xfade": XFADE_TRANSITIONS,
+    "smooth": list(CUSTOM_XFADE_TRANSITIONS),
+    "mixed": XFADE_TRANSITIONS + list(CUSTOM_XFADE_TRANSITIONS)
+}
+DEFAULT_TRANSITION_STYLE = "xfade"
+
+
+def transitions_for_style(style: str = DEFAULT_TRANSITION_STYLE) -> List[str]:
+    """
+    transition_style 옵션에 해당하는 트랜지션 후보 목록
+
+    Args:
+        style: TRANSITION_STYLES 키 ("xfade", "smooth", "mixed")
+
+    Returns:
+        List[str]: 후보 트랜지션 이름 리스트
+    """
+    if style not in TRANSITION_STYLES:
+        raise ValueError(f"알 수 없는 트랜지션 스타일입니다: {style} (가능한 값: {', '.join(TRANSITION_STYLES)})")
+    return list(TRANSITION_STYLES[style])
+
+
+def choose_transitions(count: int, transitions: Optional[List[str]] = None) -> List[str]:
+    """
+    같은 트랜지션이 연속되지 않도록 랜덤 트랜지션 목록 선택
+
+    Args:
+        count: 필요한 트랜지션 개수 (클립 수 - 1)
+        transitions: 후보 트랜지션 목록 (None이면 XFADE_TRANSITIONS)
+            custom 식 트랜지션은 transitions_for_style("smooth" 또는 "mixed")로 지정
+
+    Returns:
+        List[str]: 선택된 트랜지션 이름 리스트
+    """
+    transitions = transitions or XFADE_TRANSITIONS
+    chosen = []
+    for _ in range(max(0, count)):
+        available = [t for t in transitions if not chosen or t != chosen[-1]] or transitions
+        chosen.append(random.choice(available))
+    return chosen
+
+
+def compute_xfade_offsets(durations: List[float], transition_duration: float) -> List[float]:
+    """
+    클립별 실제 길이로 xfade offset 계산 (k번째 트랜지션은 앞선 결과 영상이 끝나기 transition_duration초 전에 시작)
+
+    Args:
+        durations: 클립별 길이 (초)
+        transition_duration: 트랜지션 길이 (초)
+
+    Returns:
+        List[float]: 트랜지션별 offset (초), 길이는 len(durations) - 1
+    """
+    offsets = []
+    elapsed = 0.0
+    for duration in durations[:-1]:
+        elapsed += duration - transition_duration
+        offsets.append(round(max(elapsed, 0.0), 3))
+    return offsets
+
+
+def clamp_transition_duration(durations: List[float], transition_duration: float) -> float:
+    """트랜지션이 가장 짧은 클립의 절반을 넘지 않도록 제한"""
+    if not durations:
+        return transition_duration
+    return round(max(0.0, min(transition_duration, min(durations) / 2)), 3)
+
+
+def escape_filter_path(path: str) -> str:
+    """subtitles 필터에 넣을 수 있도록 경로 이스케이프 (Windows 드라이브 문자 포함)"""
+    return path.replace("\\", "/").replace(":", "\\:")
+
+
+def build_subtitle_force_style(
+    position: str = "bottom",
+    font_size: int = 2,
+    font_name: str = "Malgun Gothic",
+    font_color: str = "&Hffffff",
+    scale: int = 30,
+    outline_color: str = "&H000000",
+    outline_width: int = 2,
+    enable_bold: bool = True
+) -> str:
+    """
+    subtitles 필터의 force_style 문자열 생성 (커스텀 자막 엔드포인트와 동일한 스타일)
+
+    Args:
+        position: 자막 위치 (top, middle, bottom, custom)
+        font_size: 폰트 크기
+        font_name: 폰트 이름
+        font_color: 폰트 색상 (&Hbbggrr)
+        scale: 가로/세로 스케일 (%)
+        outline_color: 외곽선 색상
+        outline_width: 외곽선 굵기
+        enable_bold: 볼드 사용 여부
+
+    Returns:
+        str: force_style 값
+    """
+    # 위치별 여백 설정 (정렬은 항상 하단 중앙 = 2)
+    margin_v = {"top": 50, "middle": 0, "bottom": 80}.get(position, 80)
+
+    style_options = [
+        f"FontSize={font_size}",
+        f"FontName={font_name}",
+        f"PrimaryColour={font_color}",
+        "Alignment=2",
+        f"MarginV={margin_v}",
+        "MarginL=300",
+        "MarginR=300",
+        "WrapStyle=0",
+        f"ScaleX={scale}",
+        f"ScaleY={scale}",
+        f"Bold={1 if enable_bold else 0}",
+        "PlayResX=1920",
+        "PlayResY=1080",
+        f"OutlineColour={outline_color}",
+        "BorderStyle=1",
+        f"Outline={outline_width}",
+        "Shadow=0"
+    ]
+    return ",".join(style_options)
+
+
+class RenderPlan:
+    """장면 클립 + 트랜지션 + BGM + TTS + 자막을 한 번의 인코딩으로 렌더링하는 계획"""
+
+    def __init__(
+        self,
+        clips: List[str],
+        transitions: Optional[List[str]] = None,
+        transition_duration: float = 1.0,
+        clip_durations: Optional[List[float]] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: int = 30,
+        bgm_file: Optional[str] = None,
+        bgm_volume: float = 0.4,
+        tts_tracks: Optional[List[Dict[str, Any]]] = None,
+        tts_volume: float = 1.0,
+        subtitle_file: Optional[str] = None,
+        subtitle_style: Optional[str] = None,
+        preset: str = "medium",
+        crf: int = 23
+    ):
+        """
+        Args:
+            clips: 장면 클립 파일 경로 (재생 순서)
+            transitions: 클립 사이 트랜지션 (xfade 기본 트랜지션 또는 zoom_in 등 custom 식 트랜지션, None이면 랜덤 선택)
+            transition_duration: 트랜지션 길이 (초)
+            clip_durations: 클립별 길이 (None이면 ffprobe로 확인)
+            width, height: 출력 해상도 (None이면 첫 클립 해상도)
+            fps: 출력 프레임레이트
+            bgm_file: 배경음악 파일 (영상보다 짧으면 반복)
+            bgm_volume: 배경음악 볼륨
+            tts_tracks: [{"path": TTS 파일, "start": 시작 시간(초)}] 리스트
+            tts_volume: TTS 볼륨
+            subtitle_file: SRT 자막 파일
+            subtitle_style: subtitles 필터 force_style 문자열
+            preset, crf: libx264 인코딩 설정
+        """
+        if not clips:
+            raise ValueError("렌더링할 클립이 없습니다.")
+
+        self.clips = list(clips)
+        self.transitions = list(transitions) if transitions else choose_transitions(len(self.clips) - 1)
+        self.transition_duration = transition_duration
+        self.clip_durations = list(clip_durations) if clip_durations else None
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.bgm_file = bgm_file
+        self.bgm_volume = bgm_volume
+        self.tts_tracks = list(tts_tracks or [])
+        self.tts_volume = tts_volume
+        self.subtitle_file = subtitle_file
+        self.subtitle_style = subtitle_style
+        self.preset = preset
+        self.crf = crf
+
+    def resolve(self, ffmpeg_path: str = "ffmpeg"):
+        """클립 길이와 출력 해상도가 비어 있으면 ffprobe로 채움"""
+        if self.clip_durations is None or self.width is None or self.height is None:
+            infos = [probe_media(clip, ffmpeg_path) for clip in self.clips]
+            if self.clip_durations is None:
+                missing = [clip for clip, info in zip(self.clips, infos) if not info["duration"]]
+                if missing:
+                    raise Exception(f"클립 길이를 확인할 수 없습니다: {', '.join(os.path.basename(m) for m in missing)}")
+                self.clip_durations = [info["duration"] for info in infos]
+            if self.width is None or self.height is None:
+                self.width = infos[0]["width"] or DEFAULT_RENDER_SIZE[0]
+                self.height = infos[0]["height"] or DEFAULT_RENDER_SIZE[1]
+
+        self.transition_duration = clamp_transition_duration(self.clip_durations, self.transition_duration)
+
+    @property
+    def total_duration(self) -> float:
+        """트랜지션 겹침을 뺀 최종 영상 길이 (초)"""
+        return sum(self.clip_durations) - self.transition_duration * (len(self.clips) - 1)
+
+    def build_filter_complex(self) -> tuple:
+        """
+        전체 filter_complex 구성
+
+        Returns:
+            tuple: (filter_complex, 비디오 출력 라벨, 오디오 출력 라벨 또는 None)
+        """
+        parts = []
+        clip_count = len(self.clips)
+        width, height = int(self.width), int(self.height)
+
+        # 1) 클립 정규화 (xfade는 해상도, 프레임레이트, 픽셀 포맷이 같아야 함, custom 식 트랜지션이 있으면 RGB 평면 포맷)
+        chain_transitions = [
+            self.transitions[i % len(self.transitions)] for i in range(clip_count - 1)
+        ] if self.transitions and self.transition_duration > 0 else []
+        pix_fmt = transition_pix_fmt(chain_transitions)
+        for i in range(clip_count):
+            parts.append(
+                f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={self.fps},format={pix_fmt}[s{i}]"
+            )
+
+        # 2) 트랜지션 체인 (실제 클립 길이 기반 offset, 트랜지션 길이가 0이면 하드컷으로 이어 붙임)
+        video_label = "s0"
+        offsets = compute_xfade_offsets(self.clip_durations, self.transition_duration)
+        if self.transition_duration <= 0 and clip_count > 1:
+            inputs = "".join(f"[s{i}]" for i in range(clip_count))
+            parts.append(f"{inputs}concat=n={clip_count}:v=1:a=0[xcat]")
+            video_label = "xcat"
+            offsets = []
+        for i, offset in enumerate(offsets):
+            transition = self.transitions[i % len(self.transitions)] if self.transitions else 'fade'
+            parts.append(
+                f"[{video_label}][s{i + 1}]{xfade_filter(transition, self.transition_duration, offset)}[x{i}]"
+            )
+            video_label = f"x{i}"
+        if pix_fmt != "yuv420p":
+            parts.append(f"[{video_label}]format=yuv420p[xfmt]")
+            video_label = "xfmt"
+
+        # 3) 자막 (트랜지션이 끝난 화면 위에 한 번만 입힘)
+        if self.subtitle_file:
+            subtitle_filter = f"subtitles='{escape_filter_path(self.subtitle_file)}'"
+            if self.subtitle_style:
+                subtitle_filter += f":force_style='{self.subtitle_style}'"
+            parts.append(f"[{video_label}]{subtitle_filter}[vout]")
+            video_label = "vout"
+
+        # 4) 오디오: BGM(반복 입력을 영상 길이로 자름) + 시작 시간에 맞춘 TTS 트랙 믹싱
+        audio_labels = []
+        input_index = clip_count
+        total = round(self.total_duration, 3)
+        if self.bgm_file:
+            parts.append(f"[{input_index}:a]atrim=0:{total},asetpts=PTS-STARTPTS,volume={self.bgm_volume}[bgm]")
+            audio_labels.append("bgm")
+            input_index += 1
+        for j, track in enumerate(self.tts_tracks):
+            delay_ms = int(round(float(track.get("start", 0.0)) * 1000))
+            parts.append(f"[{input_index}:a]adelay={delay_ms}|{delay_ms},volume={self.tts_volume}[tts{j}]")
+            audio_labels.append(f"tts{j}")
+            input_index += 1
+
+        audio_label = None
+        if len(audio_labels) == 1:
+            audio_label = audio_labels[0]
+        elif audio_labels:
+            inputs = "".join(f"[{label}]" for label in audio_labels)
+            parts.append(f"{inputs}amix=inputs={len(audio_labels)}:duration=longest:dropout_transition=0[aout]")
+            audio_label = "aout"
+
+        return ";".join(parts), video_label, audio_label
+
+    def build_command(self, output_path: str, ffmpeg_path: str = "ffmpeg") -> List[str]:
+        """한 번의 libx264 인코딩으로 최종 영상을 만드는 FFmpeg 명령 구성"""
+        self.resolve(ffmpeg_path)
+        filter_complex, video_label, audio_label = self.build_filter_complex()
+
+        cmd = [ffmpeg_path, '-y']
+        for clip in self.clips:
+            cmd.extend(['-i', clip])
+        if self.bgm_file:
+            cmd.extend(['-stream_loop', '-1', '-i', self.bgm_file])
+        for track in self.tts_tracks:
+            cmd.extend(['-i', track["path"]])
+
+        cmd.extend(['-filter_complex', filter_complex, '-map', f'[{video_label}]'])
+        if audio_label:
+            cmd.extend(['-map', f'[{audio_label}]', '-c:a', 'aac', '-b:a', '192k'])
+        else:
+            cmd.append('-an')
+
+        cmd.extend([
+            '-c:v', 'libx264',
+            '-preset', self.preset,
+            '-crf', str(self.crf),
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            '-t', f"{self.total_duration:.3f}",
+            output_path
+        ])
+        return cmd
+
+    def render(self, output_path: str, ffmpeg_path: Optional[str] = None, timeout: int = 600) -> str:
+        """
+        계획대로 최종 영상 렌더링 (인코딩 1회)
+
+        Args:
+            output_path: 출력 MP4 경로
+            ffmpeg_path: FFmpeg 실행 파일 경로 (None이면 PATH에서 검색)
+            timeout: FFmpeg 최대 실행 시간 (초)
+
+        Returns:
+            str: 출력 파일 경로
+        """
+        ffmpeg_path = ffmpeg_path or shutil.which('ffmpeg') or 'ffmpeg'
+        cmd = self.build_command(output_path, ffmpeg_path)
+
+        print(f"🎞️ 단일 패스 렌더링: 클립 {len(self.clips)}개, 트랜지션 {len(self.clips) - 1}개 ({self.transition_duration}초)"
+              f"{', BGM' if self.bgm_file else ''}{f', TTS {len(self.tts_tracks)}개' if self.tts_tracks else ''}"
+              f"{', 자막' if self.subtitle_file else ''} → {self.total_duration:.2f}초")
+
+        result = run_ffmpeg(cmd, timeout=timeout)
+        if result.returncode != 0 or not os.path.exists(output_path):
+            raise Exception(f"단일 패스 렌더링 실패: {result.stderr[-800:]}")
+
+        print(f"✅ 단일 패스 렌더링 완료: {os.path.basename(output_path)}")
+        return output_path
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 저장용 딕셔너리"""
+        return {
+            "clips": self.clips,
+            "transitions": self.transitions,
+            "transition_duration": self.transition_duration,
+            "clip_durations": self.clip_durations,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "bgm_file": self.bgm_file,
+            "bgm_volume": self.bgm_volume,
+            "tts_tracks": self.tts_tracks,
+            "tts_volume": self.tts_volume,
+            "subtitle_file": self.subtitle_file,
+            "subtitle_style": self.subtitle_style,
+            "preset": self.preset,
+            "crf": self.crf
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RenderPlan":
+        """to_dict 결과로 계획 복원"""
+        return cls(**data)
+
+    def save(self, path: str) -> str:
+        """계획을 JSON 파일로 저장 (6단계에서 만든 계획을 8단계에서 이어서 사용)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "RenderPlan":
+        """JSON 파일에서 계획 읽기"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,245 @@
+"""
+재인코딩 없는 장면 클립 이어 붙이기
+같은 스토리보드에서 나온 클립은 보통 코덱, 해상도, fps가 같으므로
+- 하드컷(트랜지션 없음): concat demuxer + `-c copy`로 바로 이어 붙임
+- 트랜지션: 클립이 겹치는 구간(키프레임 경계까지)만 libx264로 다시 인코딩하고 나머지는 스트림 복사 (smart rendering)
+"""
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from ffmpeg_executor import run_ffmpeg
+from media_probe import probe_keyframes, probe_media
+from mp4_validator import validate_video_file
+from transition_filters import transition_pix_fmt, xfade_filter
+
+# smart rendering으로 다시 인코딩할 수 있는 코덱 (재인코딩 구간을 libx264로 만들기 때문)
+SMART_RENDER_CODECS = ("h264",)
+SMART_RENDER_PRESET = os.getenv("SMART_RENDER_PRESET", "fast")
+SMART_RENDER_CRF = int(os.getenv("SMART_RENDER_CRF", "18"))  # 복사 구간과 화질 차이가 드러나지 않도록 낮게
+
+
+def _write_concat_list(paths: List[str], list_path: str):
+    """concat demuxer 입력 목록 파일 작성"""
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+
+def check_copy_compatible(clips: List[str], ffmpeg_path: str = "ffmpeg") -> Tuple[bool, Optional[str], List[Dict[str, Any]]]:
+    """
+    클립들을 재인코딩 없이 이어 붙일 수 있는지 (코덱, 해상도, fps, 픽셀 포맷, 오디오 구성이 같은지) 확인
+
+    Args:
+        clips: 클립 파일 경로 리스트
+        ffmpeg_path: FFmpeg 실행 파일 경로
+
+    Returns:
+        Tuple[bool, Optional[str], List[Dict]]: (호환 여부, 호환되지 않는 이유, 클립별 probe 결과)
+    """
+    infos = [probe_media(clip, ffmpeg_path) for clip in clips]
+    if not infos:
+        return False, "클립이 없습니다", infos
+
+    for clip, info in zip(clips, infos):
+        if not info["ok"] or not info["has_video"] or not info["duration"]:
+            return False, f"클립 정보를 확인할 수 없습니다: {os.path.basename(clip)}", infos
+
+    first = infos[0]
+    for clip, info in zip(clips[1:], infos[1:]):
+        for field in ("video_codec", "width", "height", "pix_fmt", "has_audio", "audio_codec", "sample_rate"):
+            if info[field] != first[field]:
+                return False, f"{os.path.basename(clip)}의 {field}가 다릅니다 ({info[field]} != {first[field]})", infos
+        if not first["fps"] or not info["fps"] or abs(info["fps"] - first["fps"]) > 0.01:
+            return False, f"{os.path.basename(clip)}의 fps가 다릅니다 ({info['fps']} != {first['fps']})", infos
+    return True, None, infos
+
+
+def stream_copy_concat(clips: List[str], output_path: str, ffmpeg_path: str = "ffmpeg", include_audio: bool = True, timeout: int = 120) -> bool:
+    """
+    concat demuxer + `-c copy`로 클립 이어 붙이기 (호환 여부는 호출자가 check_copy_compatible로 확인)
+
+    Args:
+        clips: 클립 파일 경로 리스트 (재생 순서)
+        output_path: 출력 MP4 경로
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        include_audio: 클립 오디오 포함 여부
+        timeout: FFmpeg 최대 실행 시간 (초)
+
+    Returns:
+        bool: 성공 여부 (출력 파일 헤더 검증까지 통과해야 True)
+    """
+    list_fd, list_path = tempfile.mkstemp(prefix="copy_concat_", suffix=".txt")
+    os.close(list_fd)
+    try:
+        _write_concat_list(clips, list_path)
+        cmd = [ffmpeg_path, '-y', '-f', 'concat', '-safe', '0', '-i', list_path, '-map', '0:v']
+        if include_audio:
+            cmd += ['-map', '0:a?']
+        else:
+            cmd.append('-an')
+        cmd += ['-c', 'copy', '-movflags', '+faststart', output_path]
+        result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            print(f"⚠️ 스트림 복사 concat 실패: {result.stderr[-300:]}")
+            return False
+        is_valid, error = validate_video_file(output_path)
+        if not is_valid:
+            print(f"⚠️ 스트림 복사 concat 결과 검증 실패: {error}")
+            return False
+        print(f"⚡ 재인코딩 없이 {len(clips)}개 클립 이어 붙이기 완료")
+        return True
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+
+
+def _plan_copy_ranges(durations: List[float], keyframes: List[List[float]], transition_duration: float) -> Optional[List[Tuple[float, float]]]:
+    """
+    클립별로 스트림 복사할 구간 계산 (키프레임에서 시작해 키프레임 직전에서 끝남)
+    앞뒤 트랜지션 구간과 그 구간에서 가장 가까운 키프레임까지는 다시 인코딩
+
+    Returns:
+        Optional[List[Tuple[float, float]]]: 클립별 (복사 시작, 복사 끝), 복사할 구간이 없는 클립이 있으면 None
+    """
+    ranges = []
+    last = len(durations) - 1
+    for i, (duration, frames) in enumerate(zip(durations, keyframes)):
+        incoming_end = transition_duration if i > 0 else 0.0
+        outgoing_start = duration - transition_duration if i < last else duration
+        starts = [t for t in frames if t >= incoming_end - 1e-3]
+        if not starts:
+            return None
+        copy_start = starts[0]
+        if i < last:
+            ends = [t for t in frames if copy_start < t <= outgoing_start + 1e-3]
+            if not ends:
+                return None
+            copy_end = ends[-1]
+        else:
+            copy_end = duration
+        if copy_end - copy_start <= 0:
+            return None
+        ranges.append((copy_start, copy_end))
+    return ranges
+
+
+def smart_render_transitions(
+    clips: List[str],
+    transitions: List[str],
+    transition_duration: float,
+    output_path: str,
+    ffmpeg_path: str = "ffmpeg",
+    clip_infos: Optional[List[Dict[str, Any]]] = None,
+    timeout: int = 300
+) -> bool:
+    """
+    트랜지션 구간만 다시 인코딩하고 나머지는 스트림 복사해서 xfade 트랜지션 영상 만들기 (클립 오디오는 제외)
+
+    Args:
+        clips: 코덱 파라미터가 같은 클립 경로 리스트 (check_copy_compatible 통과)
+        transitions: 클립 사이 트랜지션 이름 (xfade 기본 또는 custom 식 트랜지션, len(clips) - 1개)
+        transition_duration: 트랜지션 길이 (초)
+        output_path: 출력 MP4 경로
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        clip_infos: 클립별 probe 결과 (None이면 다시 조회)
+        timeout: FFmpeg 명령별 최대 실행 시간 (초)
+
+    Returns:
+        bool: 성공 여부 (False면 호출자가 전체 렌더링으로 처리)
+    """
+    infos = clip_infos or [probe_media(clip, ffmpeg_path) for clip in clips]
+    if infos[0]["video_codec"] not in SMART_RENDER_CODECS:
+        print(f"ℹ️ {infos[0]['video_codec']} 코덱은 부분 재인코딩을 지원하지 않아 전체 렌더링합니다.")
+        return False
+
+    durations = [info["duration"] for info in infos]
+    keyframes = [probe_keyframes(clip, ffmpeg_path) for clip in clips]
+    if any(not frames for frames in keyframes):
+        print("ℹ️ 키프레임 정보를 확인할 수 없어 전체 렌더링합니다.")
+        return False
+    ranges = _plan_copy_ranges(durations, keyframes, transition_duration)
+    if ranges is None:
+        print("ℹ️ 트랜지션 구간 밖에 키프레임이 없어 전체 렌더링합니다.")
+        return False
+
+    fps = infos[0]["fps"]
+    pix_fmt = infos[0]["pix_fmt"] or "yuv420p"
+    work_dir = tempfile.mkdtemp(prefix="smart_render_")
+    try:
+        segments = []
+        encoded_seconds = 0.0
+        for i, clip in enumerate(clips):
+            copy_start, copy_end = ranges[i]
+
+            # 1) 키프레임 경계 사이 구간은 스트림 복사 (MPEG-TS로 옮겨 SPS/PPS를 구간마다 유지)
+            copy_segment = os.path.join(work_dir, f"copy_{i:03d}.ts")
+            length = copy_end - copy_start - 0.5 / fps
+            cmd = [
+                ffmpeg_path, '-y', '-ss', f"{copy_start + 0.001:.3f}", '-i', clip,
+                '-t', f"{length:.3f}", '-map', '0:v:0', '-an', '-c', 'copy',
+                '-bsf:v', 'h264_mp4toannexb', '-f', 'mpegts', copy_segment
+            ]
+            result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=timeout)
+            if result.returncode != 0:
+                print(f"⚠️ 복사 구간 추출 실패 ({os.path.basename(clip)}): {result.stderr[-300:]}")
+                return False
+            segments.append(copy_segment)
+
+            if i == len(clips) - 1:
+                break
+
+            # 2) 이 클립의 끝(마지막 키프레임부터)과 다음 클립의 앞(첫 복사 키프레임 전까지)만 xfade로 다시 인코딩
+            tail_start = copy_end
+            tail_length = durations[i] - tail_start
+            head_length = ranges[i + 1][0]
+            offset = max(tail_length - transition_duration, 0.0)
+            transition = transitions[i % len(transitions)] if transitions else 'fade'
+            transition_segment = os.path.join(work_dir, f"transition_{i:03d}.ts")
+            work_fmt = transition_pix_fmt([transition], pix_fmt)
+            filter_complex = (
+                f"[0:v]setpts=PTS-STARTPTS,fps={fps},format={work_fmt},settb=AVTB[a];"
+                f"[1:v]setpts=PTS-STARTPTS,fps={fps},format={work_fmt},settb=AVTB[b];"
+                f"[a][b]{xfade_filter(transition, transition_duration, round(offset, 3))},format={pix_fmt}[v]"
+            )
+            cmd = [
+                ffmpeg_path, '-y',
+                '-ss', f"{tail_start:.3f}", '-i', clip,
+                '-t', f"{head_length:.3f}", '-i', clips[i + 1],
+                '-filter_complex', filter_complex, '-map', '[v]', '-an',
+                '-c:v', 'libx264', '-preset', SMART_RENDER_PRESET, '-crf', str(SMART_RENDER_CRF),
+                '-pix_fmt', pix_fmt, '-r', f"{fps:.6g}",
+                '-f', 'mpegts', transition_segment
+            ]
+            result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=timeout)
+            if result.returncode != 0:
+                print(f"⚠️ 트랜지션 구간 인코딩 실패 ({i + 1} → {i + 2}): {result.stderr[-300:]}")
+                return False
+            segments.append(transition_segment)
+            encoded_seconds += tail_length + head_length - transition_duration
+
+        # 3) 복사 구간과 트랜지션 구간을 순서대로 이어 붙여 MP4로 저장
+        # 원본 인코더와 libx264의 SPS/PPS가 섞이므로 avc1(샘플 엔트리에 첫 구간 파라미터만 저장) 대신
+        # 파라미터 세트를 스트림 안에 그대로 두는 avc3로 저장
+        list_path = os.path.join(work_dir, "segments.txt")
+        _write_concat_list(segments, list_path)
+        cmd = [
+            ffmpeg_path, '-y', '-f', 'concat', '-safe', '0', '-i', list_path,
+            '-c', 'copy', '-tag:v', 'avc3', '-movflags', '+faststart', output_path
+        ]
+        result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            print(f"⚠️ 구간 이어 붙이기 실패: {result.stderr[-300:]}")
+            return False
+        is_valid, error = validate_video_file(output_path)
+        if not is_valid:
+            print(f"⚠️ 부분 재인코딩 결과 검증 실패: {error}")
+            return False
+
+        total = sum(durations) - transition_duration * (len(clips) - 1)
+        print(f"⚡ 트랜지션 구간만 재인코딩 완료: {encoded_seconds:.1f}초 / 전체 {total:.1f}초")
+        return True
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -11,6 +11,8 @@ import random
 from typing import List, Dict, Optional, Any, Union
 from dataclasses import dataclass
 from datetime import datetime
+from tts_utils import TTSConfig, run_tts_jobs, measure_audio_duration
+from tts_cache import get_tts_cache
 
 @dataclass
 class StoryboardScene:
@@ -40,6 +42,8 @@ class TTSResult:
     duration: Optional[float] = None
     file_size: Optional[int] = None
     error: Optional[str] = None
+    status_code: Optional[int] = None  # 실패한 API 응답의 HTTP 상태 코드 (재시도 판단용)
+    exception_type: Optional[type] = None  # 실패 원인 예외 타입 (재시도 판단용)
 
 class StoryboardToTTSGenerator:
     """스토리보드 → OpenAI LLM → TTS 변환기"""
@@ -351,31 +355,31 @@ class StoryboardToTTSGenerator:
         # 출력 디렉토리 생성
         os.makedirs(output_dir, exist_ok=True)
         
-        results = []
-        
-        for i, script in enumerate(tts_scripts, 1):
-            print(f"🎤 [{i}/{len(tts_scripts)}] 장면 {script.scene_number} TTS 생성 중...")
+        async def synthesize(client: httpx.AsyncClient, index: int, script: TTSScript) -> TTSResult:
+            print(f"🎤 [{index + 1}/{len(tts_scripts)}] 장면 {script.scene_number} TTS 생성 중...")
             print(f"   텍스트: {script.text[:50]}{'...' if len(script.text) > 50 else ''}")
             
-            try:
-                # ElevenLabs API 호출
-                result = await self._create_single_tts(
-                    text=script.text,
-                    voice_id=voice_id,
-                    output_dir=output_dir,
-                    scene_number=script.scene_number
-                )
-                results.append(result)
-                
-                if result.success:
-                    print(f"   ✅ 생성 완료: {os.path.basename(result.audio_file_path)}")
-                else:
-                    print(f"   ❌ 생성 실패: {result.error}")
+            # ElevenLabs API 호출 (공유 클라이언트 사용)
+            result = await self._create_single_tts(
+                text=script.text,
+                voice_id=voice_id,
+                output_dir=output_dir,
+                scene_number=script.scene_number,
+                client=client
+            )
             
-            except Exception as e:
-                print(f"   ❌ TTS 생성 중 오류: {e}")
-                error_result = TTSResult(success=False, error=str(e))
-                results.append(error_result)
+            if result.success:
+                print(f"   ✅ 장면 {script.scene_number} 생성 완료: {os.path.basename(result.audio_file_path)}")
+            else:
+                print(f"   ❌ 장면 {script.scene_number} 생성 실패: {result.error}")
+            return result
+        
+        # 공용 동시 TTS 엔진으로 변환 (결과는 스크립트 순서 유지)
+        results = await run_tts_jobs(
+            tts_scripts,
+            synthesize,
+            error_result=lambda message: TTSResult(success=False, error=message)
+        )
         
         # 통계 출력
         successful = [r for r in results if r.success]
@@ -385,8 +389,8 @@ class StoryboardToTTSGenerator:
         
         return results
     
-    async def _create_single_tts(self, text: str, voice_id: str, output_dir: str, scene_number: int) -> TTSResult:
-        """단일 TTS 오디오 생성"""
+    async def _create_single_tts(self, text: str, voice_id: str, output_dir: str, scene_number: int, client: Optional[httpx.AsyncClient] = None) -> TTSResult:
+        """단일 TTS 오디오 생성 (client를 넘기면 공유 연결 사용)"""
         try:
             # ElevenLabs API 호출
             headers = {
@@ -397,48 +401,77 @@ class StoryboardToTTSGenerator:
             
             data = {
                 "text": text,
-                "model_id": "eleven_multilingual_v2",
+                "model_id": TTSConfig.DEFAULT_MODEL_ID,
                 "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.8,
-                    "style": 0.0,
-                    "use_speaker_boost": True
+                    "stability": TTSConfig.DEFAULT_STABILITY,
+                    "similarity_boost": TTSConfig.DEFAULT_SIMILARITY_BOOST,
+                    "style": TTSConfig.DEFAULT_STYLE,
+                    "use_speaker_boost": TTSConfig.DEFAULT_USE_SPEAKER_BOOST
                 }
             }
             
             url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(url, json=data, headers=headers)
-                
-                if response.status_code == 200:
-                    # 오디오 파일 저장
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"scene_{scene_number:02d}_{timestamp}.mp3"
-                    file_path = os.path.join(output_dir, filename)
-                    
-                    with open(file_path, "wb") as f:
-                        f.write(response.content)
-                    
-                    # 파일 정보 확인
-                    file_size = os.path.getsize(file_path)
-                    
-                    # 웹 접근 가능한 URL 생성
-                    audio_url = f"/static/audio/{filename}"
-                    
+            # 캐시 확인 (같은 텍스트 + 음성 + 설정이면 API 호출 없이 재사용)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"scene_{scene_number:02d}_{timestamp}.mp3"
+            file_path = os.path.join(output_dir, filename)
+            
+            cache = get_tts_cache()
+            cache_key = None
+            if cache:
+                voice_settings = data["voice_settings"]
+                cache_key = cache.make_key(
+                    text, voice_id, data["model_id"],
+                    voice_settings["stability"], voice_settings["similarity_boost"],
+                    voice_settings["style"], voice_settings["use_speaker_boost"]
+                )
+                cached = cache.materialize(cache_key, file_path)
+                if cached:
+                    print(f"   ♻️ 장면 {scene_number} TTS 캐시 적중")
                     return TTSResult(
                         success=True,
                         audio_file_path=file_path,
-                        audio_url=audio_url,
-                        duration=len(text) * 0.1,  # 대략적인 길이 추정
-                        file_size=file_size
+                        audio_url=f"/static/audio/{filename}",
+                        duration=cached.get("duration") or len(text) * 0.1,
+                        file_size=cached.get("file_size")
                     )
-                else:
-                    error_msg = f"ElevenLabs API 오류: {response.status_code} - {response.text}"
-                    return TTSResult(success=False, error=error_msg)
+            
+            if client is not None:
+                response = await client.post(url, json=data, headers=headers)
+            else:
+                async with httpx.AsyncClient(timeout=60.0) as own_client:
+                    response = await own_client.post(url, json=data, headers=headers)
+            
+            if response.status_code == 200:
+                # 오디오 파일 저장
+                with open(file_path, "wb") as f:
+                    f.write(response.content)
+                
+                # 파일 정보 확인
+                file_size = os.path.getsize(file_path)
+                duration = measure_audio_duration(file_path)
+                
+                # 측정된 길이와 함께 캐시에 저장
+                if cache and cache_key:
+                    cache.put(cache_key, file_path, duration, text=text, voice_id=voice_id, model_id=data["model_id"])
+                
+                # 웹 접근 가능한 URL 생성
+                audio_url = f"/static/audio/{filename}"
+                
+                return TTSResult(
+                    success=True,
+                    audio_file_path=file_path,
+                    audio_url=audio_url,
+                    duration=duration or len(text) * 0.1,  # 측정 실패시 대략적인 길이 추정
+                    file_size=file_size
+                )
+            else:
+                error_msg = f"ElevenLabs API 오류: {response.status_code} - {response.text}"
+                return TTSResult(success=False, error=error_msg, status_code=response.status_code)
         
         except Exception as e:
-            return TTSResult(success=False, error=str(e))
+            return TTSResult(success=False, error=str(e), exception_type=type(e))
     
     async def process_storyboard_to_tts(
         self,
@@ -8,9 +8,17 @@ import time
 import json
 from typing import Optional, List, Dict, Any
 from pathlib import Path
-import subprocess
-import httpx
-from tts_utils import get_elevenlabs_api_key
+from tts_utils import get_elevenlabs_api_key, load_tts_alignment
+from whisper_cache import transcribe_with_cache
+from ffmpeg_executor import run_ffmpeg, run_ffmpeg_async
+from media_index import get_media_index, index_media_file
+from media_probe import get_media_duration
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 class SubtitleConfig:
     """자막 관련 설정값들"""
@@ -29,6 +37,16 @@ class SubtitleConfig:
         "en": "C:/Windows/Fonts/arial.ttf",        # Arial (영어)
         "default": "C:/Windows/Fonts/arial.ttf"    # 기본 폰트
     }
+    
+    # 자막 타이밍 정렬 방식: "whisper" (Whisper API 전사), "local" (대본 + 오디오 에너지 분석, 오프라인),
+    # "timestamps" (ElevenLabs 문자 타임스탬프, TTS 요청시 함께 받음)
+    ALIGNMENT_MODE = os.getenv("SUBTITLE_ALIGNMENT_MODE", "whisper")
+    ALIGNMENT_SAMPLE_RATE = 16000  # 에너지 분석용 디코딩 샘플레이트 (Hz)
+    ALIGNMENT_FRAME_MS = 20  # 에너지 계산 프레임 길이 (ms)
+    ALIGNMENT_SILENCE_DB = -35.0  # 음성 최대 레벨 대비 이 값 아래를 무음으로 판정 (dB)
+    ALIGNMENT_MIN_SILENCE = 0.12  # 이보다 짧은 무음은 음성 구간에 포함 (초)
+    ALIGNMENT_MIN_SPEECH = 0.06  # 이보다 짧은 음성 구간은 잡음으로 간주 (초)
+    ALIGNMENT_SNAP_TOLERANCE = 0.35  # 구절 경계를 무음 구간에 맞출 최대 거리 (음성 시간 기준, 초)
 
 class SubtitleResult:
     """자막 생성 결과를 담는 데이터 클래스"""
@@ -86,136 +104,107 @@ async def transcribe_audio_with_whisper(
     print(f"   형식: {output_format}")
     
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            # Whisper API 요청 준비
-            headers = {
-                "Authorization": f"Bearer {api_key}"
-            }
-            
-            # 파일 업로드 데이터 준비
-            with open(audio_file_path, "rb") as audio_file:
-                files = {
-                    "file": (os.path.basename(audio_file_path), audio_file, "audio/mpeg")
-                }
-                
-                data = {
-                    "model": "whisper-1",
-                    "response_format": output_format
-                }
-                
-                # 언어가 지정된 경우 추가
-                if language:
-                    data["language"] = language
-                
-                # Whisper API 호출
-                response = await client.post(
-                    "https://api.openai.com/v1/audio/transcriptions",
-                    headers=headers,
-                    files=files,
-                    data=data
-                )
-            
-            if response.status_code != 200:
-                error_msg = f"Whisper API 요청 실패: {response.status_code} - {response.text}"
-                print(f"❌ {error_msg}")
-                return SubtitleResult(success=False, error=error_msg)
-            
-            # 응답 처리
-            if output_format == "json":
-                result_data = response.json()
-                transcription = result_data.get("text", "")
-                detected_language = result_data.get("language", "unknown")
-                subtitle_content = transcription  # JSON 형식에서는 단순 텍스트
-            else:
-                # SRT 또는 VTT 형식
-                subtitle_content = response.text
-                transcription = subtitle_content
-                detected_language = language or "auto"
-            
-            # 자막 파일 저장
-            subtitle_dir = Path(tempfile.gettempdir()) / "subtitles"
-            subtitle_dir.mkdir(exist_ok=True)
-            
-            import time
-            timestamp = int(time.time() * 1000)
-            subtitle_filename = f"subtitle_{timestamp}.{output_format}"
-            subtitle_file_path = subtitle_dir / subtitle_filename
-            
-            with open(subtitle_file_path, "w", encoding="utf-8") as subtitle_file:
-                subtitle_file.write(subtitle_content)
+        # Whisper API 호출 (같은 오디오 + 언어 + 형식이면 캐시된 응답 사용)
+        try:
+            response_text = await transcribe_with_cache(
+                audio_file_path,
+                api_key,
+                response_format=output_format,
+                language=language,
+                timeout=120.0
+            )
+        except Exception as api_error:
+            error_msg = str(api_error)
+            print(f"❌ {error_msg}")
+            return SubtitleResult(success=False, error=error_msg)
+        
+        # 응답 처리
+        if output_format == "json":
+            result_data = json.loads(response_text)
+            transcription = result_data.get("text", "")
+            detected_language = result_data.get("language", "unknown")
+            subtitle_content = transcription  # JSON 형식에서는 단순 텍스트
+        else:
+            # SRT 또는 VTT 형식
+            subtitle_content = response_text
+            transcription = subtitle_content
+            detected_language = language or "auto"
+        
+        # 자막 파일 저장
+        subtitle_dir = Path(tempfile.gettempdir()) / "subtitles"
+        subtitle_dir.mkdir(exist_ok=True)
+        
+        import time
+        timestamp = int(time.time() * 1000)
+        subtitle_filename = f"subtitle_{timestamp}.{output_format}"
+        subtitle_file_path = subtitle_dir / subtitle_filename
+        
+        with open(subtitle_file_path, "w", encoding="utf-8") as subtitle_file:
+            subtitle_file.write(subtitle_content)
+        
+        # 오디오 파일 길이 확인
+        duration = get_media_duration(audio_file_path)
+        if duration:
+            print(f"   오디오 길이: {duration:.2f}초 (ffprobe)")
+        else:
+            print("⚠️ 오디오 길이 확인 실패, 길이 정보 없이 진행")
+        
+        print(f"✅ 음성 전사 완료!")
+        print(f"   자막 파일: {subtitle_file_path}")
+        print(f"   감지된 언어: {detected_language}")
+        if duration:
+            print(f"   길이: {duration:.2f}초")
+        
+        # 🔥 TTS MP3 파일 싱크에 정확히 맞춘 5단어씩 순차적 자막 생성
+        print(f"🎵 TTS 파일 싱크 기반 정밀 자막 생성 중...")
+        sequential_subtitle_path = str(subtitle_file_path).replace('.srt', '_tts_synced.srt')
+        
+        try:
+            final_subtitle_path = create_tts_synced_subtitle_file(
+                str(subtitle_file_path),  # 원본 자막 파일
+                sequential_subtitle_path,  # TTS 싱크 자막 파일 경로
+                audio_file_path,          # TTS MP3 파일 경로 (싱크 기준)
+                words_per_line=5,         # 5단어씩 끊기
+                gap_duration=0.05         # 0.05초 간격 (0.01초 단위 정밀도)
+            )
             
-            # 오디오 파일 길이 확인
-            duration = None  # MoviePy 문제로 인해 일단 None으로 설정
-            try:
-                # MoviePy 대신 ffprobe 사용 시도
-                import subprocess
-                result = subprocess.run([
-                    'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-                    '-of', 'csv=p=0', audio_file_path
-                ], capture_output=True, text=True)
-                if result.returncode == 0:
-                    duration = float(result.stdout.strip())
-                    print(f"   오디오 길이: {duration:.2f}초 (ffprobe)")
-            except Exception as e:
-                print(f"⚠️ 오디오 길이 확인 실패: {e}")
-                print("   MoviePy 및 ffprobe 모두 사용할 수 없음, 길이 정보 없이 진행")
+            print(f"✅ TTS 싱크 기반 5단어 자막 생성 완료: {os.path.basename(final_subtitle_path)}")
+            print(f"   정밀도: 0.01초 단위 싱크 맞춤")
             
-            print(f"✅ 음성 전사 완료!")
-            print(f"   자막 파일: {subtitle_file_path}")
-            print(f"   감지된 언어: {detected_language}")
-            if duration:
-                print(f"   길이: {duration:.2f}초")
+            # TTS 싱크 자막 파일을 최종 결과로 사용
+            final_file_path = final_subtitle_path
             
-            # 🔥 TTS MP3 파일 싱크에 정확히 맞춘 5단어씩 순차적 자막 생성
-            print(f"🎵 TTS 파일 싱크 기반 정밀 자막 생성 중...")
-            sequential_subtitle_path = str(subtitle_file_path).replace('.srt', '_tts_synced.srt')
+        except Exception as sync_error:
+            print(f"⚠️ TTS 싱크 자막 생성 실패: {sync_error}")
+            print(f"   기본 순차적 자막 생성으로 대체합니다.")
             
+            # 실패 시 기본 순차적 자막 생성 시도
             try:
-                final_subtitle_path = create_tts_synced_subtitle_file(
+                final_subtitle_path = create_sequential_subtitle_file(
                     str(subtitle_file_path),  # 원본 자막 파일
-                    sequential_subtitle_path,  # TTS 싱크 자막 파일 경로
-                    audio_file_path,          # TTS MP3 파일 경로 (싱크 기준)
-                    words_per_line=5,         # 5단어씩 끊기
-                    gap_duration=0.05         # 0.05초 간격 (0.01초 단위 정밀도)
+                    sequential_subtitle_path.replace('_tts_synced', '_sequential'),  # 순차적 자막 파일 경로
+                    max_chars=10,     # 문자 수 제한 (사용되지 않음)
+                    line_duration=0.7, # 각 줄 표시 시간
+                    gap_duration=0.1,   # 줄 간격
+                    words_per_line=5    # 5단어씩 끊기
                 )
                 
-                print(f"✅ TTS 싱크 기반 5단어 자막 생성 완료: {os.path.basename(final_subtitle_path)}")
-                print(f"   정밀도: 0.01초 단위 싱크 맞춤")
-                
-                # TTS 싱크 자막 파일을 최종 결과로 사용
+                print(f"✅ 기본 5단어씩 순차적 자막 생성 완료: {os.path.basename(final_subtitle_path)}")
                 final_file_path = final_subtitle_path
                 
-            except Exception as sync_error:
-                print(f"⚠️ TTS 싱크 자막 생성 실패: {sync_error}")
-                print(f"   기본 순차적 자막 생성으로 대체합니다.")
-                
-                # 실패 시 기본 순차적 자막 생성 시도
-                try:
-                    final_subtitle_path = create_sequential_subtitle_file(
-                        str(subtitle_file_path),  # 원본 자막 파일
-                        sequential_subtitle_path.replace('_tts_synced', '_sequential'),  # 순차적 자막 파일 경로
-                        max_chars=10,     # 문자 수 제한 (사용되지 않음)
-                        line_duration=0.7, # 각 줄 표시 시간
-                        gap_duration=0.1,   # 줄 간격
-                        words_per_line=5    # 5단어씩 끊기
-                    )
-                    
-                    print(f"✅ 기본 5단어씩 순차적 자막 생성 완료: {os.path.basename(final_subtitle_path)}")
-                    final_file_path = final_subtitle_path
-                    
-                except Exception as seq_error:
-                    print(f"⚠️ 모든 자막 생성 방법 실패: {seq_error}")
-                    print(f"   원본 자막 파일을 사용합니다.")
-                    final_file_path = str(subtitle_file_path)
-            
-            return SubtitleResult(
-                success=True,
-                subtitle_file_path=final_file_path,  # 순차적 자막 파일 경로 반환
-                transcription=transcription,
-                language=detected_language,
-                duration=duration
-            )
-            
+            except Exception as seq_error:
+                print(f"⚠️ 모든 자막 생성 방법 실패: {seq_error}")
+                print(f"   원본 자막 파일을 사용합니다.")
+                final_file_path = str(subtitle_file_path)
+        
+        return SubtitleResult(
+            success=True,
+            subtitle_file_path=final_file_path,  # 순차적 자막 파일 경로 반환
+            transcription=transcription,
+            language=detected_language,
+            duration=duration
+        )
+        
     except Exception as e:
         error_msg = f"음성 전사 중 오류 발생: {e}"
         print(f"❌ {error_msg}")
@@ -331,7 +320,7 @@ def add_subtitles_to_video_ffmpeg(
         print(f"   명령어: {' '.join(ffmpeg_cmd)}")
         
         # FFmpeg 실행
-        result = subprocess.run(
+        result = run_ffmpeg(
             ffmpeg_cmd,
             capture_output=True,
             text=True,
@@ -449,7 +438,8 @@ async def create_video_with_tts_and_subtitles(
         
         # 4단계: FFmpeg로 자막을 비디오에 합성
         print(f"🎬 4단계: FFmpeg로 자막 합성...")
-        final_result = add_subtitles_to_video_ffmpeg(
+        final_result = await asyncio.to_thread(  # 동기 FFmpeg 실행은 작업 스레드에서 (이벤트 루프를 막지 않음)
+            add_subtitles_to_video_ffmpeg,
             video_file_path=video_with_tts_path,
             subtitle_file_path=subtitle_result.subtitle_file_path,
             language=subtitle_language
@@ -568,7 +558,8 @@ async def merge_video_with_subtitles(
     """
     try:
         # FFmpeg를 사용하여 자막 합성
-        result = add_subtitles_to_video_ffmpeg(
+        result = await asyncio.to_thread(  # 동기 FFmpeg 실행은 작업 스레드에서 (이벤트 루프를 막지 않음)
+            add_subtitles_to_video_ffmpeg,
             video_file_path=video_path,
             subtitle_file_path=subtitle_path,
             output_video_path=output_path,
@@ -824,7 +815,7 @@ async def merge_video_with_tts_and_subtitles(
                 print(f"🔧 FFmpeg 명령어: {' '.join(cmd)}")
                 
                 # FFmpeg 실행
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = await run_ffmpeg_async(cmd)
                 
                 if result.returncode != 0:
                     print(f"❌ FFmpeg 오류: {result.stderr}")
@@ -1207,16 +1198,8 @@ def create_tts_synced_subtitle_file(subtitle_file_path: str, output_path: str, a
         print(f"   줄 간격: {gap_duration:.2f}초")
         
         # TTS 오디오 파일의 정확한 길이 확인 (ffprobe 사용)
-        total_audio_duration = None
-        try:
-            import subprocess
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-                '-of', 'csv=p=0', audio_file_path
-            ], capture_output=True, text=True)
-            if result.returncode == 0:
-                total_audio_duration = float(result.stdout.strip())
-        except:
+        total_audio_duration = get_media_duration(audio_file_path)
+        if total_audio_duration is None:
             print("⚠️ ffprobe로 오디오 길이 확인 실패, 기본값 사용")
             total_audio_duration = 10.0  # 기본값
         
@@ -1357,16 +1340,8 @@ def validate_tts_subtitle_sync(audio_file_path: str, subtitle_file_path: str) ->
         import re
         
         # 오디오 길이 확인 (ffprobe 사용)
-        audio_duration = None
-        try:
-            import subprocess
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-                '-of', 'csv=p=0', audio_file_path
-            ], capture_output=True, text=True)
-            if result.returncode == 0:
-                audio_duration = float(result.stdout.strip())
-        except:
+        audio_duration = get_media_duration(audio_file_path)
+        if audio_duration is None:
             print("⚠️ ffprobe로 오디오 길이 확인 실패")
             audio_duration = 10.0  # 기본값
         
@@ -1612,7 +1587,7 @@ def create_video_with_drawtext_subtitles(
         env = os.environ.copy()
         env['PYTHONIOENCODING'] = 'utf-8'
         
-        result = subprocess.run(
+        result = run_ffmpeg(
             cmd,
             capture_output=True,
             text=True,
@@ -1932,139 +1907,526 @@ async def create_precise_whisper_subtitles(
         # 출력 디렉토리 생성
         os.makedirs(output_dir, exist_ok=True)
         
-        # Whisper API 호출 (SRT 형식으로)
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            headers = {
-                "Authorization": f"Bearer {api_key}"
+        # Whisper API 호출 (SRT 형식, 같은 오디오면 캐시된 응답 사용)
+        try:
+            print(f"   Whisper API 호출 중...")
+            response_text = await transcribe_with_cache(
+                audio_file_path,
+                api_key,
+                response_format="srt",  # 정확한 타이밍 정보 (0.1초 단위 정밀도)
+                language=language,
+                timeout=180.0,
+                temperature=0.0,  # 더 정확한 결과를 위해 온도를 0으로 설정
+                timestamp_granularities=["segment"]  # 세밀한 타이밍 분석
+            )
+        except Exception as api_error:
+            error_msg = str(api_error)
+            print(f"❌ {error_msg}")
+            return {
+                "success": False,
+                "error": error_msg
             }
-            
-            with open(audio_file_path, "rb") as audio_file:
-                files = {
-                    "file": (os.path.basename(audio_file_path), audio_file, "audio/mpeg")
-                }
+        
+        # SRT 내용 받기
+        srt_content = response_text.strip()
+        
+        if not srt_content:
+            return {
+                "success": False,
+                "error": "Whisper API에서 빈 응답을 받았습니다."
+            }
+        
+        print(f"✅ Whisper API 응답 받음")
+        
+        # 오디오 파일 길이 가져오기 (세분화를 위해)
+        audio_duration = get_media_duration(audio_file_path) or 0.0
+        if audio_duration > 0:
+            print(f"   오디오 길이: {audio_duration:.1f}초")
+        else:
+            print(f"⚠️ 오디오 길이 확인 실패")
+        
+        # 0.1초 단위로 타이밍 세분화
+        if audio_duration > 0:
+            print(f"🔧 0.1초 단위로 타이밍 세분화 중...")
+            srt_content = refine_srt_timing_to_tenths(srt_content, audio_duration)
+            print(f"✅ 타이밍 세분화 완료")
+        
+        # 타임스탬프로 파일명 생성
+        import time
+        timestamp = int(time.time())
+        subtitle_filename = f"whisper_precise_{timestamp}.srt"
+        subtitle_file_path = os.path.join(output_dir, subtitle_filename)
+        
+        # SRT 파일 저장
+        with open(subtitle_file_path, 'w', encoding='utf-8') as f:
+            f.write(srt_content)
+        
+        # SRT 내용 분석하여 상세 정보 추출
+        lines = srt_content.strip().split('\n\n')
+        subtitle_count = len(lines)
+        
+        # 첫 번째와 마지막 타이밍 추출
+        first_timing = ""
+        last_timing = ""
+        total_text = ""
+        
+        if lines:
+            try:
+                # 첫 번째 자막의 타이밍
+                first_block = lines[0].split('\n')
+                if len(first_block) >= 2:
+                    first_timing = first_block[1].split(' --> ')[0]
                 
-                # SRT 형식으로 요청하여 정확한 타이밍 정보 얻기 (0.1초 단위 정밀도)
-                data = {
-                    "model": "whisper-1",
-                    "response_format": "srt",
-                    "language": language,
-                    "temperature": 0.0,  # 더 정확한 결과를 위해 온도를 0으로 설정
-                    "timestamp_granularities": ["segment"]  # 세밀한 타이밍 분석
-                }
+                # 마지막 자막의 타이밍
+                last_block = lines[-1].split('\n')
+                if len(last_block) >= 2:
+                    last_timing = last_block[1].split(' --> ')[1]
+                
+                # 전체 텍스트 추출
+                for block in lines:
+                    block_lines = block.split('\n')
+                    if len(block_lines) >= 3:
+                        total_text += block_lines[2] + " "
                 
-                print(f"   Whisper API 호출 중...")
-                response = await client.post(
-                    "https://api.openai.com/v1/audio/transcriptions",
-                    headers=headers,
-                    files=files,
-                    data=data
-                )
-            
-            if response.status_code != 200:
-                error_msg = f"Whisper API 요청 실패: {response.status_code} - {response.text}"
-                print(f"❌ {error_msg}")
-                return {
-                    "success": False,
-                    "error": error_msg
-                }
-            
-            # SRT 내용 받기
-            srt_content = response.text.strip()
-            
-            if not srt_content:
-                return {
-                    "success": False,
-                    "error": "Whisper API에서 빈 응답을 받았습니다."
-                }
-            
-            print(f"✅ Whisper API 응답 받음")
-            
-            # 오디오 파일 길이 가져오기 (세분화를 위해)
-            audio_duration = 0.0
-            try:
-                import subprocess
-                result = subprocess.run([
-                    'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                    '-of', 'csv=p=0', audio_file_path
-                ], capture_output=True, text=True)
-                if result.returncode == 0:
-                    audio_duration = float(result.stdout.strip())
-                    print(f"   오디오 길이: {audio_duration:.1f}초")
             except Exception as e:
-                print(f"⚠️ 오디오 길이 확인 중 오류: {e}")
-            
-            # 0.1초 단위로 타이밍 세분화
-            if audio_duration > 0:
-                print(f"🔧 0.1초 단위로 타이밍 세분화 중...")
-                srt_content = refine_srt_timing_to_tenths(srt_content, audio_duration)
-                print(f"✅ 타이밍 세분화 완료")
-            
-            # 타임스탬프로 파일명 생성
-            import time
-            timestamp = int(time.time())
-            subtitle_filename = f"whisper_precise_{timestamp}.srt"
-            subtitle_file_path = os.path.join(output_dir, subtitle_filename)
-            
-            # SRT 파일 저장
-            with open(subtitle_file_path, 'w', encoding='utf-8') as f:
-                f.write(srt_content)
-            
-            # SRT 내용 분석하여 상세 정보 추출
-            lines = srt_content.strip().split('\n\n')
-            subtitle_count = len(lines)
-            
-            # 첫 번째와 마지막 타이밍 추출
-            first_timing = ""
-            last_timing = ""
-            total_text = ""
-            
-            if lines:
-                try:
-                    # 첫 번째 자막의 타이밍
-                    first_block = lines[0].split('\n')
-                    if len(first_block) >= 2:
-                        first_timing = first_block[1].split(' --> ')[0]
-                    
-                    # 마지막 자막의 타이밍
-                    last_block = lines[-1].split('\n')
-                    if len(last_block) >= 2:
-                        last_timing = last_block[1].split(' --> ')[1]
-                    
-                    # 전체 텍스트 추출
-                    for block in lines:
-                        block_lines = block.split('\n')
-                        if len(block_lines) >= 3:
-                            total_text += block_lines[2] + " "
-                    
-                except Exception as e:
-                    print(f"⚠️ SRT 파싱 중 오류: {e}")
-            
-            print(f"✅ Whisper 정밀 자막 생성 완료!")
-            print(f"   파일: {subtitle_filename}")
-            print(f"   자막 개수: {subtitle_count}개")
-            print(f"   시작 시간: {first_timing}")
-            print(f"   종료 시간: {last_timing}")
-            print(f"   텍스트 길이: {len(total_text.strip())}자")
-            
+                print(f"⚠️ SRT 파싱 중 오류: {e}")
+        
+        print(f"✅ Whisper 정밀 자막 생성 완료!")
+        print(f"   파일: {subtitle_filename}")
+        print(f"   자막 개수: {subtitle_count}개")
+        print(f"   시작 시간: {first_timing}")
+        print(f"   종료 시간: {last_timing}")
+        print(f"   텍스트 길이: {len(total_text.strip())}자")
+        
+        return {
+            "success": True,
+            "subtitle_file_path": subtitle_file_path,
+            "subtitle_filename": subtitle_filename,
+            "subtitle_count": subtitle_count,
+            "first_timing": first_timing,
+            "last_timing": last_timing,
+            "transcription": total_text.strip(),
+            "srt_content": srt_content
+        }
+        
+    except Exception as e:
+        error_msg = f"Whisper 정밀 자막 생성 중 오류 발생: {e}"
+        print(f"❌ {error_msg}")
+        return {
+            "success": False,
+            "error": error_msg
+        }
+
+def split_script_into_phrases(text: str, max_chars: int = 12) -> List[str]:
+    """
+    대본 텍스트를 자막 구절 단위로 분할 (문장부호 우선, 이후 단어 단위로 max_chars 이내)
+    
+    Args:
+        text: TTS에 보낸 대본 텍스트
+        max_chars: 구절당 최대 문자 수
+        
+    Returns:
+        List[str]: 구절 리스트
+    """
+    import re
+    
+    phrases = []
+    # 문장/쉼표 단위로 먼저 자르되 문장부호는 구절에 남겨둠
+    for clause in re.split(r'(?<=[.!?。,，])\s+', text.strip()):
+        words = clause.split()
+        current = ""
+        for word in words:
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) <= max_chars or not current:
+                current = candidate
+            else:
+                phrases.append(current)
+                current = word
+        if current:
+            phrases.append(current)
+    
+    return phrases
+
+def decode_audio_to_pcm(audio_file_path: str, sample_rate: int = 16000) -> "np.ndarray":
+    """
+    FFmpeg로 오디오를 모노 16bit PCM으로 디코딩하여 [-1, 1] 범위의 float32 배열로 반환
+    
+    Args:
+        audio_file_path: 오디오 파일 경로
+        sample_rate: 디코딩 샘플레이트 (Hz)
+        
+    Returns:
+        np.ndarray: 오디오 샘플 배열
+    """
+    cmd = [
+        get_ffmpeg_path(), "-v", "error", "-i", audio_file_path,
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate),
+        "pipe:1"
+    ]
+    result = run_ffmpeg(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"오디오 디코딩 실패: {result.stderr.decode('utf-8', errors='ignore')[:300]}")
+    
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+def detect_speech_segments(
+    samples: "np.ndarray",
+    sample_rate: int = 16000,
+    frame_ms: int = 20,
+    silence_db: float = -35.0,
+    min_silence: float = 0.12,
+    min_speech: float = 0.06
+) -> List[tuple]:
+    """
+    프레임 RMS 에너지로 음성/무음 경계를 찾아 음성 구간 목록 반환 (NumPy 벡터 연산)
+    
+    Args:
+        samples: decode_audio_to_pcm으로 얻은 오디오 샘플
+        sample_rate: 샘플레이트 (Hz)
+        frame_ms: 에너지 계산 프레임 길이 (ms)
+        silence_db: 최대 레벨 대비 무음 판정 기준 (dB, 음수)
+        min_silence: 이보다 짧은 무음은 앞뒤 음성 구간과 합침 (초)
+        min_speech: 이보다 짧은 음성 구간은 버림 (초)
+        
+    Returns:
+        List[tuple]: (시작 초, 종료 초) 음성 구간 리스트
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    frame_count = len(samples) // frame_len
+    if frame_count == 0:
+        return []
+    
+    frames = samples[:frame_count * frame_len].reshape(frame_count, frame_len)
+    rms_db = 20.0 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    
+    # 최대 레벨(95 백분위) 기준 상대 임계값, 잡음 바닥보다는 항상 위로
+    noise_floor = np.percentile(rms_db, 10)
+    threshold = max(np.percentile(rms_db, 95) + silence_db, noise_floor + 6.0)
+    is_speech = rms_db > threshold
+    
+    # 음성 구간의 시작/끝 프레임 인덱스
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return []
+    
+    # 짧은 무음 간격은 합치기
+    frame_seconds = frame_len / sample_rate
+    keep_gap = (starts[1:] - ends[:-1]) * frame_seconds >= min_silence
+    starts = np.concatenate((starts[:1], starts[1:][keep_gap]))
+    ends = np.concatenate((ends[:-1][keep_gap], ends[-1:]))
+    
+    # 너무 짧은 음성 구간(클릭, 잡음) 제거
+    keep_speech = (ends - starts) * frame_seconds >= min_speech
+    starts, ends = starts[keep_speech], ends[keep_speech]
+    
+    return [(float(s * frame_seconds), float(e * frame_seconds)) for s, e in zip(starts, ends)]
+
+def align_phrases_to_speech(
+    phrases: List[str],
+    segments: List[tuple],
+    snap_tolerance: float = 0.35
+) -> List[tuple]:
+    """
+    구절들을 음성 구간 위에 배치 (글자 수 비례로 음성 시간을 나누고, 가까운 무음 경계에 맞춤)
+    
+    Args:
+        phrases: split_script_into_phrases로 만든 구절 리스트
+        segments: detect_speech_segments로 찾은 음성 구간 리스트
+        snap_tolerance: 구절 경계를 무음 경계로 옮길 최대 거리 (음성 시간 기준, 초)
+        
+    Returns:
+        List[tuple]: 구절별 (시작 초, 종료 초)
+    """
+    seg_starts = np.array([s for s, _ in segments], dtype=np.float64)
+    seg_ends = np.array([e for _, e in segments], dtype=np.float64)
+    
+    # 무음을 제외한 "음성 시간" 축에서 각 구간의 누적 위치
+    speech_cum_end = np.cumsum(seg_ends - seg_starts)
+    speech_cum_start = speech_cum_end - (seg_ends - seg_starts)
+    total_speech = speech_cum_end[-1]
+    
+    # 공백을 뺀 글자 수 비례로 구절 경계 배치
+    weights = np.array([max(1, len(p.replace(" ", ""))) for p in phrases], dtype=np.float64)
+    bounds = np.concatenate(([0.0], np.cumsum(weights) / weights.sum() * total_speech))
+    
+    # 내부 경계를 가장 가까운 무음 위치(구간 끝)로 이동
+    gap_points = speech_cum_end[:-1]
+    if len(gap_points) > 0 and len(bounds) > 2:
+        inner = bounds[1:-1]
+        nearest = np.abs(inner[:, None] - gap_points[None, :]).argmin(axis=1)
+        distance = np.abs(inner - gap_points[nearest])
+        bounds[1:-1] = np.where(distance <= snap_tolerance, gap_points[nearest], inner)
+        bounds = np.maximum.accumulate(bounds)
+    
+    # 음성 시간 → 실제 시간 변환 (구절 끝은 무음 앞 구간, 구절 시작은 무음 뒤 구간으로)
+    last = len(segments) - 1
+    end_idx = np.clip(np.searchsorted(speech_cum_end, bounds[1:], side="left"), 0, last)
+    start_idx = np.clip(np.searchsorted(speech_cum_end, bounds[:-1], side="right"), 0, last)
+    start_times = seg_starts[start_idx] + (bounds[:-1] - speech_cum_start[start_idx])
+    end_times = seg_starts[end_idx] + (bounds[1:] - speech_cum_start[end_idx])
+    
+    return [(float(s), float(max(e, s + 0.1))) for s, e in zip(start_times, end_times)]
+
+def create_local_aligned_subtitles(
+    text: str,
+    audio_file_path: str,
+    output_dir: str = "./static/subtitles",
+    max_chars: int = 12
+) -> Dict[str, Any]:
+    """
+    Whisper 없이 알고 있는 대본과 오디오 에너지 분석만으로 SRT 자막 생성 (오프라인)
+    결과 형식은 create_precise_whisper_subtitles와 동일
+    
+    Args:
+        text: TTS에 보낸 대본 텍스트
+        audio_file_path: TTS 오디오 파일 경로
+        output_dir: 출력 디렉토리
+        max_chars: 자막 한 줄당 최대 문자 수
+        
+    Returns:
+        Dict[str, Any]: 자막 생성 결과
+    """
+    try:
+        if not NUMPY_AVAILABLE:
             return {
-                "success": True,
-                "subtitle_file_path": subtitle_file_path,
-                "subtitle_filename": subtitle_filename,
-                "subtitle_count": subtitle_count,
-                "first_timing": first_timing,
-                "last_timing": last_timing,
-                "transcription": total_text.strip(),
-                "srt_content": srt_content
+                "success": False,
+                "error": "로컬 자막 정렬에는 numpy가 필요합니다."
             }
-            
+        
+        print(f"🎯 로컬 정렬로 자막 생성 중 (Whisper 미사용)...")
+        print(f"   오디오 파일: {os.path.basename(audio_file_path)}")
+        
+        phrases = split_script_into_phrases(text, max_chars)
+        if not phrases:
+            return {
+                "success": False,
+                "error": "자막으로 만들 텍스트가 없습니다."
+            }
+        
+        sample_rate = SubtitleConfig.ALIGNMENT_SAMPLE_RATE
+        samples = decode_audio_to_pcm(audio_file_path, sample_rate)
+        audio_duration = len(samples) / sample_rate
+        if audio_duration <= 0:
+            return {
+                "success": False,
+                "error": "오디오가 비어 있습니다."
+            }
+        
+        segments = detect_speech_segments(
+            samples,
+            sample_rate=sample_rate,
+            frame_ms=SubtitleConfig.ALIGNMENT_FRAME_MS,
+            silence_db=SubtitleConfig.ALIGNMENT_SILENCE_DB,
+            min_silence=SubtitleConfig.ALIGNMENT_MIN_SILENCE,
+            min_speech=SubtitleConfig.ALIGNMENT_MIN_SPEECH
+        )
+        if not segments:
+            print(f"⚠️ 음성 구간을 찾지 못해 전체 길이를 사용합니다.")
+            segments = [(0.0, audio_duration)]
+        
+        print(f"   오디오 길이: {audio_duration:.2f}초, 음성 구간: {len(segments)}개, 구절: {len(phrases)}개")
+        
+        timings = align_phrases_to_speech(phrases, segments, SubtitleConfig.ALIGNMENT_SNAP_TOLERANCE)
+        
+        srt_blocks = []
+        for i, (phrase, (start, end)) in enumerate(zip(phrases, timings)):
+            end = min(end, audio_duration)
+            srt_blocks.append(f"{i + 1}\n{seconds_to_srt_time(start)} --> {seconds_to_srt_time(end)}\n{phrase}")
+        srt_content = "\n\n".join(srt_blocks)
+        
+        # TTS 파일명은 항상 고유하므로 같은 초에 여러 자막을 만들어도 겹치지 않음
+        os.makedirs(output_dir, exist_ok=True)
+        audio_stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+        subtitle_filename = f"local_aligned_{audio_stem}.srt"
+        subtitle_file_path = os.path.join(output_dir, subtitle_filename)
+        
+        with open(subtitle_file_path, 'w', encoding='utf-8') as f:
+            f.write(srt_content)
+        
+        first_timing = seconds_to_srt_time(timings[0][0])
+        last_timing = seconds_to_srt_time(min(timings[-1][1], audio_duration))
+        
+        print(f"✅ 로컬 정렬 자막 생성 완료: {subtitle_filename}")
+        print(f"   자막 개수: {len(phrases)}개 ({first_timing} ~ {last_timing})")
+        
+        return {
+            "success": True,
+            "subtitle_file_path": subtitle_file_path,
+            "subtitle_filename": subtitle_filename,
+            "subtitle_count": len(phrases),
+            "first_timing": first_timing,
+            "last_timing": last_timing,
+            "transcription": " ".join(phrases),
+            "srt_content": srt_content
+        }
+        
     except Exception as e:
-        error_msg = f"Whisper 정밀 자막 생성 중 오류 발생: {e}"
+        error_msg = f"로컬 정렬 자막 생성 중 오류 발생: {e}"
+        print(f"❌ {error_msg}")
+        return {
+            "success": False,
+            "error": error_msg
+        }
+
+def build_srt_from_char_alignment(
+    alignment: Dict[str, Any],
+    max_chars: int = 12,
+    min_duration: float = 0.3
+) -> List[tuple]:
+    """
+    ElevenLabs 문자 타임스탬프로 구절별 정확한 표시 시간 계산
+    
+    Args:
+        alignment: characters, character_start_times_seconds, character_end_times_seconds 딕셔너리
+        max_chars: 구절당 최대 문자 수
+        min_duration: 구절 최소 표시 시간 (초, 다음 구절 시작 전까지만 연장)
+        
+    Returns:
+        List[tuple]: (구절, 시작 초, 종료 초) 리스트
+    """
+    characters = alignment["characters"]
+    char_starts = alignment["character_start_times_seconds"]
+    char_ends = alignment["character_end_times_seconds"]
+    text = "".join(characters)
+    
+    # 구절의 단어들을 원문에서 차례로 찾아 첫 글자 시작 ~ 마지막 글자 끝 시간 사용
+    entries = []
+    cursor = 0
+    for phrase in split_script_into_phrases(text, max_chars):
+        words = phrase.split()
+        first_index = text.find(words[0], cursor)
+        last_index = text.find(words[-1], max(first_index, cursor))
+        if first_index < 0 or last_index < 0:
+            continue
+        last_index += len(words[-1]) - 1
+        cursor = last_index + 1
+        entries.append([phrase, float(char_starts[first_index]), float(char_ends[last_index])])
+    
+    # 최소 표시 시간 보장 (다음 구절과 겹치지 않게)
+    for i, entry in enumerate(entries):
+        limit = entries[i + 1][1] if i + 1 < len(entries) else entry[2] + min_duration
+        entry[2] = max(entry[2], min(entry[1] + min_duration, limit))
+    
+    return [tuple(entry) for entry in entries]
+
+def create_subtitles_from_tts_alignment(
+    audio_file_path: str,
+    output_dir: str = "./static/subtitles",
+    max_chars: int = 12,
+    alignment: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    TTS 생성시 저장한 문자 타임스탬프로 SRT 자막 생성 (Whisper, ffprobe, 균등 분할 없이 정확한 싱크)
+    결과 형식은 create_precise_whisper_subtitles와 동일
+    
+    Args:
+        audio_file_path: TTS 오디오 파일 경로 (옆에 .alignment.json이 있어야 함)
+        output_dir: 출력 디렉토리
+        max_chars: 자막 한 줄당 최대 문자 수
+        alignment: 이미 읽은 타임스탬프 (None이면 MP3 옆 파일에서 읽음)
+        
+    Returns:
+        Dict[str, Any]: 자막 생성 결과
+    """
+    try:
+        alignment = alignment or load_tts_alignment(audio_file_path)
+        if not alignment:
+            return {
+                "success": False,
+                "error": f"문자 타임스탬프 파일이 없습니다: {os.path.basename(audio_file_path)}"
+            }
+        
+        print(f"⏱️ TTS 문자 타임스탬프로 자막 생성 중...")
+        print(f"   오디오 파일: {os.path.basename(audio_file_path)}")
+        
+        entries = build_srt_from_char_alignment(alignment, max_chars)
+        if not entries:
+            return {
+                "success": False,
+                "error": "타임스탬프에서 자막 구절을 만들지 못했습니다."
+            }
+        
+        srt_content = "\n\n".join(
+            f"{i + 1}\n{seconds_to_srt_time(start)} --> {seconds_to_srt_time(end)}\n{phrase}"
+            for i, (phrase, start, end) in enumerate(entries)
+        )
+        
+        os.makedirs(output_dir, exist_ok=True)
+        audio_stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+        subtitle_filename = f"tts_aligned_{audio_stem}.srt"
+        subtitle_file_path = os.path.join(output_dir, subtitle_filename)
+        
+        with open(subtitle_file_path, 'w', encoding='utf-8') as f:
+            f.write(srt_content)
+        
+        first_timing = seconds_to_srt_time(entries[0][1])
+        last_timing = seconds_to_srt_time(entries[-1][2])
+        
+        print(f"✅ 타임스탬프 자막 생성 완료: {subtitle_filename}")
+        print(f"   자막 개수: {len(entries)}개 ({first_timing} ~ {last_timing})")
+        
+        return {
+            "success": True,
+            "subtitle_file_path": subtitle_file_path,
+            "subtitle_filename": subtitle_filename,
+            "subtitle_count": len(entries),
+            "first_timing": first_timing,
+            "last_timing": last_timing,
+            "transcription": " ".join(entry[0] for entry in entries),
+            "srt_content": srt_content
+        }
+        
+    except Exception as e:
+        error_msg = f"타임스탬프 자막 생성 중 오류 발생: {e}"
         print(f"❌ {error_msg}")
         return {
             "success": False,
             "error": error_msg
         }
 
+async def create_aligned_subtitles(
+    text: str,
+    audio_file_path: str,
+    output_dir: str = "./static/subtitles",
+    language: str = "ko",
+    alignment_mode: Optional[str] = None,
+    max_chars: int = 12
+) -> Dict[str, Any]:
+    """
+    설정된 정렬 방식으로 자막 생성
+    TTS 문자 타임스탬프가 MP3 옆에 있으면 항상 우선 사용하고,
+    없으면 "local"은 오프라인 정렬, 그 외는 Whisper API 사용
+    
+    Args:
+        text: TTS에 보낸 대본 텍스트
+        audio_file_path: TTS 오디오 파일 경로
+        output_dir: 출력 디렉토리
+        language: Whisper 언어 코드
+        alignment_mode: "whisper", "local", "timestamps" (None이면 SubtitleConfig.ALIGNMENT_MODE)
+        max_chars: 로컬 정렬시 한 줄당 최대 문자 수
+        
+    Returns:
+        Dict[str, Any]: 자막 생성 결과 (create_precise_whisper_subtitles와 동일 형식)
+    """
+    mode = (alignment_mode or SubtitleConfig.ALIGNMENT_MODE).lower()
+    alignment = load_tts_alignment(audio_file_path)
+    if alignment:
+        return create_subtitles_from_tts_alignment(audio_file_path, output_dir, max_chars, alignment)
+    if mode == "timestamps":
+        print(f"⚠️ 문자 타임스탬프가 없어 로컬 정렬로 대체합니다.")
+    if mode in ("local", "timestamps"):
+        # FFmpeg 디코딩과 NumPy 연산은 블로킹이므로 스레드에서 실행
+        return await asyncio.to_thread(
+            create_local_aligned_subtitles, text, audio_file_path, output_dir, max_chars
+        )
+    return await create_precise_whisper_subtitles(
+        audio_file_path=audio_file_path,
+        output_dir=output_dir,
+        language=language
+    )
+
 def refine_srt_timing_to_tenths(srt_content: str, audio_duration: float) -> str:
     """
     SRT 타이밍을 0.1초 단위로 세분화
@@ -2463,6 +2825,7 @@ def merge_tts_and_subtitle_from_txt_files():
                 )
                 
                 if result.get("success"):
+                    index_media_file(output_path, role="tts_with_subtitle", sequence=i + 1)
                     merged_results.append({
                         "tts_file": tts_file,
                         "subtitle_file": best_subtitle,
@@ -2512,7 +2875,6 @@ def create_video_from_tts_and_subtitle(tts_file_path: str, subtitle_file_path: s
     Returns:
         Dict[str, Any]: 처리 결과
     """
-    import subprocess
     import os
     
     try:
@@ -2523,23 +2885,11 @@ def create_video_from_tts_and_subtitle(tts_file_path: str, subtitle_file_path: s
         # FFmpeg로 TTS 오디오 길이 확인
         ffmpeg_exe = r'C:\Users\oi3oi\AppData\Local\Microsoft\WinGet\Packages\BtbN.FFmpeg.GPL_Microsoft.Winget.Source_8wekyb3d8bbwe\ffmpeg-N-120061-gcfd1f81e7d-win64-gpl\bin\ffmpeg.exe'
         
-        try:
-            # FFmpeg로 오디오 길이 확인
-            duration_cmd = [ffmpeg_exe, "-i", tts_file_path, "-f", "null", "-"]
-            duration_result = subprocess.run(duration_cmd, capture_output=True, text=True)
-            
-            # stderr에서 Duration 정보 추출
-            duration_line = [line for line in duration_result.stderr.split('\n') if 'Duration:' in line]
-            if duration_line:
-                duration_str = duration_line[0].split('Duration: ')[1].split(',')[0]
-                # HH:MM:SS.ms 형식을 초로 변환
-                time_parts = duration_str.split(':')
-                audio_duration = float(time_parts[0]) * 3600 + float(time_parts[1]) * 60 + float(time_parts[2])
-                print(f"   ⏱️ 오디오 길이: {audio_duration:.2f}초")
-            else:
-                audio_duration = 5.0  # 기본값
-                print(f"   ⏱️ 오디오 길이 감지 실패, 기본값 사용: {audio_duration}초")
-        except:
+        # ffprobe로 오디오 길이 확인 (파일 전체를 디코딩하지 않음)
+        audio_duration = get_media_duration(tts_file_path, ffmpeg_exe)
+        if audio_duration:
+            print(f"   ⏱️ 오디오 길이: {audio_duration:.2f}초")
+        else:
             audio_duration = 5.0  # 기본값
             print(f"   ⏱️ 오디오 길이 감지 실패, 기본값 사용: {audio_duration}초")
         
@@ -2564,7 +2914,7 @@ def create_video_from_tts_and_subtitle(tts_file_path: str, subtitle_file_path: s
         ]
         
         print(f"🔧 FFmpeg 명령 실행 중...")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=60)
         
         if result.returncode == 0:
             print(f"✅ 비디오 생성 완료: {os.path.basename(output_video_path)}")
@@ -2685,23 +3035,8 @@ def get_ffmpeg_path():
 
 
 def get_simple_video_duration(video_path):
-    """비디오 길이 간단히 확인"""
-    try:
-        ffmpeg_path = get_ffmpeg_path()
-        ffprobe_path = ffmpeg_path.replace('ffmpeg', 'ffprobe')
-        
-        cmd = [
-            ffprobe_path, "-v", "quiet", "-print_format", "json",
-            "-show_format", video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return float(data.get('format', {}).get('duration', 0))
-    except:
-        pass
-    return 0
+    """비디오 길이 간단히 확인 (확인 못하면 0)"""
+    return get_media_duration(video_path, get_ffmpeg_path()) or 0
 
 
 def merge_video_with_tts_and_subtitles():
@@ -2716,18 +3051,14 @@ def merge_video_with_tts_and_subtitles():
         print("🔍 1단계: 기존 BGM 비디오 찾기...")
         video_dir = os.path.join(os.getcwd(), "static", "videos")
         
-        bgm_videos = []
-        for file in os.listdir(video_dir):
-            if file.endswith('.mp4') and 'merged_ai_videos_with_bgm' in file:
-                bgm_videos.append(file)
+        bgm_video = get_media_index().latest(category="videos", role="merged_ai_videos_with_bgm", extensions=[".mp4"])
         
-        if not bgm_videos:
+        if not bgm_video:
             print("❌ BGM이 포함된 트랜지션 비디오를 찾을 수 없습니다.")
             return {'success': False, 'error': 'BGM 비디오 없음'}
         
-        bgm_videos.sort(reverse=True)  # 최신 파일
-        base_video = os.path.join(video_dir, bgm_videos[0])
-        print(f"✅ 기본 비디오: {bgm_videos[0]}")
+        base_video = bgm_video["path"]  # 최신 파일
+        print(f"✅ 기본 비디오: {bgm_video['filename']}")
         
         # 2단계: TTS 파일들 읽기
         print("📝 2단계: TTS 파일 목록 읽기...")
@@ -2781,7 +3112,7 @@ def merge_video_with_tts_and_subtitles():
             merged_tts, "-y"
         ]
         
-        result = subprocess.run(tts_cmd, capture_output=True, text=True)
+        result = run_ffmpeg(tts_cmd, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"❌ TTS 합치기 실패: {result.stderr}")
             return {'success': False, 'error': f'TTS 합치기 실패: {result.stderr}'}
@@ -2879,9 +3210,10 @@ def merge_video_with_tts_and_subtitles():
         ]
         
         print(f"🔧 FFmpeg 명령 실행...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run_ffmpeg(cmd, capture_output=True, text=True)
         
         if result.returncode == 0:
+            index_media_file(final_output)
             file_size = os.path.getsize(final_output) / (1024 * 1024)
             duration = get_simple_video_duration(final_output)
             
@@ -2930,26 +3262,18 @@ def merge_everything_together():
         print("🔍 2단계: 모든 비디오 파일 찾기...")
         video_dir = os.path.join(os.getcwd(), "static", "videos")
         
-        # 트랜지션 비디오들 찾기 (가장 최신)
-        transition_videos = []
-        bgm_videos = []
-        tts_videos = []
-        
-        for file in os.listdir(video_dir):
-            if file.endswith('.mp4'):
-                if 'frame_transitions' in file:
-                    transition_videos.append(file)
-                elif 'merged_ai_videos_with_bgm' in file:
-                    bgm_videos.append(file)
-                elif 'tts_with_subtitle' in file and file.startswith('tts_with_subtitle_'):
-                    # 개별 TTS 비디오들만 (merged 아닌)
-                    if 'final_merged' not in file:
-                        tts_videos.append(file)
-        
-        # 최신 파일들 선택
-        transition_videos.sort(reverse=True)
-        bgm_videos.sort(reverse=True)
-        tts_videos.sort()  # TTS는 순서대로
+        # 트랜지션/BGM 비디오는 최신순, TTS 비디오는 장면 순서대로 (미디어 인덱스에서 조회)
+        media_index = get_media_index()
+        transition_videos = [
+            entry["path"] for entry in media_index.query(category="videos", role="frame_transitions", extensions=[".mp4"])
+        ]
+        bgm_videos = [
+            entry["path"] for entry in media_index.query(category="videos", role="merged_ai_videos_with_bgm", extensions=[".mp4"])
+        ]
+        tts_videos = [
+            entry["path"] for entry in media_index.query(category="videos", role="tts_with_subtitle", extensions=[".mp4"], order="sequence")
+            if 'final_merged' not in entry["filename"]  # 개별 TTS 비디오들만 (merged 아닌)
+        ]
         
         print(f"📁 찾은 트랜지션 비디오: {len(transition_videos)}개")
         print(f"📁 찾은 BGM 비디오: {len(bgm_videos)}개") 
@@ -2997,9 +3321,10 @@ def merge_everything_together():
         ]
         
         print(f"🔧 FFmpeg 명령: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run_ffmpeg(cmd, capture_output=True, text=True)
         
         if result.returncode == 0:
+            index_media_file(final_output)
             file_size = os.path.getsize(final_output) / (1024 * 1024)  # MB
             print(f"✅ 완전한 비디오 병합 성공!")
             print(f"📁 최종 파일: {os.path.basename(final_output)}")
@@ -0,0 +1,7 @@
+"""
+테스트에서 저장소 최상위 모듈(mp4_validator 등)을 import할 수 있도록 경로 추가
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,119 @@
+"""
+mp4_validator 박스 파서 테스트 (메모리에서 만든 MP4 박스 바이트 사용, FFmpeg 불필요)
+"""
+import struct
+
+from mp4_validator import inspect_mp4, validate_video_file
+
+
+def box(box_type: bytes, payload: bytes = b"") -> bytes:
+    """32비트 크기 헤더 박스"""
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def box64(box_type: bytes, payload: bytes = b"") -> bytes:
+    """size == 1 + 64비트 largesize 헤더 박스"""
+    return struct.pack(">I4sQ", 1, box_type, 16 + len(payload)) + payload
+
+
+def mvhd(timescale: int, duration: int) -> bytes:
+    return box(b"mvhd", struct.pack(">B3xIIII", 0, 0, 0, timescale, duration) + bytes(80))
+
+
+def mdhd(timescale: int, duration: int, version: int = 0) -> bytes:
+    if version == 1:
+        payload = struct.pack(">B3xQQIQ", 1, 0, 0, timescale, duration) + bytes(4)
+    else:
+        payload = struct.pack(">B3xIIII", 0, 0, 0, timescale, duration) + bytes(4)
+    return box(b"mdhd", payload)
+
+
+def trak(handler: str, codec: str, sample_count: int, width: int = 0, height: int = 0,
+         timescale: int = 1000, duration: int = 2000, mdhd_version: int = 0) -> bytes:
+    """tkhd/mdia/minf/stbl 구조를 갖춘 트랙 박스"""
+    tkhd = box(b"tkhd", bytes(76) + struct.pack(">II", width << 16, height << 16))
+    hdlr = box(b"hdlr", bytes(8) + handler.encode("latin-1") + bytes(12))
+    stsd = box(b"stsd", struct.pack(">4xI", 1) + struct.pack(">I4s", 8, codec.encode("latin-1")))
+    stsz = box(b"stsz", struct.pack(">4xII", 0, sample_count))
+    stbl = box(b"stbl", stsd + stsz)
+    mdia = box(b"mdia", mdhd(timescale, duration, mdhd_version) + hdlr + box(b"minf", stbl))
+    return box(b"trak", tkhd + mdia)
+
+
+FTYP = box(b"ftyp", b"isom" + struct.pack(">I", 512) + b"isomavc1")
+VIDEO_TRAK = trak("vide", "avc1", 60, 1280, 720)
+
+
+def write(tmp_path, data: bytes, name: str = "clip.mp4") -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_faststart_video_with_audio(tmp_path):
+    moov = box(b"moov", mvhd(1000, 2500) + VIDEO_TRAK + trak("soun", "mp4a", 100))
+    info = inspect_mp4(write(tmp_path, FTYP + moov + box(b"mdat", bytes(32))))
+
+    assert info["valid"], info["error"]
+    assert info["faststart"] is True
+    assert info["duration"] == 2.5
+    assert info["has_video"] and info["video_codec"] == "avc1"
+    assert (info["width"], info["height"]) == (1280, 720)
+    assert info["has_audio"] and info["audio_codec"] == "mp4a"
+
+
+def test_moov_after_mdat(tmp_path):
+    moov = box(b"moov", mvhd(1000, 2000) + VIDEO_TRAK)
+    path = write(tmp_path, FTYP + box(b"mdat", bytes(32)) + moov)
+    info = inspect_mp4(path)
+
+    assert info["valid"], info["error"]
+    assert info["faststart"] is False
+    assert validate_video_file(path) == (True, None)
+
+
+def test_mdhd_versions_without_mvhd_duration(tmp_path):
+    for version in (0, 1):
+        moov = box(b"moov", mvhd(1000, 0) + trak("vide", "avc1", 60, 640, 360, 90000, 270000, mdhd_version=version))
+        info = inspect_mp4(write(tmp_path, FTYP + moov + box(b"mdat", bytes(16)), f"v{version}.mp4"))
+
+        assert info["valid"], info["error"]
+        assert info["duration"] == 3.0
+        assert info["tracks"][0]["duration"] == 3.0
+
+
+def test_64bit_box_sizes(tmp_path):
+    moov = box64(b"moov", mvhd(1000, 1000) + VIDEO_TRAK)
+    info = inspect_mp4(write(tmp_path, FTYP + moov + box64(b"mdat", bytes(64))))
+
+    assert info["valid"], info["error"]
+    assert info["has_video"]
+    assert info["faststart"] is True
+
+
+def test_truncated_mdat(tmp_path):
+    moov = box(b"moov", mvhd(1000, 2000) + VIDEO_TRAK)
+    mdat = box(b"mdat", bytes(1024))[:-100]  # 다운로드가 중간에 끊긴 경우
+    path = write(tmp_path, FTYP + moov + mdat)
+    info = inspect_mp4(path)
+
+    assert not info["valid"]
+    assert "잘렸습니다" in info["error"]
+    assert validate_video_file(path)[0] is False
+
+
+def test_zero_sample_audio_track(tmp_path):
+    moov = box(b"moov", mvhd(1000, 2000) + VIDEO_TRAK + trak("soun", "mp4a", 0))
+    info = inspect_mp4(write(tmp_path, FTYP + moov + box(b"mdat", bytes(32))))
+
+    assert info["valid"], info["error"]
+    assert info["has_video"]
+    assert info["has_audio"] is False
+    assert info["audio_codec"] is None
+
+
+def test_missing_moov(tmp_path):
+    info = inspect_mp4(write(tmp_path, FTYP + box(b"mdat", bytes(32))))
+
+    assert not info["valid"]
+    assert "moov" in info["error"]
@@ -0,0 +1,129 @@
+"""
+SmoothTransitions 효과의 FFmpeg 필터 버전
+zoom_in, zoom_out, pan_*, rotate_* 트랜지션을 `xfade=transition=custom:expr=...` 식으로 표현해
+파이썬 프레임 루프 없이 단일 FFmpeg 인코딩 안에서 렌더링 (fade는 xfade 기본 트랜지션 사용)
+"""
+from typing import Iterable
+
+TRANSITION_SPLIT = 0.4  # A 40%, B 60% 시간 분할 (transitions.SmoothTransitions와 동일)
+
+# custom 식으로 구현한 트랜지션 (VideoTransitions.create_transition과 같은 이름)
+CUSTOM_XFADE_TRANSITIONS = (
+    "zoom_in", "zoom_out",
+    "pan_right", "pan_left", "pan_up", "pan_down",
+    "rotate_clockwise", "rotate_counter_clockwise",
+)
+
+# custom 식은 평면마다 같은 좌표계를 써야 하므로 크로마 서브샘플링이 없는 RGB 평면 포맷에서 실행 (검은색 = 0)
+CUSTOM_XFADE_PIX_FMT = "gbrp"
+
+# 식 안에서 쓰는 값 (st/ld 레지스터): 0=진행률 p, 1=배율/각도/가중치, 2=원본 x 또는 이동량, 3=원본 y
+_PROGRESS = "st(0,1-P)"  # xfade의 P는 1에서 0으로 줄어들므로 0→1 진행률로 변환
+_FIRST = f"lte(ld(0),{TRANSITION_SPLIT})"
+_EASE_IN_A = f"pow(ld(0)/{TRANSITION_SPLIT},2)"
+_EASE_OUT_B = f"(1-pow(1-(ld(0)-{TRANSITION_SPLIT})/{1 - TRANSITION_SPLIT:g},2))"
+_SMOOTH = "(1-cos(PI*ld(0)))/2"
+
+
+def is_custom_transition(transition: str) -> bool:
+    """custom 식으로 렌더링하는 트랜지션인지 여부"""
+    return transition in CUSTOM_XFADE_TRANSITIONS
+
+
+def _fetch(source: str, x: str, y: str) -> str:
+    """현재 평면에서 source(a 또는 b)의 (x, y) 픽셀 값 (화면 밖이면 검은색)"""
+    return (
+        f"if(gte({x},0)*lt({x},W)*gte({y},0)*lt({y},H),"
+        f"if(eq(PLANE,0),{source}0({x},{y}),if(eq(PLANE,1),{source}1({x},{y}),{source}2({x},{y}))),0)"
+    )
+
+
+def _zoom_expr(scale_a: str, scale_b: str) -> str:
+    """화면 중심 기준 확대/축소 (앞 40%는 A, 나머지는 B)"""
+    return ";".join([
+        _PROGRESS,
+        f"st(1,max(if({_FIRST},{scale_a},{scale_b}),0.001))",
+        "st(2,(X-W/2)/ld(1)+W/2)",
+        "st(3,(Y-H/2)/ld(1)+H/2)",
+        f"if({_FIRST},{_fetch('a', 'ld(2)', 'ld(3)')},{_fetch('b', 'ld(2)', 'ld(3)')})"
+    ])
+
+
+def _rotate_expr(clockwise: bool) -> str:
+    """화면 중심 기준 회전 (cv2.getRotationMatrix2D 각도 방향과 동일, 앞 40%는 A 0→100도, 나머지는 B 100→360도)"""
+    sign = "" if clockwise else "-"
+    return ";".join([
+        _PROGRESS,
+        f"st(1,{sign}if({_FIRST},100*{_EASE_IN_A},100+260*{_EASE_OUT_B})*PI/180)",
+        "st(2,cos(ld(1))*(X-W/2)-sin(ld(1))*(Y-H/2)+W/2)",
+        "st(3,sin(ld(1))*(X-W/2)+cos(ld(1))*(Y-H/2)+H/2)",
+        f"if({_FIRST},{_fetch('a', 'ld(2)', 'ld(3)')},{_fetch('b', 'ld(2)', 'ld(3)')})"
+    ])
+
+
+def _pan_expr(direction: str) -> str:
+    """A가 밀려나고 B가 들어오는 패닝 (코사인 가속, 밀려나는 동안 A는 어두워지고 B는 밝아짐)"""
+    axis, size = ("X", "W") if direction in ("left", "right") else ("Y", "H")
+
+    def at(offset: str) -> tuple:
+        return (f"{axis}{offset}", "Y") if axis == "X" else ("X", f"{axis}{offset}")
+
+    if direction in ("right", "down"):
+        condition = f"gte({axis},ld(2))"
+        a_x, a_y = at("-ld(2)")
+        b_x, b_y = at(f"+{size}-ld(2)")
+    else:
+        condition = f"lt({axis},{size}-ld(2))"
+        a_x, a_y = at("+ld(2)")
+        b_x, b_y = at(f"-{size}+ld(2)")
+    return ";".join([
+        _PROGRESS,
+        f"st(1,{_SMOOTH})",
+        f"st(2,floor({size}*ld(1)))",
+        f"if({condition},{_fetch('a', a_x, a_y)}*(1-ld(1)),{_fetch('b', b_x, b_y)}*ld(1))"
+    ])
+
+
+def custom_xfade_expr(transition: str) -> str:
+    """
+    트랜지션의 xfade custom 식
+
+    Args:
+        transition: CUSTOM_XFADE_TRANSITIONS 중 하나
+
+    Returns:
+        str: xfade expr 값 (필터 그래프에 넣을 때는 작은따옴표로 감싸야 함)
+    """
+    if transition == "zoom_in":
+        return _zoom_expr(f"1+{_EASE_IN_A}", _EASE_OUT_B)
+    if transition == "zoom_out":
+        return _zoom_expr(f"1-0.5*{_EASE_IN_A}", f"3-2*{_EASE_OUT_B}")
+    if transition.startswith("pan_"):
+        return _pan_expr(transition.split("_", 1)[1])
+    if transition == "rotate_clockwise":
+        return _rotate_expr(True)
+    if transition == "rotate_counter_clockwise":
+        return _rotate_expr(False)
+    raise ValueError(f"custom 식이 없는 트랜지션: {transition}")
+
+
+def xfade_filter(transition: str, duration: float, offset: float) -> str:
+    """
+    트랜지션 이름에 맞는 xfade 필터 문자열 (기본 트랜지션은 그대로, 나머지는 custom 식)
+
+    Args:
+        transition: xfade 기본 트랜지션 또는 CUSTOM_XFADE_TRANSITIONS 중 하나
+        duration: 트랜지션 길이 (초)
+        offset: 트랜지션 시작 시각 (초)
+
+    Returns:
+        str: xfade 필터
+    """
+    if is_custom_transition(transition):
+        return f"xfade=transition=custom:expr='{custom_xfade_expr(transition)}':duration={duration}:offset={offset}"
+    return f"xfade=transition={transition}:duration={duration}:offset={offset}"
+
+
+def transition_pix_fmt(transitions: Iterable[str], default: str = "yuv420p") -> str:
+    """트랜지션 체인을 실행할 픽셀 포맷 (custom 식이 하나라도 있으면 RGB 평면 포맷)"""
+    return CUSTOM_XFADE_PIX_FMT if any(is_custom_transition(t) for t in transitions) else default
@@ -0,0 +1,566 @@
+"""
+A→B 트랜지션 일괄 렌더링 (numpy/OpenCV)
+A 클립 끝 구간과 B 클립 앞 구간을 한 번만 디코딩해 미리 할당한 uint8 배열에 담고,
+프레임별 배율/변환 행렬/가중치를 미리 계산한 뒤 트랜지션 프레임 전체를 한 번에 만들어 FFmpeg 인코더 하나로 보냄
+"""
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ffmpeg_executor import FFMPEG_MAX_CONCURRENCY, get_ffmpeg_executor, run_ffmpeg
+from media_probe import get_media_duration
+from mp4_validator import has_audio_stream
+from smart_concat import check_copy_compatible, stream_copy_concat
+from transition_filters import TRANSITION_SPLIT
+from video_models import VideoConfig
+
+TRANSITION_RENDER_PRESET = os.getenv("TRANSITION_RENDER_PRESET", "fast")
+TRANSITION_RENDER_CRF = int(os.getenv("TRANSITION_RENDER_CRF", "18"))
+TRANSITION_RENDER_TIMEOUT = int(os.getenv("TRANSITION_RENDER_TIMEOUT", "120"))  # FFmpeg 명령별 제한 시간 (초)
+TRANSITION_AUDIO_RATE = 44100  # 구간을 스트림 복사로 이어 붙일 수 있도록 모든 구간의 오디오를 같은 형식으로 인코딩
+# 트랜지션 병렬 렌더링 프로세스 수 (기본값은 코어 수)
+# 작업 프로세스마다 FFmpeg 실행기가 따로 생기므로, 부모 프로세스가 구간마다 공용 실행기 슬롯을 잡고 제출함
+# → 실제로 동시에 렌더링되는 구간 수는 다른 요청의 FFmpeg 작업까지 합쳐 FFMPEG_MAX_CONCURRENCY를 넘지 않음
+TRANSITION_WORKERS = int(os.getenv("TRANSITION_WORKERS", str(os.cpu_count() or 1)))
+# 구간 인코딩 하나가 쓰는 libx264 스레드 수 (동시 구간 수 × 스레드 수가 코어 수를 넘지 않도록)
+TRANSITION_ENCODE_THREADS = int(os.getenv(
+    "TRANSITION_ENCODE_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, min(TRANSITION_WORKERS, FFMPEG_MAX_CONCURRENCY))))
+))
+
+# 트랜지션 효과음 경로
+TRANSITION_EFFECT_SOUNDS = {
+    "zoom": "./effect/zoom.mp3",
+    "pan": "./effect/pan.mp3",
+    "rotate": "./effect/rotate.mp3",
+}
+
+TRANSITION_TYPES = (
+    "zoom_in", "zoom_out",
+    "pan_right", "pan_left", "pan_up", "pan_down",
+    "rotate_clockwise", "rotate_counter_clockwise",
+    "fade",
+)
+
+
+def _ease_in(p: np.ndarray) -> np.ndarray:
+    return p * p
+
+
+def _ease_out(p: np.ndarray) -> np.ndarray:
+    return 1 - (1 - p) * (1 - p)
+
+
+def transition_frame_count(duration: float, fps: float) -> int:
+    """트랜지션 프레임 수"""
+    return max(1, int(round(duration * fps)))
+
+
+def effect_sound_for(transition_type: str) -> Optional[str]:
+    """트랜지션 종류에 맞는 효과음 경로 (fade 등 효과음이 없으면 None)"""
+    effect = transition_type.split("_", 1)[0]
+    return TRANSITION_EFFECT_SOUNDS.get(effect)
+
+
+def _scale_matrices(scales: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """화면 중심 기준 확대/축소 행렬 (프레임별 2x3)"""
+    width, height = size
+    scales = np.maximum(scales, 1e-3)  # 배율 0은 역행렬이 없으므로 한 픽셀 크기로 제한
+    matrices = np.zeros((len(scales), 2, 3), dtype=np.float64)
+    matrices[:, 0, 0] = scales
+    matrices[:, 1, 1] = scales
+    matrices[:, 0, 2] = (1 - scales) * width / 2
+    matrices[:, 1, 2] = (1 - scales) * height / 2
+    return matrices
+
+
+def _rotation_matrices(angles: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """화면 중심 기준 회전 행렬 (cv2.getRotationMatrix2D와 같은 식을 프레임 전체에 한 번에 계산)"""
+    width, height = size
+    cx, cy = width // 2, height // 2
+    radians = np.deg2rad(angles)
+    alpha, beta = np.cos(radians), np.sin(radians)
+    matrices = np.empty((len(angles), 2, 3), dtype=np.float64)
+    matrices[:, 0, 0] = alpha
+    matrices[:, 0, 1] = beta
+    matrices[:, 0, 2] = (1 - alpha) * cx - beta * cy
+    matrices[:, 1, 0] = -beta
+    matrices[:, 1, 1] = alpha
+    matrices[:, 1, 2] = beta * cx + (1 - alpha) * cy
+    return matrices
+
+
+def plan_transition(transition_type: str, frame_count: int, size: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    트랜지션 프레임별 파라미터 미리 계산 (진행률, 배율/회전 행렬, 이동량, 가중치)
+
+    Args:
+        transition_type: 트랜지션 종류 (TRANSITION_TYPES 중 하나)
+        frame_count: 트랜지션 프레임 수
+        size: 출력 (가로, 세로)
+
+    Returns:
+        Dict[str, Any]: kind(warp/pan/fade), use_a/use_b(프레임별 A/B 사용 여부), matrices, offsets, weights 등
+    """
+    if transition_type not in TRANSITION_TYPES:
+        raise ValueError(f"지원되지 않는 트랜지션 타입: {transition_type}")
+
+    p = np.arange(frame_count, dtype=np.float64) / frame_count
+    first = p <= TRANSITION_SPLIT  # 앞 40%는 A, 나머지는 B
+    pa = _ease_in(np.clip(p / TRANSITION_SPLIT, 0, 1))
+    pb = _ease_out(np.clip((p - TRANSITION_SPLIT) / (1.0 - TRANSITION_SPLIT), 0, 1))
+    smooth_p = (1 - np.cos(p * np.pi)) / 2  # 중앙 겹침을 보장하는 동기화 진행률
+
+    plan: Dict[str, Any] = {
+        "type": transition_type,
+        "frame_count": frame_count,
+        "size": size,
+        "use_a": first,
+        "use_b": ~first,
+        "matrices": None,
+        "offsets": None,
+        "weights": None,
+        "axis": None,
+        "forward": None,
+        "interpolation": cv2.INTER_LINEAR
+    }
+
+    if transition_type == "zoom_in":
+        plan["kind"] = "warp"
+        plan["matrices"] = _scale_matrices(np.where(first, 1.0 + pa, pb), size)
+        plan["interpolation"] = cv2.INTER_CUBIC
+    elif transition_type == "zoom_out":
+        plan["kind"] = "warp"
+        plan["matrices"] = _scale_matrices(np.where(first, 1.0 - 0.5 * pa, 3.0 - 2.0 * pb), size)
+        plan["interpolation"] = cv2.INTER_CUBIC
+    elif transition_type.startswith("rotate_"):
+        angles = np.where(first, 100 * pa, 100 + 260 * pb)
+        if transition_type == "rotate_counter_clockwise":
+            angles = -angles
+        plan["kind"] = "warp"
+        plan["matrices"] = _rotation_matrices(angles, size)
+    else:
+        # pan/fade는 매 프레임 A와 B를 모두 사용
+        plan["use_a"] = np.ones(frame_count, dtype=bool)
+        plan["use_b"] = np.ones(frame_count, dtype=bool)
+        plan["weights"] = smooth_p
+        if transition_type == "fade":
+            plan["kind"] = "fade"
+        else:
+            direction = transition_type.split("_", 1)[1]
+            plan["kind"] = "pan"
+            plan["axis"] = 1 if direction in ("left", "right") else 0
+            plan["forward"] = direction in ("right", "down")  # A가 오른쪽/아래로 밀려나는지
+            max_offset = size[0] if plan["axis"] == 1 else size[1]
+            plan["offsets"] = (max_offset * smooth_p).astype(np.int64)
+    return plan
+
+
+def _axis_slice(axis: int, start: int, stop: int) -> tuple:
+    return (slice(None), slice(start, stop)) if axis == 1 else (slice(start, stop),)
+
+
+def _render_pan_frame(fa: np.ndarray, fb: np.ndarray, out: np.ndarray, offset: int, weight: float, axis: int, forward: bool):
+    """
+    패닝 한 프레임 (A와 B가 겹치지 않게 밀려나므로 warpAffine 두 번 + addWeighted 대신 구간별 복사와 밝기 조정만 수행)
+    """
+    max_offset = out.shape[1] if axis == 1 else out.shape[0]
+    out.fill(0)
+    if forward:
+        a_dst, a_src = (offset, max_offset), (0, max_offset - offset)
+        b_dst, b_src = (0, offset), (max_offset - offset, max_offset)
+    else:
+        a_dst, a_src = (0, max_offset - offset), (offset, max_offset)
+        b_dst, b_src = (max_offset - offset, max_offset), (0, offset)
+    if a_dst[1] > a_dst[0]:
+        out[_axis_slice(axis, *a_dst)] = cv2.convertScaleAbs(fa[_axis_slice(axis, *a_src)], alpha=1 - weight)
+    if b_dst[1] > b_dst[0]:
+        out[_axis_slice(axis, *b_dst)] = cv2.convertScaleAbs(fb[_axis_slice(axis, *b_src)], alpha=weight)
+
+
+def render_frames(frames_a: np.ndarray, frames_b: np.ndarray, plan: Dict[str, Any], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    미리 계산한 파라미터로 트랜지션 프레임 전체 렌더링
+
+    Args:
+        frames_a: A 끝 구간 프레임 (N, H, W, 3) uint8, 출력 크기로 디코딩된 상태
+        frames_b: B 앞 구간 프레임 (N, H, W, 3) uint8
+        plan: plan_transition 결과
+        out: 결과를 쓸 배열 (None이면 새로 할당)
+
+    Returns:
+        np.ndarray: 트랜지션 프레임 (N, H, W, 3) uint8
+    """
+    frame_count = plan["frame_count"]
+    width, height = plan["size"]
+    if out is None:
+        out = np.empty((frame_count, height, width, 3), dtype=np.uint8)
+
+    if plan["kind"] == "warp":
+        for k in range(frame_count):
+            source = frames_a[k] if plan["use_a"][k] else frames_b[k]
+            cv2.warpAffine(
+                source, plan["matrices"][k], (width, height), dst=out[k],
+                flags=plan["interpolation"], borderMode=cv2.BORDER_CONSTANT, borderValue=0
+            )
+    elif plan["kind"] == "pan":
+        for k in range(frame_count):
+            _render_pan_frame(
+                frames_a[k], frames_b[k], out[k], int(plan["offsets"][k]), float(plan["weights"][k]),
+                plan["axis"], plan["forward"]
+            )
+    else:
+        for k in range(frame_count):
+            weight = float(plan["weights"][k])
+            cv2.addWeighted(frames_a[k], 1 - weight, frames_b[k], weight, 0, dst=out[k])
+    return out
+
+
+def decode_clip_window(clip, start: float, fps: float, needed: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    MoviePy 클립에서 트랜지션 구간 프레임을 한 번씩만 읽어 배열에 담기 (쓰지 않는 프레임은 읽지 않음)
+    클립은 clip_normalizer로 목표 크기에 맞춰 둔 것을 기대하며, 크기가 다를 때만 프레임마다 리사이즈
+
+    Args:
+        clip: MoviePy 비디오 클립
+        start: 구간 시작 시각 (초)
+        fps: 트랜지션 fps
+        needed: 프레임별로 읽을지 여부 (plan의 use_a/use_b)
+        size: 출력 (가로, 세로)
+
+    Returns:
+        np.ndarray: (N, H, W, 3) uint8
+    """
+    width, height = size
+    frames = np.zeros((len(needed), height, width, 3), dtype=np.uint8)
+    needs_resize = tuple(clip.size) != (width, height)
+    if needs_resize:
+        print(f"ℹ️ 클립 크기 {clip.size[0]}x{clip.size[1]}가 목표 크기와 달라 프레임마다 리사이즈합니다.")
+    for k in np.flatnonzero(needed):
+        frame = clip.get_frame(start + k / fps)
+        if needs_resize:
+            frame = cv2.resize(frame, (width, height))
+        frames[k] = frame[:, :, :3]
+    return frames
+
+
+def decode_window(
+    path: str,
+    start: float,
+    frame_count: int,
+    fps: float,
+    size: Tuple[int, int],
+    ffmpeg_path: str = "ffmpeg",
+    out: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """
+    영상 파일의 구간을 출력 크기/fps로 한 번 디코딩해 uint8 배열에 담기
+
+    Args:
+        path: 영상 파일 경로
+        start: 구간 시작 시각 (초)
+        frame_count: 읽을 프레임 수
+        fps: 트랜지션 fps
+        size: 출력 (가로, 세로)
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        out: 결과를 쓸 배열 (None이면 새로 할당)
+
+    Returns:
+        Optional[np.ndarray]: (N, H, W, 3) uint8, 디코딩 실패시 None
+    """
+    width, height = size
+    if out is None:
+        out = np.empty((frame_count, height, width, 3), dtype=np.uint8)
+    cmd = [
+        ffmpeg_path, '-v', 'error', '-ss', f"{start:.3f}", '-i', path, '-an',
+        '-vf', f"fps={fps},scale={width}:{height}", '-frames:v', str(frame_count),
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1'
+    ]
+    result = run_ffmpeg(cmd, capture_output=True, text=False, timeout=TRANSITION_RENDER_TIMEOUT)
+    frame_bytes = width * height * 3
+    decoded = min(len(result.stdout) // frame_bytes, frame_count) if result.returncode == 0 else 0
+    if decoded == 0:
+        print(f"⚠️ 트랜지션 구간 디코딩 실패 ({os.path.basename(path)}): {result.stderr.decode('utf-8', errors='replace')[-300:]}")
+        return None
+
+    out[:decoded] = np.frombuffer(result.stdout, dtype=np.uint8, count=decoded * frame_bytes).reshape(decoded, height, width, 3)
+    if decoded < frame_count:
+        out[decoded:] = out[decoded - 1]  # 클립이 트랜지션보다 짧으면 마지막 프레임 유지
+    return out
+
+
+def encode_frames(
+    frames: np.ndarray,
+    output_path: str,
+    fps: float,
+    ffmpeg_path: str = "ffmpeg",
+    audio_path: Optional[str] = None,
+    silent_audio: bool = False
+) -> bool:
+    """
+    rgb24 프레임 배열을 파이프로 FFmpeg 인코더 하나에 보내 MP4로 저장
+
+    Args:
+        frames: (N, H, W, 3) uint8 프레임
+        output_path: 출력 MP4 경로
+        fps: 출력 fps
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        audio_path: 함께 넣을 효과음 (영상 길이에 맞춰 자르거나 무음으로 채움)
+        silent_audio: 효과음이 없을 때 무음 오디오 트랙을 넣을지 여부 (다른 구간과 이어 붙일 때 사용)
+
+    Returns:
+        bool: 성공 여부
+    """
+    frame_count, height, width, _ = frames.shape
+    cmd = [
+        ffmpeg_path, '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+        '-s', f"{width}x{height}", '-r', f"{fps:.6g}", '-i', 'pipe:0'
+    ]
+    if audio_path and os.path.exists(audio_path):
+        cmd += ['-i', audio_path, '-map', '0:v', '-map', '1:a', '-af', 'apad']
+    elif silent_audio:
+        cmd += ['-f', 'lavfi', '-i', f"anullsrc=r={TRANSITION_AUDIO_RATE}:cl=stereo", '-map', '0:v', '-map', '1:a']
+    if (audio_path and os.path.exists(audio_path)) or silent_audio:
+        cmd += ['-c:a', 'aac', '-ar', str(TRANSITION_AUDIO_RATE), '-ac', '2']
+    cmd += [
+        '-c:v', 'libx264', '-preset', TRANSITION_RENDER_PRESET, '-crf', str(TRANSITION_RENDER_CRF),
+        '-threads', str(TRANSITION_ENCODE_THREADS),
+        '-pix_fmt', 'yuv420p', '-t', f"{frame_count / fps:.3f}", '-movflags', '+faststart', output_path
+    ]
+    raw = np.ascontiguousarray(frames).reshape(-1).data
+    result = run_ffmpeg(cmd, input=raw, capture_output=True, text=False, timeout=TRANSITION_RENDER_TIMEOUT)
+    if result.returncode != 0:
+        print(f"⚠️ 트랜지션 인코딩 실패: {result.stderr.decode('utf-8', errors='replace')[-300:]}")
+        return False
+    return True
+
+
+def render_transition_file(
+    path_a: str,
+    path_b: str,
+    transition_type: str,
+    output_path: str,
+    duration: float = VideoConfig.TRANSITION_DURATION,
+    fps: float = VideoConfig.FPS,
+    size: Tuple[int, int] = (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT),
+    with_sound: bool = True,
+    ffmpeg_path: str = "ffmpeg",
+    a_end: Optional[float] = None,
+    silent_audio: bool = False
+) -> bool:
+    """
+    A 끝 구간 → B 앞 구간 트랜지션을 영상 파일로 렌더링 (MoviePy 없이 디코딩 2번, 인코딩 1번)
+
+    Args:
+        path_a: 앞 클립 경로
+        path_b: 뒤 클립 경로
+        transition_type: 트랜지션 종류 (TRANSITION_TYPES 중 하나)
+        output_path: 출력 MP4 경로
+        duration: 트랜지션 길이 (초)
+        fps: 출력 fps
+        size: 출력 (가로, 세로)
+        with_sound: 효과음 포함 여부
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        a_end: 앞 클립에서 사용할 구간의 끝 (초, None이면 클립 끝)
+        silent_audio: 효과음이 없을 때 무음 오디오 트랙을 넣을지 여부
+
+    Returns:
+        bool: 성공 여부
+    """
+    started_at = time.time()
+    a_duration = a_end or get_media_duration(path_a, ffmpeg_path)
+    if not a_duration:
+        print(f"⚠️ 앞 클립 길이를 확인할 수 없습니다: {os.path.basename(path_a)}")
+        return False
+
+    frame_count = transition_frame_count(duration, fps)
+    plan = plan_transition(transition_type, frame_count, size)
+    frames_a = decode_window(path_a, max(0.0, a_duration - duration), frame_count, fps, size, ffmpeg_path)
+    frames_b = decode_window(path_b, 0.0, frame_count, fps, size, ffmpeg_path)
+    if frames_a is None or frames_b is None:
+        return False
+
+    frames = render_frames(frames_a, frames_b, plan)
+    del frames_a, frames_b
+    audio_path = effect_sound_for(transition_type) if with_sound else None
+    if not encode_frames(frames, output_path, fps, ffmpeg_path, audio_path, silent_audio):
+        return False
+    print(f"⚡ 트랜지션 렌더링 완료: {transition_type} ({frame_count}프레임, {time.time() - started_at:.2f}초)")
+    return True
+
+
+def render_clip_segment(
+    path: str,
+    start: float,
+    end: float,
+    output_path: str,
+    fps: float = VideoConfig.FPS,
+    size: Tuple[int, int] = (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT),
+    ffmpeg_path: str = "ffmpeg"
+) -> bool:
+    """
+    클립의 트랜지션 사이 구간을 트랜지션 구간과 같은 코덱 파라미터로 인코딩 (이어 붙일 때 스트림 복사 가능)
+
+    Args:
+        path: 클립 경로
+        start: 구간 시작 (초)
+        end: 구간 끝 (초)
+        output_path: 출력 MP4 경로
+        fps: 출력 fps
+        size: 출력 (가로, 세로)
+        ffmpeg_path: FFmpeg 실행 파일 경로
+
+    Returns:
+        bool: 성공 여부
+    """
+    width, height = size
+    has_audio = has_audio_stream(path, ffmpeg_path)
+    cmd = [ffmpeg_path, '-y', '-ss', f"{start:.3f}", '-i', path]
+    if has_audio:
+        cmd += ['-map', '0:v:0', '-map', '0:a:0', '-af', 'apad']
+    else:
+        cmd += ['-f', 'lavfi', '-i', f"anullsrc=r={TRANSITION_AUDIO_RATE}:cl=stereo", '-map', '0:v:0', '-map', '1:a']
+    cmd += [
+        '-t', f"{end - start:.3f}", '-vf', f"fps={fps},scale={width}:{height}",
+        '-c:v', 'libx264', '-preset', TRANSITION_RENDER_PRESET, '-crf', str(TRANSITION_RENDER_CRF), '-pix_fmt', 'yuv420p',
+        '-threads', str(TRANSITION_ENCODE_THREADS),
+        '-c:a', 'aac', '-ar', str(TRANSITION_AUDIO_RATE), '-ac', '2', '-movflags', '+faststart', output_path
+    ]
+    result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=TRANSITION_RENDER_TIMEOUT)
+    if result.returncode != 0:
+        print(f"⚠️ 클립 구간 인코딩 실패 ({os.path.basename(path)}): {result.stderr[-300:]}")
+        return False
+    return True
+
+
+def render_segment_task(task: Dict[str, Any]) -> bool:
+    """작업 프로세스에서 구간 하나 렌더링 (ProcessPoolExecutor에 넘기도록 모듈 최상위에 둠)"""
+    try:
+        if task["kind"] == "transition":
+            return render_transition_file(
+                task["path_a"], task["path_b"], task["transition_type"], task["output_path"],
+                duration=task["duration"], ffmpeg_path=task["ffmpeg_path"],
+                a_end=task["a_end"], silent_audio=True
+            )
+        return render_clip_segment(
+            task["path"], task["start"], task["end"], task["output_path"], ffmpeg_path=task["ffmpeg_path"]
+        )
+    except Exception as e:
+        print(f"⚠️ 구간 렌더링 오류 ({os.path.basename(task['output_path'])}): {e}")
+        return False
+
+
+def plan_sequence_segments(
+    paths: List[str],
+    transition_types: List[str],
+    duration: float,
+    work_dir: str,
+    clip_lengths: Optional[List[float]] = None,
+    ffmpeg_path: str = "ffmpeg"
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    클립 본문 구간과 경계별 트랜지션 구간으로 나눈 렌더링 작업 목록 (재생 순서)
+
+    Args:
+        paths: 재생 순서대로의 클립 경로 (같은 파일이 여러 번 나와도 됨)
+        transition_types: 경계별 트랜지션 종류 (len(paths) - 1개)
+        duration: 트랜지션 길이 (초)
+        work_dir: 구간 파일을 저장할 디렉토리
+        clip_lengths: 클립별로 사용할 길이 (초, None이면 클립 전체)
+        ffmpeg_path: FFmpeg 실행 파일 경로
+
+    Returns:
+        Optional[List[Dict]]: 작업 목록, 트랜지션보다 짧은 클립이 있으면 None
+    """
+    lengths = clip_lengths or [get_media_duration(path, ffmpeg_path) for path in paths]
+    last = len(paths) - 1
+    tasks = []
+    for i, path in enumerate(paths):
+        length = lengths[i]
+        start = duration if i > 0 else 0.0
+        end = length - duration if i < last else length
+        if not length or end - start <= 0:
+            print(f"ℹ️ {os.path.basename(path)}이 트랜지션 길이보다 짧아 병렬 렌더링을 사용하지 않습니다.")
+            return None
+        tasks.append({
+            "kind": "clip", "path": path, "start": start, "end": end, "ffmpeg_path": ffmpeg_path,
+            "output_path": os.path.join(work_dir, f"segment_{2 * i:03d}.mp4")
+        })
+        if i < last:
+            tasks.append({
+                "kind": "transition", "path_a": path, "path_b": paths[i + 1], "a_end": length,
+                "transition_type": transition_types[i], "duration": duration, "ffmpeg_path": ffmpeg_path,
+                "output_path": os.path.join(work_dir, f"segment_{2 * i + 1:03d}.mp4")
+            })
+    return tasks
+
+
+def render_sequence_parallel(
+    paths: List[str],
+    transition_types: List[str],
+    output_path: str,
+    duration: float = VideoConfig.TRANSITION_DURATION,
+    clip_lengths: Optional[List[float]] = None,
+    ffmpeg_path: str = "ffmpeg",
+    max_workers: int = TRANSITION_WORKERS
+) -> bool:
+    """
+    경계마다 트랜지션을 별도 프로세스에서 렌더링하고 스트림 복사로 이어 붙이기
+
+    Args:
+        paths: 재생 순서대로의 클립 경로
+        transition_types: 경계별 트랜지션 종류 (len(paths) - 1개)
+        output_path: 출력 MP4 경로
+        duration: 트랜지션 길이 (초)
+        clip_lengths: 클립별로 사용할 길이 (초, None이면 클립 전체)
+        ffmpeg_path: FFmpeg 실행 파일 경로
+        max_workers: 최대 작업 프로세스 수 (구간마다 공용 FFmpeg 실행기 슬롯을 잡으므로 실제 동시 렌더링 수는 전체 한도 이내)
+
+    Returns:
+        bool: 성공 여부 (False면 호출자가 MoviePy 경로로 처리)
+    """
+    started_at = time.time()
+    work_dir = tempfile.mkdtemp(prefix="transition_segments_")
+    try:
+        tasks = plan_sequence_segments(paths, transition_types, duration, work_dir, clip_lengths, ffmpeg_path)
+        if not tasks:
+            return False
+
+        workers = max(1, min(max_workers, len(tasks)))
+        executor = get_ffmpeg_executor()
+        print(
+            f"🧵 트랜지션 {len(paths) - 1}개 포함 {len(tasks)}개 구간을 {workers}개 프로세스로 렌더링 "
+            f"(동시 실행은 FFmpeg 실행기 한도 {executor.max_concurrency}개 이내)"
+        )
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                def submit_with_slot(task: Dict[str, Any]) -> bool:
+                    # 작업 프로세스 안의 FFmpeg는 부모 실행기가 모르므로 구간이 끝날 때까지 부모 슬롯을 잡아 둠
+                    with executor.slot():
+                        return pool.submit(render_segment_task, task).result()
+
+                with ThreadPoolExecutor(max_workers=workers) as submitters:
+                    results = list(submitters.map(submit_with_slot, tasks))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ 병렬 렌더링 프로세스 오류: {e}")
+            return False
+        if not all(results):
+            return False
+
+        segment_paths = [task["output_path"] for task in tasks]
+        compatible, reason, _ = check_copy_compatible(segment_paths, ffmpeg_path)
+        if not compatible:
+            print(f"⚠️ 구간 코덱 파라미터가 맞지 않습니다: {reason}")
+            return False
+        if not stream_copy_concat(segment_paths, output_path, ffmpeg_path):
+            return False
+        print(f"⚡ 병렬 트랜지션 렌더링 완료: {time.time() - started_at:.1f}초")
+        return True
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -1,23 +1,27 @@
-import numpy as np
 import cv2
-from moviepy.editor import VideoClip, AudioFileClip, CompositeAudioClip
+from moviepy.editor import VideoClip, CompositeAudioClip
+from moviepy.audio.AudioClip import AudioArrayClip
 from video_models import VideoConfig
+from effect_sounds import get_effect_sound_bank
+from transition_renderer import (
+    TRANSITION_EFFECT_SOUNDS, TRANSITION_SPLIT, decode_clip_window, plan_transition, render_frames, transition_frame_count
+)
 
 # 트랜지션 설정값
 duration = VideoConfig.TRANSITION_DURATION
 target_w, target_h = VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT
-split = 0.4  # A 40%, B 60% 시간 분할
+split = TRANSITION_SPLIT  # A 40%, B 60% 시간 분할
 
 # 효과음 경로
-audio_paths = {
-    "zoom": "./effect/zoom.mp3",
-    "pan": "./effect/pan.mp3",
-    "rotate": "./effect/rotate.mp3",
-}
+audio_paths = TRANSITION_EFFECT_SOUNDS
 
 def attach_audio_to_transition(clip, audio_path):
-    audio = AudioFileClip(audio_path).subclip(0, min(clip.duration, AudioFileClip(audio_path).duration))
-    return clip.set_audio(audio)
+    # 메모리에 디코딩해 둔 효과음을 잘라 사용 (트랜지션마다 FFmpeg 리더를 띄우지 않음)
+    bank = get_effect_sound_bank()
+    samples = bank.slice(audio_path, clip.duration)
+    if samples is None:
+        return clip
+    return clip.set_audio(AudioArrayClip(samples, fps=bank.sample_rate))
 
 class SmoothTransitions:
 
@@ -39,116 +43,56 @@ class SmoothTransitions:
         return resized[y1:y2, x1:x2]
 
     @staticmethod
-    def zoom_in(a, b, duration=duration):
-        a_start, b_start = max(0, a.duration - duration), 0.0
+    def render_batch(a, b, transition_type, duration=duration, fps=VideoConfig.FPS):
+        """
+        A 끝 구간과 B 앞 구간을 한 번씩만 읽고, 미리 계산한 행렬/가중치로 트랜지션 프레임 전체를 한 번에 렌더링
+
+        Args:
+            a: 앞 클립 (MoviePy)
+            b: 뒤 클립 (MoviePy)
+            transition_type: 트랜지션 종류 (zoom_in, pan_right, rotate_clockwise, fade 등)
+            duration: 트랜지션 길이 (초)
+            fps: 트랜지션 fps (최종 영상 저장 fps와 같아야 프레임이 어긋나지 않음)
+
+        Returns:
+            VideoClip: 렌더링된 프레임을 재생하는 클립
+        """
+        frame_count = transition_frame_count(duration, fps)
+        plan = plan_transition(transition_type, frame_count, (target_w, target_h))
+        a_start = max(0, a.duration - duration)
+        frames_a = decode_clip_window(a, a_start, fps, plan["use_a"], (target_w, target_h))
+        frames_b = decode_clip_window(b, 0.0, fps, plan["use_b"], (target_w, target_h))
+        frames = render_frames(frames_a, frames_b, plan)
+        del frames_a, frames_b
+
         def make_frame(t):
-            p = t / duration
-            fa = a.get_frame(a_start + t)
-            fb = b.get_frame(b_start + t)
-            if p <= split:
-                pa = SmoothTransitions.ease_in(p / split)
-                scale_a = 1.0 + 1.0 * pa
-                return SmoothTransitions.resize_and_center(fa, scale_a, (target_w, target_h))
-            else:
-                pb = SmoothTransitions.ease_out((p - split) / (1.0 - split))
-                scale_b = pb
-                return SmoothTransitions.resize_and_center(fb, scale_b, (target_w, target_h))
-        clip = VideoClip(make_frame, duration=duration)
+            return frames[min(max(int(t * fps + 1e-6), 0), frame_count - 1)]
+        return VideoClip(make_frame, duration=duration)
+
+    @staticmethod
+    def zoom_in(a, b, duration=duration):
+        clip = SmoothTransitions.render_batch(a, b, "zoom_in", duration)
         return attach_audio_to_transition(clip, audio_paths["zoom"])
 
     @staticmethod
     def zoom_out(a, b, duration=duration):
-        a_start, b_start = max(0, a.duration - duration), 0.0
-        def make_frame(t):
-            p = t / duration
-            fa = a.get_frame(a_start + t)
-            fb = b.get_frame(b_start + t)
-            if p <= split:
-                pa = SmoothTransitions.ease_in(p / split)
-                scale_a = 1.0 - 0.5 * pa
-                return SmoothTransitions.resize_and_center(fa, scale_a, (target_w, target_h))
-            else:
-                pb = SmoothTransitions.ease_out((p - split) / (1.0 - split))
-                scale_b = 3.0 - 2.0 * pb
-                return SmoothTransitions.resize_and_center(fb, scale_b, (target_w, target_h))
-        clip = VideoClip(make_frame, duration=duration)
+        clip = SmoothTransitions.render_batch(a, b, "zoom_out", duration)
         return attach_audio_to_transition(clip, audio_paths["zoom"])
 
     @staticmethod
     def pan(a, b, direction='right', duration=duration):
-        a_start = max(0, a.duration - duration)
-        def make_frame(t):
-            p = t / duration
-            fa = a.get_frame(a_start + t)
-            fb = b.get_frame(t)
-            fa = cv2.resize(fa, (target_w, target_h))
-            fb = cv2.resize(fb, (target_w, target_h))
-
-            if direction in ['left', 'right']:
-                max_offset = target_w
-            else:
-                max_offset = target_h
-
-            # 중앙 겹침을 보장하는 동기화 offset
-            smooth_p = (1 - np.cos(p * np.pi)) / 2
-            offset = int(max_offset * smooth_p)
-            offset_a = offset
-            offset_b = max_offset - offset
-
-            # 방향별 이동 matrix
-            if direction == 'left':
-                Ma = np.float32([[1, 0, -offset_a], [0, 1, 0]])
-                Mb = np.float32([[1, 0, offset_b], [0, 1, 0]])
-            elif direction == 'right':
-                Ma = np.float32([[1, 0, offset_a], [0, 1, 0]])
-                Mb = np.float32([[1, 0, -offset_b], [0, 1, 0]])
-            elif direction == 'up':
-                Ma = np.float32([[1, 0, 0], [0, 1, -offset_a]])
-                Mb = np.float32([[1, 0, 0], [0, 1, offset_b]])
-            else:  # down
-                Ma = np.float32([[1, 0, 0], [0, 1, offset_a]])
-                Mb = np.float32([[1, 0, 0], [0, 1, -offset_b]])
-
-            wa = cv2.warpAffine(fa, Ma, (target_w, target_h))
-            wb = cv2.warpAffine(fb, Mb, (target_w, target_h))
-
-            return cv2.addWeighted(wa, 1 - smooth_p, wb, smooth_p, 0)
-        clip = VideoClip(make_frame, duration=duration)
+        clip = SmoothTransitions.render_batch(a, b, f"pan_{direction}", duration)
         return attach_audio_to_transition(clip, audio_paths["pan"])
 
     @staticmethod
     def rotate(a, b, clockwise=True, duration=duration):
-        a_start, b_start = max(0, a.duration - duration), 0.0
-        center = (target_w // 2, target_h // 2)
-        def make_frame(t):
-            p = t / duration
-            fa = a.get_frame(a_start + t)
-            fb = b.get_frame(b_start + t)
-            fa = cv2.resize(fa, (target_w, target_h))
-            fb = cv2.resize(fb, (target_w, target_h))
-            if p <= split:
-                angle = 100 * SmoothTransitions.ease_in(p / split)
-                M = cv2.getRotationMatrix2D(center, angle if clockwise else -angle, 1.0)
-                return cv2.warpAffine(fa, M, (target_w, target_h))
-            else:
-                pb = SmoothTransitions.ease_out((p - split) / (1.0 - split))
-                angle = 100 + 260 * pb
-                M = cv2.getRotationMatrix2D(center, angle if clockwise else -angle, 1.0)
-                return cv2.warpAffine(fb, M, (target_w, target_h))
-        clip = VideoClip(make_frame, duration=duration)
+        transition_type = "rotate_clockwise" if clockwise else "rotate_counter_clockwise"
+        clip = SmoothTransitions.render_batch(a, b, transition_type, duration)
         return attach_audio_to_transition(clip, audio_paths["rotate"])
 
     @staticmethod
     def fade(a, b, duration=duration):
-        a_start, b_start = max(0, a.duration - duration), 0.0
-        def make_frame(t):
-            p = (1 - np.cos(t / duration * np.pi)) / 2
-            fa = a.get_frame(a_start + t)
-            fb = b.get_frame(b_start + t)
-            fa = cv2.resize(fa, (target_w, target_h))
-            fb = cv2.resize(fb, (target_w, target_h))
-            return cv2.addWeighted(fa, 1 - p, fb, p, 0)
-        return VideoClip(make_frame, duration=duration)
+        return SmoothTransitions.render_batch(a, b, "fade", duration)
 
 
 class VideoTransitions:
@@ -0,0 +1,173 @@
+"""
+TTS 오디오 디스크 캐시
+텍스트, 음성, 음성 설정이 같으면 ElevenLabs를 다시 호출하지 않고 저장된 MP3를 재사용
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TTSAudioCache:
+    """내용 주소 기반(content-addressed) TTS 오디오 캐시 - 용량 초과시 LRU 방식으로 정리"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리
+            max_bytes: 캐시 최대 용량 (바이트)
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        text: str,
+        voice_id: str,
+        model_id: str,
+        stability: float,
+        similarity_boost: float,
+        style: float,
+        use_speaker_boost: bool
+    ) -> str:
+        """음성 합성 입력값 전체로 캐시 키(sha256) 생성"""
+        key_source = json.dumps({
+            "text": text,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "stability": float(stability),
+            "similarity_boost": float(similarity_boost),
+            "style": float(style),
+            "use_speaker_boost": bool(use_speaker_boost)
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _audio_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        캐시 항목 조회 (적중시 최근 사용 시각 갱신)
+
+        Returns:
+            Optional[Dict]: {"audio_path", "duration", "file_size", ...} 또는 None
+        """
+        audio_path = self._audio_path(key)
+        meta_path = self._meta_path(key)
+        if not (os.path.exists(audio_path) and os.path.exists(meta_path)):
+            return None
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            now = time.time()
+            os.utime(audio_path, (now, now))  # LRU 순서 갱신
+        except (OSError, ValueError):
+            return None
+
+        meta["audio_path"] = audio_path
+        meta["file_size"] = os.path.getsize(audio_path)
+        return meta
+
+    def materialize(self, key: str, dest_path: str) -> Optional[Dict]:
+        """
+        캐시된 MP3를 출력 경로로 복사 (호출자가 출력 파일을 지워도 캐시는 유지)
+
+        Returns:
+            Optional[Dict]: 캐시 메타데이터 (미적중시 None)
+        """
+        entry = self.get(key)
+        if not entry:
+            return None
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+            shutil.copyfile(entry["audio_path"], dest_path)
+        except OSError as e:
+            print(f"⚠️ TTS 캐시 복사 실패: {e}")
+            return None
+        return entry
+
+    def put(self, key: str, audio_file_path: str, duration: Optional[float], **metadata) -> bool:
+        """
+        생성된 MP3와 측정된 길이를 캐시에 저장
+
+        Args:
+            key: make_key로 만든 캐시 키
+            audio_file_path: 저장할 MP3 파일 경로
+            duration: 측정된 오디오 길이 (초)
+            **metadata: 함께 저장할 정보 (text, voice_id 등)
+        """
+        try:
+            audio_path = self._audio_path(key)
+            temp_path = f"{audio_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(audio_file_path, temp_path)
+            os.replace(temp_path, audio_path)  # 동시 저장시에도 온전한 파일만 노출
+
+            meta = dict(metadata, duration=duration, created_at=time.time())
+            meta_temp_path = f"{self._meta_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(meta_temp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(meta_temp_path, self._meta_path(key))
+        except OSError as e:
+            print(f"⚠️ TTS 캐시 저장 실패: {e}")
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """최대 용량을 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            for filename in os.listdir(self.cache_dir):
+                if not filename.endswith(".mp3"):
+                    continue
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, filename[:-4]))
+                total_size += stat.st_size
+
+            if total_size <= self.max_bytes:
+                return
+
+            removed = 0
+            for _, size, key in sorted(entries):  # 최근 사용 시각이 오래된 순
+                if total_size <= self.max_bytes:
+                    break
+                for path in (self._audio_path(key), self._meta_path(key)):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total_size -= size
+                removed += 1
+
+            print(f"🧹 TTS 캐시 정리: {removed}개 항목 삭제 (현재 {total_size / (1024 * 1024):.1f} MB)")
+
+
+_tts_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_cache() -> Optional[TTSAudioCache]:
+    """설정에 따라 공용 TTS 캐시 인스턴스 반환 (비활성화시 None)"""
+    global _tts_cache
+    from tts_utils import TTSConfig
+
+    if not TTSConfig.CACHE_ENABLED:
+        return None
+    if _tts_cache is None:
+        _tts_cache = TTSAudioCache(TTSConfig.CACHE_DIR, TTSConfig.CACHE_MAX_MB * 1024 * 1024)
+    return _tts_cache
@@ -2,11 +2,16 @@
 ElevenLabs TTS를 이용한 음성 생성 유틸리티
 """
 import asyncio  # 비동기 처리를 위한 모듈
+import base64  # 타임스탬프 응답의 오디오 디코딩용
+import json  # 문자 타임스탬프 저장용
 import os  # 환경변수 읽기용
 import tempfile  # 임시 파일 생성용
-from typing import List, Optional, Dict, Any  # 타입 힌트용
+import time  # 파일명 타임스탬프 생성용
+from typing import List, Optional, Dict, Any, Callable, Awaitable  # 타입 힌트용
 import httpx  # HTTP 클라이언트 라이브러리
 from pathlib import Path  # 파일 경로 처리용
+from tts_cache import get_tts_cache  # TTS 오디오 디스크 캐시
+from media_probe import get_media_duration  # ffprobe 결과 캐시
 
 class TTSConfig:
     """TTS 관련 설정값들"""
@@ -17,6 +22,19 @@ class TTSConfig:
     DEFAULT_STYLE = 0.0  # 음성 스타일 (0.0-1.0)
     DEFAULT_USE_SPEAKER_BOOST = True  # 화자 부스트 사용 여부
     
+    # 동시 생성 설정 (ElevenLabs 요금제별 동시 요청 한도: Free 2, Starter 3, Creator 5, Pro 10)
+    MAX_CONCURRENCY = int(os.getenv("ELEVENLABS_MAX_CONCURRENCY", "3"))  # 동시에 보낼 최대 요청 수
+    MAX_RETRIES = 2  # 항목별 재시도 횟수 (429, 5xx, 네트워크 오류)
+    RETRY_BACKOFF = 1.5  # 재시도 대기 시간 기준 (초, 시도마다 2배)
+    
+    # 디스크 캐시 설정 (같은 텍스트 + 음성 + 설정이면 저장된 MP3 재사용)
+    CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() != "false"  # 캐시 사용 여부
+    CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join("cache", "tts"))  # 캐시 디렉토리
+    CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "200"))  # 최대 캐시 용량 (MB)
+    
+    # 문자 단위 타임스탬프 설정 (with-timestamps 엔드포인트)
+    WITH_TIMESTAMPS = os.getenv("ELEVENLABS_WITH_TIMESTAMPS", "false").lower() == "true"  # 기본 요청 여부
+    
     # 지원되는 음성 목록 (음성 ID와 이름, 언어 포함)
     VOICES = {
         # 영어 음성들
@@ -56,7 +74,10 @@ class TTSResult:
         voice_id: Optional[str] = None,
         duration: Optional[float] = None,
         file_size: Optional[int] = None,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        alignment_file_path: Optional[str] = None,
+        status_code: Optional[int] = None,
+        exception_type: Optional[type] = None
     ):
         self.success = success  # 생성 성공 여부
         self.audio_file_path = audio_file_path  # 생성된 오디오 파일 경로
@@ -65,6 +86,9 @@ class TTSResult:
         self.duration = duration  # 오디오 길이 (초)
         self.file_size = file_size  # 파일 크기 (바이트)
         self.error = error  # 에러 메시지 (실패시)
+        self.alignment_file_path = alignment_file_path  # 문자 단위 타임스탬프 JSON 경로 (요청시)
+        self.status_code = status_code  # 실패한 API 응답의 HTTP 상태 코드 (재시도 판단용)
+        self.exception_type = exception_type  # 실패 원인 예외 타입 (재시도 판단용)
 
 async def get_available_voices(api_key: str) -> Dict[str, Any]:
     """
@@ -100,6 +124,60 @@ async def get_available_voices(api_key: str) -> Dict[str, Any]:
             print(f"❌ 음성 목록 조회 실패: {e}")
             raise
 
+def resolve_tts_output_dir(output_dir: Optional[str] = None) -> Path:
+    """TTS 출력 디렉토리 결정 및 생성 (None이면 static/audio)"""
+    if output_dir:
+        output_path = Path(output_dir).resolve()  # 절대 경로로 변환
+    else:
+        output_path = Path.cwd() / "static" / "audio"  # 기본값을 static/audio로 설정 (절대 경로)
+    output_path.mkdir(parents=True, exist_ok=True)
+    return output_path
+
+def measure_audio_duration(audio_file_path: str) -> Optional[float]:
+    """오디오 파일 길이 측정 (캐시된 ffprobe 결과 사용, 실패시 None)"""
+    duration = get_media_duration(audio_file_path)
+    if duration is None:
+        print(f"⚠️ 오디오 길이 확인 실패: {os.path.basename(audio_file_path)}")
+    return duration
+
+def get_alignment_file_path(audio_file_path: str) -> str:
+    """MP3 옆에 저장되는 문자 타임스탬프 JSON 경로 (tts_123.mp3 → tts_123.alignment.json)"""
+    return f"{os.path.splitext(audio_file_path)[0]}.alignment.json"
+
+def save_tts_alignment(audio_file_path: str, alignment: Dict[str, Any]) -> str:
+    """
+    ElevenLabs 문자 타임스탬프를 MP3 옆에 JSON으로 저장
+    
+    Args:
+        audio_file_path: 대응하는 MP3 파일 경로
+        alignment: characters, character_start_times_seconds, character_end_times_seconds를 담은 딕셔너리
+        
+    Returns:
+        str: 저장된 JSON 파일 경로
+    """
+    alignment_file_path = get_alignment_file_path(audio_file_path)
+    with open(alignment_file_path, "w", encoding="utf-8") as f:
+        json.dump(alignment, f, ensure_ascii=False)
+    return alignment_file_path
+
+def load_tts_alignment(audio_file_path: str) -> Optional[Dict[str, Any]]:
+    """MP3 옆에 저장된 문자 타임스탬프 읽기 (없거나 형식이 맞지 않으면 None)"""
+    alignment_file_path = get_alignment_file_path(audio_file_path)
+    if not os.path.exists(alignment_file_path):
+        return None
+    try:
+        with open(alignment_file_path, "r", encoding="utf-8") as f:
+            alignment = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    characters = alignment.get("characters") or []
+    starts = alignment.get("character_start_times_seconds") or []
+    ends = alignment.get("character_end_times_seconds") or []
+    if not characters or not (len(characters) == len(starts) == len(ends)):
+        return None
+    return alignment
+
 async def create_tts_audio(
     text: str,  # 변환할 텍스트
     voice_id: str = TTSConfig.DEFAULT_VOICE_ID,  # 사용할 음성 ID
@@ -109,7 +187,10 @@ async def create_tts_audio(
     style: float = TTSConfig.DEFAULT_STYLE,  # 음성 스타일
     use_speaker_boost: bool = TTSConfig.DEFAULT_USE_SPEAKER_BOOST,  # 화자 부스트
     api_key: str = None,  # ElevenLabs API 키
-    output_dir: str = None  # 출력 디렉토리 (None이면 임시 디렉토리 사용)
+    output_dir: str = None,  # 출력 디렉토리 (None이면 임시 디렉토리 사용)
+    client: Optional[httpx.AsyncClient] = None,  # 공유 HTTP 클라이언트 (None이면 새로 생성)
+    use_cache: bool = True,  # 디스크 캐시 사용 여부
+    with_timestamps: Optional[bool] = None  # 문자 단위 타임스탬프 요청 여부 (None이면 TTSConfig.WITH_TIMESTAMPS)
 ) -> TTSResult:
     """
     ElevenLabs API를 사용하여 텍스트를 음성으로 변환
@@ -124,10 +205,17 @@ async def create_tts_audio(
         use_speaker_boost: 화자 부스트 사용 여부
         api_key: ElevenLabs API 키
         output_dir: 출력 디렉토리
+        client: 공유 HTTP 클라이언트 (동시 생성시 연결 재사용)
+        use_cache: 같은 입력으로 만든 음성이 캐시에 있으면 API 호출 없이 재사용
+        with_timestamps: with-timestamps 엔드포인트로 오디오와 문자별 시작/끝 시간을 함께 받아
+            MP3 옆에 .alignment.json으로 저장 (자막 생성시 Whisper 없이 바로 사용)
         
     Returns:
         TTSResult: TTS 생성 결과
     """
+    if with_timestamps is None:
+        with_timestamps = TTSConfig.WITH_TIMESTAMPS
+    
     if not api_key:  # API 키가 없으면 에러 발생
         return TTSResult(success=False, error="ElevenLabs API 키가 필요합니다.")
     
@@ -138,6 +226,33 @@ async def create_tts_audio(
     if len(text) > 5000:
         return TTSResult(success=False, error="텍스트가 너무 깁니다. (최대 5000자)")
     
+    # 캐시 확인 (텍스트, 음성, 모델, 음성 설정이 모두 같으면 재사용)
+    cache = get_tts_cache() if use_cache else None
+    cache_key = None
+    if cache:
+        cache_key = cache.make_key(text, voice_id, model_id, stability, similarity_boost, style, use_speaker_boost)
+        audio_file_path = resolve_tts_output_dir(output_dir) / f"tts_{_next_audio_timestamp()}.mp3"
+        cached = cache.get(cache_key)
+        # 타임스탬프가 필요한데 캐시 항목에 없으면 다시 생성
+        if cached and not (with_timestamps and not cached.get("alignment")):
+            cached = cache.materialize(cache_key, str(audio_file_path))
+        else:
+            cached = None
+        if cached:
+            print(f"♻️ TTS 캐시 적중: {text[:50]}{'...' if len(text) > 50 else ''} → {audio_file_path.name}")
+            alignment_file_path = None
+            if with_timestamps:
+                alignment_file_path = save_tts_alignment(str(audio_file_path), cached["alignment"])
+            return TTSResult(
+                success=True,
+                audio_file_path=str(audio_file_path),
+                text=text,
+                voice_id=voice_id,
+                duration=cached.get("duration"),
+                file_size=cached.get("file_size"),
+                alignment_file_path=alignment_file_path
+            )
+    
     print(f"🎙️ TTS 생성 시작...")
     print(f"   텍스트: {text[:100]}{'...' if len(text) > 100 else ''}")  # 첫 100자만 출력
     print(f"   음성: {TTSConfig.VOICES.get(voice_id, voice_id)}")
@@ -145,7 +260,7 @@ async def create_tts_audio(
     
     # HTTP 헤더 설정
     headers = {
-        "Accept": "audio/mpeg",  # MP3 형식으로 요청
+        "Accept": "application/json" if with_timestamps else "audio/mpeg",  # 타임스탬프 모드는 JSON 응답
         "Content-Type": "application/json",
         "xi-api-key": api_key
     }
@@ -163,10 +278,17 @@ async def create_tts_audio(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:  # 60초 타임아웃
-            # TTS 생성 API 호출
+        owns_client = client is None  # 공유 클라이언트가 없으면 직접 생성 후 정리
+        if owns_client:
+            client = httpx.AsyncClient(timeout=60.0)  # 60초 타임아웃
+        
+        try:
+            # TTS 생성 API 호출 (타임스탬프 모드는 오디오와 문자 정렬 정보를 한 번에 받음)
+            endpoint = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+            if with_timestamps:
+                endpoint += "/with-timestamps"
             response = await client.post(
-                f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
+                endpoint,
                 headers=headers,
                 json=payload
             )
@@ -174,43 +296,51 @@ async def create_tts_audio(
             if response.status_code != 200:
                 error_msg = f"TTS 생성 실패: {response.status_code} - {response.text}"
                 print(f"❌ {error_msg}")
-                return TTSResult(success=False, error=error_msg)
+                return TTSResult(success=False, error=error_msg, status_code=response.status_code)
             
             # 출력 디렉토리 설정
-            if output_dir:
-                output_path = Path(output_dir).resolve()  # 절대 경로로 변환
-                output_path.mkdir(parents=True, exist_ok=True)
-                print(f"🗂️ TTS 출력 디렉토리: {output_path} (파라미터 제공됨)")
-            else:
-                # 기본값을 static/audio로 설정 (절대 경로)
-                current_dir = Path.cwd()
-                output_path = current_dir / "static" / "audio"
-                output_path.mkdir(parents=True, exist_ok=True)
-                print(f"🗂️ TTS 출력 디렉토리: {output_path} (기본값 사용)")
+            output_path = resolve_tts_output_dir(output_dir)
+            print(f"🗂️ TTS 출력 디렉토리: {output_path}")
             
-            # 고유한 파일명 생성 (타임스탬프 기반)
-            import time
-            timestamp = int(time.time() * 1000)
+            # 고유한 파일명 생성 (타임스탬프 기반, 동시 생성시에도 겹치지 않음)
+            timestamp = _next_audio_timestamp()
             audio_filename = f"tts_{timestamp}.mp3"
             audio_file_path = output_path / audio_filename
             
             print(f"💾 TTS 파일 저장 경로: {audio_file_path}")
             
+            # 오디오 데이터 추출 (타임스탬프 모드는 base64 오디오 + alignment JSON)
+            alignment = None
+            alignment_file_path = None
+            if with_timestamps:
+                response_data = response.json()
+                audio_bytes = base64.b64decode(response_data["audio_base64"])
+                alignment = response_data.get("alignment") or response_data.get("normalized_alignment")
+            else:
+                audio_bytes = response.content
+            
             # 오디오 데이터를 파일로 저장
             with open(audio_file_path, "wb") as audio_file:
-                audio_file.write(response.content)
+                audio_file.write(audio_bytes)
+            
+            if alignment:
+                alignment_file_path = save_tts_alignment(str(audio_file_path), alignment)
+                print(f"⏱️ 문자 타임스탬프 저장: {os.path.basename(alignment_file_path)} ({len(alignment.get('characters', []))}자)")
             
             # 파일 크기 확인
             file_size = audio_file_path.stat().st_size
             
-            # 오디오 길이 확인 (moviepy 사용)
-            try:
-                from moviepy.editor import AudioFileClip
-                with AudioFileClip(str(audio_file_path)) as audio_clip:
-                    duration = audio_clip.duration
-            except Exception as e:
-                print(f"⚠️ 오디오 길이 확인 실패: {e}")
-                duration = None
+            # 오디오 길이 확인
+            duration = measure_audio_duration(str(audio_file_path))
+            if duration is None and alignment and alignment.get("character_end_times_seconds"):
+                duration = float(alignment["character_end_times_seconds"][-1])  # 측정 실패시 마지막 문자 끝 시간 사용
+            
+            # 측정된 길이와 함께 캐시에 저장
+            if cache and cache_key:
+                cache_metadata = {"text": text, "voice_id": voice_id, "model_id": model_id}
+                if alignment:
+                    cache_metadata["alignment"] = alignment
+                cache.put(cache_key, str(audio_file_path), duration, **cache_metadata)
             
             print(f"✅ TTS 생성 완료!")
             print(f"   파일: {audio_file_path}")
@@ -224,23 +354,103 @@ async def create_tts_audio(
                 text=text,
                 voice_id=voice_id,
                 duration=duration,
-                file_size=file_size
+                file_size=file_size,
+                alignment_file_path=alignment_file_path
             )
             
+        finally:
+            if owns_client:
+                await client.aclose()
+
     except Exception as e:
         error_msg = f"TTS 생성 중 오류 발생: {e}"
         print(f"❌ {error_msg}")
-        return TTSResult(success=False, error=error_msg)
+        return TTSResult(success=False, error=error_msg, exception_type=type(e))
+
+_last_audio_timestamp = 0  # 마지막으로 발급한 파일명 타임스탬프 (밀리초)
+
+def _next_audio_timestamp() -> int:
+    """tts_{timestamp}.mp3 파일명용 고유 밀리초 타임스탬프 (동시 생성시 중복 방지)"""
+    global _last_audio_timestamp
+    _last_audio_timestamp = max(int(time.time() * 1000), _last_audio_timestamp + 1)
+    return _last_audio_timestamp
+
+def _is_retryable_tts_result(result: Any) -> bool:
+    """
+    요청 한도 초과(429), 서버 오류(5xx), 네트워크 오류만 재시도 대상으로 판단
+    에러 메시지가 아니라 결과에 담긴 HTTP 상태 코드와 예외 타입으로 판단 (입력값 오류는 둘 다 없으므로 재시도하지 않음)
+    """
+    status_code = getattr(result, "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    exception_type = getattr(result, "exception_type", None)
+    return exception_type is not None and issubclass(exception_type, (httpx.TransportError, asyncio.TimeoutError))
+
+async def run_tts_jobs(
+    items: List[Any],  # TTS로 변환할 항목 리스트 (텍스트, 스크립트 등)
+    synthesize: Callable[[httpx.AsyncClient, int, Any], Awaitable[Any]],  # (client, index, item) -> 결과
+    max_concurrency: Optional[int] = None,  # 동시 요청 수 (None이면 TTSConfig.MAX_CONCURRENCY)
+    max_retries: Optional[int] = None,  # 항목별 재시도 횟수 (None이면 TTSConfig.MAX_RETRIES)
+    error_result: Callable[[str], Any] = None  # 예외 발생시 실패 결과를 만드는 함수
+) -> List[Any]:
+    """
+    공유 HTTP 클라이언트로 여러 TTS 작업을 동시에 실행하는 공용 엔진
+    
+    Args:
+        items: 변환할 항목 리스트
+        synthesize: 항목 하나를 변환하는 코루틴 함수 (결과는 success, error 속성 필요)
+        max_concurrency: 동시에 보낼 최대 요청 수
+        max_retries: 429/5xx/네트워크 오류시 항목별 재시도 횟수
+        error_result: 예외 메시지로 실패 결과 객체를 만드는 함수
+        
+    Returns:
+        List: 입력 순서와 동일한 순서의 결과 리스트
+    """
+    if not items:
+        return []
+    
+    max_concurrency = max(1, max_concurrency or TTSConfig.MAX_CONCURRENCY)
+    max_retries = TTSConfig.MAX_RETRIES if max_retries is None else max_retries
+    error_result = error_result or (lambda message: TTSResult(success=False, error=message))
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    print(f"🎙️ TTS 동시 생성: {len(items)}개 항목 (최대 동시 요청: {max_concurrency}개, 재시도: {max_retries}회)")
+    
+    async def run_item(client: httpx.AsyncClient, index: int, item: Any):
+        result = None
+        for attempt in range(max_retries + 1):
+            async with semaphore:  # 재시도 대기 중에는 슬롯을 반납
+                try:
+                    result = await synthesize(client, index, item)
+                except Exception as e:
+                    result = error_result(f"TTS 생성 중 오류 발생: {e}")
+                    result.exception_type = type(e)
+            
+            if result.success or attempt >= max_retries or not _is_retryable_tts_result(result):
+                return result
+            
+            wait_seconds = TTSConfig.RETRY_BACKOFF * (2 ** attempt)
+            print(f"🔄 TTS {index + 1} 재시도 대기 {wait_seconds:.1f}초 ({attempt + 1}/{max_retries}): {result.error}")
+            await asyncio.sleep(wait_seconds)
+        return result
+    
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+        results = await asyncio.gather(*[run_item(client, i, item) for i, item in enumerate(items)])
+    
+    return list(results)
 
 async def create_multiple_tts_audio(
     text_list: List[str],  # 변환할 텍스트 리스트
     voice_id: str = TTSConfig.DEFAULT_VOICE_ID,  # 사용할 음성 ID
     model_id: str = TTSConfig.DEFAULT_MODEL_ID,  # 사용할 모델 ID
     api_key: str = None,  # ElevenLabs API 키
-    output_dir: str = None  # 출력 디렉토리
+    output_dir: str = None,  # 출력 디렉토리
+    max_concurrency: Optional[int] = None,  # 동시 요청 수 (None이면 TTSConfig.MAX_CONCURRENCY)
+    with_timestamps: Optional[bool] = None  # 문자 단위 타임스탬프 요청 여부
 ) -> List[TTSResult]:
     """
-    여러 텍스트를 순차적으로 음성으로 변환
+    여러 텍스트를 동시에 음성으로 변환 (입력 순서대로 결과 반환)
     
     Args:
         text_list: 변환할 텍스트 리스트
@@ -248,6 +458,8 @@ async def create_multiple_tts_audio(
         model_id: 사용할 모델 ID  
         api_key: ElevenLabs API 키
         output_dir: 출력 디렉토리
+        max_concurrency: 동시에 보낼 최대 요청 수
+        with_timestamps: 오디오와 함께 문자별 타임스탬프를 받아 저장할지 여부
         
     Returns:
         List[TTSResult]: 각 TTS 생성 결과 리스트
@@ -257,30 +469,27 @@ async def create_multiple_tts_audio(
     
     print(f"🎙️ 총 {len(text_list)}개 텍스트를 음성으로 변환 시작...")
     
-    results = []
-    successful_count = 0
-    failed_count = 0
-    
-    for i, text in enumerate(text_list):
-        scene_num = i + 1
-        print(f"\n⏳ 음성 {scene_num}/{len(text_list)} 생성 중...")
-        
-        result = await create_tts_audio(
+    async def synthesize(client: httpx.AsyncClient, index: int, text: str) -> TTSResult:
+        return await create_tts_audio(
             text=text,
             voice_id=voice_id,
             model_id=model_id,
             api_key=api_key,
-            output_dir=output_dir
+            output_dir=output_dir,
+            client=client,
+            with_timestamps=with_timestamps
         )
-        
-        results.append(result)
-        
+    
+    results = await run_tts_jobs(text_list, synthesize, max_concurrency=max_concurrency)
+    
+    successful_count = 0
+    failed_count = 0
+    for i, result in enumerate(results):
         if result.success:
             successful_count += 1
-            print(f"✅ 음성 {scene_num} 생성 완료!")
         else:
             failed_count += 1
-            print(f"❌ 음성 {scene_num} 생성 실패: {result.error}")
+            print(f"❌ 음성 {i + 1} 생성 실패: {result.error}")
     
     print(f"\n🎉 음성 생성 완료!")
     print(f"   성공: {successful_count}/{len(text_list)}")
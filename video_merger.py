@@ -10,6 +10,10 @@ import httpx
 
 # transitions 모듈 import
 from transitions import VideoTransitions
+from transition_renderer import render_sequence_parallel
+from clip_normalizer import normalize_clips
+from ffmpeg_executor import run_ffmpeg
+from media_probe import get_media_duration
 from video_models import VideoConfig
 from bgm_utils import BGMManager
 from tts_utils import create_tts_audio, create_multiple_tts_audio, get_elevenlabs_api_key, TTSResult
@@ -78,15 +82,38 @@ class VideoTransitionMerger:
         print(f"🎬 {len(transitions)}개 트랜지션으로 쇼케이스 영상 생성: {output_filename}")
         
         try:
-            # 영상들을 다운로드하고 클립으로 변환
-            video_clips = []
+            # 영상들을 다운로드
+            temp_paths = []
             for i, video_url in enumerate(sample_videos):
                 print(f"📥 영상 {i+1} 다운로드 중: {video_url[:50]}...")
-                temp_path = self._download_video(video_url, f"temp_video_{i}.mp4")
-                clip = VideoFileClip(temp_path)
+                temp_paths.append(self._download_video(video_url, f"temp_video_{i}.mp4"))
+            
+            # 표준 해상도/fps로 한 번만 변환 (캐시 사용)
+            clip_paths = normalize_clips(temp_paths)
+            
+            # 경계별 트랜지션을 프로세스마다 따로 렌더링 (실패하면 아래 MoviePy 경로로 처리)
+            output_path = os.path.join(self.temp_dir, output_filename)
+            durations = [get_media_duration(path) for path in clip_paths]
+            if all(durations):
+                sequence = [i % len(clip_paths) for i in range(len(transitions) + 1)]
+                if self._render_parallel(
+                    [clip_paths[i] for i in sequence],
+                    [transition_type for transition_type, _ in transitions],
+                    output_path,
+                    clip_lengths=[min(5, durations[i]) for i in sequence]  # 데모용 5초 제한
+                ):
+                    self._cleanup_temp_files(self._collect_temp_files("temp_video_"))
+                    print(f"✅ 쇼케이스 영상 생성 완료: {output_path}")
+                    return output_path
+            
+            # 클립으로 변환
+            video_clips = []
+            for clip_path in clip_paths:
+                clip = VideoFileClip(clip_path)
                 
-                # 표준 해상도로 리사이즈
-                clip = clip.resize(newsize=(VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT))
+                # 정규화에 실패한 클립만 표준 해상도로 리사이즈
+                if tuple(clip.size) != (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT):
+                    clip = clip.resize(newsize=(VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT))
                 # 영상 길이를 5초로 제한 (데모용)
                 clip = clip.subclip(0, min(5, clip.duration))
                 video_clips.append(clip)
@@ -139,9 +166,6 @@ class VideoTransitionMerger:
                     volume_adjustment=VideoConfig.BGM_VOLUME
                 )
             
-            # 출력 파일 경로
-            output_path = os.path.join(self.temp_dir, output_filename)
-            
             print(f"💾 최종 영상 저장 중: {output_path}")
             # 영상 저장
             final_video.write_videofile(
@@ -249,10 +273,29 @@ class VideoTransitionMerger:
                 print(f"📥 영상 {i+1} 다운로드 중...")
                 temp_path = self._download_video(video_url, f"temp_video_{i}.mp4")
                 temp_files.append(temp_path)  # 임시 파일 목록에 추가
-                
-                clip = VideoFileClip(temp_path)
-                # 표준 해상도로 리사이즈
-                clip = clip.resize(newsize=(VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT))
+            
+            # 가능한 트랜지션 타입들 중 경계마다 랜덤 선택
+            available_transitions = [
+                'zoom_in', 'zoom_out', 'pan_right', 'pan_left', 
+                'pan_up', 'pan_down', 'rotate_clockwise', 'rotate_counter_clockwise', 'fade'
+            ]
+            transition_types = [random.choice(available_transitions) for _ in range(len(temp_files) - 1)]
+            output_path = os.path.join(self.temp_dir, output_filename)
+            
+            # 표준 해상도/fps로 한 번만 변환 (캐시 사용)
+            clip_paths = normalize_clips(temp_files)
+            
+            # 경계별 트랜지션을 프로세스마다 따로 렌더링 (실패하면 아래 MoviePy 경로로 처리)
+            if len(clip_paths) >= 2 and self._render_parallel(clip_paths, transition_types, output_path):
+                self._cleanup_temp_files(temp_files)
+                print(f"✅ 트랜지션 영상 합치기 완료: {output_path}")
+                return output_path
+            
+            for clip_path in clip_paths:
+                clip = VideoFileClip(clip_path)
+                # 정규화에 실패한 클립만 표준 해상도로 리사이즈
+                if tuple(clip.size) != (VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT):
+                    clip = clip.resize(newsize=(VideoConfig.RESOLUTION_WIDTH, VideoConfig.RESOLUTION_HEIGHT))
                 video_clips.append(clip)
             
             print(f"✅ {len(video_clips)}개 영상 준비 완료")
@@ -265,12 +308,6 @@ class VideoTransitionMerger:
                 # 랜덤 트랜지션으로 영상들 사이에 전환 효과 생성
                 final_clips = []
                 
-                # 가능한 트랜지션 타입들
-                available_transitions = [
-                    'zoom_in', 'zoom_out', 'pan_right', 'pan_left', 
-                    'pan_up', 'pan_down', 'rotate_clockwise', 'rotate_counter_clockwise', 'fade'
-                ]
-                
                 for i in range(len(video_clips)):
                     # 현재 영상의 메인 부분 추가
                     if i == 0:
@@ -280,8 +317,7 @@ class VideoTransitionMerger:
                     
                     # 다음 영상이 있으면 트랜지션 생성
                     if i < len(video_clips) - 1:
-                        # 랜덤 트랜지션 선택
-                        transition_type = random.choice(available_transitions)
+                        transition_type = transition_types[i]
                         print(f"🎨 트랜지션 {i+1}: {transition_type}")
                         
                         # 트랜지션 적용
@@ -320,9 +356,6 @@ class VideoTransitionMerger:
                     volume_adjustment=VideoConfig.BGM_VOLUME
                 )
             
-            # 출력 파일 경로
-            output_path = os.path.join(self.temp_dir, output_filename)
-            
             print(f"💾 최종 영상 저장 중: {output_path}")
             # 영상 저장
             final_video.write_videofile(
@@ -359,6 +392,73 @@ class VideoTransitionMerger:
         """Frame-level animation 랜덤 트랜지션으로 합치기 (alias 메서드)"""
         return self.merge_videos_with_transitions(video_urls, output_filename)
     
+    def _render_parallel(self, paths: List[str], transition_types: List[str], output_path: str, clip_lengths: List[float] = None) -> bool:
+        """
+        경계별 트랜지션을 별도 프로세스에서 렌더링하고 스트림 복사로 합친 뒤 BGM 추가
+        
+        Args:
+            paths: 재생 순서대로의 클립 경로
+            transition_types: 경계별 트랜지션 종류
+            output_path: 출력 파일 경로
+            clip_lengths: 클립별로 사용할 길이 (None이면 클립 전체)
+            
+        Returns:
+            bool: 성공 여부 (False면 MoviePy 경로로 처리)
+        """
+        bgm_file = self._select_bgm_file() if self.enable_bgm and self.bgm_manager else None
+        render_path = os.path.join(self.temp_dir, f"parallel_{os.path.basename(output_path)}") if bgm_file else output_path
+        try:
+            if not render_sequence_parallel(paths, transition_types, render_path, self.transition_duration, clip_lengths):
+                return False
+            if bgm_file:
+                print(f"🎵 BGM 추가 중 (영상 스트림 복사): {os.path.basename(bgm_file)}")
+                return self._mix_bgm_stream_copy(render_path, bgm_file, output_path)
+            return True
+        except Exception as e:
+            print(f"⚠️ 병렬 트랜지션 렌더링 실패, MoviePy로 다시 시도합니다: {e}")
+            return False
+        finally:
+            if bgm_file and os.path.exists(render_path):
+                os.remove(render_path)
+    
+    def _select_bgm_file(self) -> str:
+        """BGM 폴더에서 무작위 BGM 파일 선택 (없으면 None)"""
+        if not os.path.isdir(VideoConfig.BGM_FOLDER):
+            return None
+        candidates = [
+            os.path.join(VideoConfig.BGM_FOLDER, name)
+            for name in os.listdir(VideoConfig.BGM_FOLDER)
+            if name.lower().endswith(('.mp3', '.wav', '.m4a'))
+        ]
+        return random.choice(candidates) if candidates else None
+    
+    def _mix_bgm_stream_copy(self, video_path: str, bgm_file: str, output_path: str) -> bool:
+        """
+        영상 스트림은 복사하고 기존 오디오(클립 소리 + 효과음)에 BGM만 섞어 오디오만 다시 인코딩
+        
+        Args:
+            video_path: 트랜지션까지 렌더링된 영상 경로
+            bgm_file: BGM 파일 경로 (영상보다 짧으면 반복)
+            output_path: 출력 파일 경로
+            
+        Returns:
+            bool: 성공 여부
+        """
+        cmd = [
+            'ffmpeg', '-y', '-i', video_path, '-stream_loop', '-1', '-i', bgm_file,
+            '-filter_complex',
+            f"[1:a]volume={VideoConfig.BGM_VOLUME}dB[bgm];"
+            "[0:a][bgm]amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]",
+            '-map', '0:v', '-map', '[aout]',
+            '-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k',
+            '-movflags', '+faststart', output_path
+        ]
+        result = run_ffmpeg(cmd, capture_output=True, text=True, timeout=300)
+        if result.returncode != 0:
+            print(f"⚠️ BGM 믹싱 실패: {result.stderr[-300:]}")
+            return False
+        return True
+    
     def _download_video(self, video_url: str, filename: str) -> str:
         """영상을 다운로드하고 임시 파일 경로 반환"""
         temp_path = os.path.join(self.temp_dir, filename)
@@ -22,6 +22,11 @@ class VideoConfig:
     DEFAULT_DURATION = 5  # 기본 비디오 길이 (초)
     TRANSITION_DURATION = 1.0  # 트랜지션 길이 (초)
     
+    # Runway 동시 생성 설정
+    RUNWAY_MAX_CONCURRENCY = 4  # 동시에 진행할 Runway 작업 수
+    RUNWAY_POLL_INTERVAL = 5  # 작업 상태 확인 간격 (초)
+    RUNWAY_MAX_POLL_ATTEMPTS = 120  # 최대 상태 확인 횟수 (5초 * 120번 = 10분)
+    
     # 코덱 설정
     VIDEO_CODEC = 'libx264'
     AUDIO_CODEC = 'aac'
@@ -54,6 +59,7 @@ class ImageToVideoRequest(BaseModel):
     duration_per_scene: int = 5  # 장면당 영상 길이 (초)
     resolution: str = "720:1280"  # 해상도 (세로형)
     model: str = "gen4_turbo"  # Runway 이미지→비디오 모델
+    max_concurrency: int = VideoConfig.RUNWAY_MAX_CONCURRENCY  # 동시에 진행할 Runway 작업 수
 
 class StoryboardVideoOutput(BaseModel):
     """전체 스토리보드 영상 생성 결과"""
@@ -65,7 +71,7 @@ class VideoMergeRequest(BaseModel):
     """영상 합치기 요청"""
     video_urls: List[str]  # 합칠 영상 URL 목록
     output_filename: Optional[str] = None  # 출력 파일명 (기본값: 타임스탬프)
-    transition_duration: float = 1.0  # 트랜지션 효과 시간 (초)
+    transition_duration: float = 1.0  # 트랜지션 효과 시간 (초, 0이면 하드컷)
     enable_bgm: bool = True  # BGM 사용 여부
     bgm_volume: float = -5.0  # BGM 음량 조절 (dB)
 
@@ -80,7 +86,7 @@ class TransitionMergeRequest(BaseModel):
     """트랜지션과 BGM을 포함한 영상 합치기 요청"""
     enable_bgm: bool = True  # BGM 사용 여부 (기본값: True)
     bgm_volume: float = 0.4  # BGM 음량 (0.0~1.0, 기본값: 40%)
-    transition_duration: float = 1.0  # 트랜지션 효과 시간 (초)
+    transition_duration: float = 1.0  # 트랜지션 효과 시간 (초, 0이면 하드컷)
 
 class BGMGenerationRequest(BaseModel):
     """SUNO API BGM 생성 요청 (이미지와 동일한 파라미터 구조)"""
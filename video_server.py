@@ -10,6 +10,7 @@ import re
 import time
 import traceback
 import shutil
+import uuid
 from fastapi import FastAPI, HTTPException, Body
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
@@ -39,6 +40,20 @@ from video_server_utils import (
     create_video_response,
     get_transition_description
 )
+from video_utils import generate_videos_concurrently
+from rate_limiter import TokenBucketLimiter, get_retry_after
+from render_plan import RENDER_PLAN_DIR, TRANSITION_STYLES, RenderPlan, build_subtitle_force_style
+from media_probe import probe_media, get_media_probe
+from mp4_validator import has_audio_stream
+from ffmpeg_executor import run_ffmpeg_async, get_ffmpeg_executor
+from job_queue import get_job_queue, report_job_progress
+from project_store import DEFAULT_PROJECT_ID, ProjectState, get_project_store
+from artifact_manifest import (
+    get_artifact_manifest, KEY_TTS_SCENE, KEY_COMBINED_TTS, KEY_TRANSITION_VIDEO,
+    KEY_RENDER_PLAN, KEY_SUBTITLE, KEY_FINAL_VIDEO
+)
+from media_index import get_media_index, index_media_file
+from media_gc import get_media_gc
 from video_models import VideoMergeRequest, VideoConfig, TransitionMergeRequest, SubtitleCustomRequest
 
 # 비디오 처리 상태 추적을 위한 글로벌 변수
@@ -52,6 +67,29 @@ video_processing_status = {
     "estimated_completion": None
 }
 
+def _update_processing_status(fields: dict):
+    """전역 처리 상태와 (백그라운드 작업으로 실행 중이면) 해당 작업의 진행 상태를 함께 갱신"""
+    video_processing_status.update(fields)
+    report_job_progress(
+        current_step=fields.get("current_step"),
+        progress=fields.get("progress"),
+        current_file=fields.get("current_file")
+    )
+
+def _remove_indexed_srt_files() -> int:
+    """static/videos의 SRT 파일 삭제 (디렉토리를 훑지 않고 미디어 인덱스로 조회)"""
+    media_index = get_media_index()
+    removed = 0
+    for entry in media_index.query(category="videos", extensions=[".srt"]):
+        try:
+            os.remove(entry["path"])
+            media_index.remove(entry["path"])
+            removed += 1
+            print(f"   ✅ {entry['filename']} 삭제 완료")
+        except Exception as e:
+            print(f"   ⚠️ {entry['filename']} 삭제 실패: {e}")
+    return removed
+
 # TTS와 자막 관련 import는 try-except로 처리
 try:
     from tts_utils import create_tts_audio, create_multiple_tts_audio, get_elevenlabs_api_key
@@ -110,8 +148,8 @@ async def generate_suno_bgm(keyword: str = "happy", duration: int = 70):
             error_text = response.text
             raise HTTPException(status_code=response.status_code, detail=f"SUNO API 오류: {error_text}")
 
-async def check_suno_task_and_download(task_id: str):
-    """SUNO 태스크 상태 확인 및 BGM 다운로드"""
+async def check_suno_task_and_download(task_id: str, project_id: Optional[str] = None):
+    """SUNO 태스크 상태 확인 및 BGM 다운로드 (project_id를 주면 미디어 인덱스에 프로젝트 BGM으로 기록)"""
     api_key = os.getenv('SUNO_API_KEY')
     status_endpoint = f"https://api.sunoapi.org/api/v1/generate/record-info?taskId={task_id}"
     
@@ -163,6 +201,7 @@ async def check_suno_task_and_download(task_id: str):
                         
                         with open(bgm_path, "wb") as f:
                             f.write(audio_response.content)
+                        index_media_file(bgm_path, role="suno_bgm", project_id=project_id)
                         
                         return {
                             "success": True,
@@ -199,7 +238,7 @@ try:
     )
     from workflows import (
         generate_persona, create_ad_concept,
-        generate_scene_prompts, generate_images_sequentially
+        generate_scene_prompts, generate_images_concurrently
     )
     CLIENT_MODELS_AVAILABLE = True
     print("✅ client.py 모델들과 워크플로우 함수들 import 완료")
@@ -207,18 +246,12 @@ except ImportError as e:
     CLIENT_MODELS_AVAILABLE = False
     print(f"⚠️ client.py 모델들 import 실패: {e}")
 
-# 전역 변수로 프로젝트 데이터 저장 (client.py와 동일)
-current_project = {
-    "persona": None,
-    "reference_images": [],
-    "analyzed_images": None,
-    "ad_concept": None,
-    "user_video_input": None,
-    "storyboard": None,
-    "images": None,
-    "generated_videos": None,
-    "tts_result": None
-}
+def _load_project(project_id: str) -> ProjectState:
+    """프로젝트 ID로 단계 결과 조회 (없으면 새로 생성, 잘못된 ID면 400)"""
+    try:
+        return get_project_store().get(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 def check_environment_variables():
     """필수 환경변수 체크"""
@@ -253,8 +286,9 @@ check_environment_variables()
 # ==================================================================================
 
 @app.post("/step1/target-customer")
-async def submit_target_customer(customer: TargetCustomer):
+async def submit_target_customer(customer: TargetCustomer, project_id: str = DEFAULT_PROJECT_ID):
     """1단계: 타겟 고객 정보를 받아 LLM으로 페르소나 생성"""
+    project = _load_project(project_id)
     if not CLIENT_MODELS_AVAILABLE:
         raise HTTPException(status_code=500, detail="client.py 모델들을 찾을 수 없습니다.")
     
@@ -262,7 +296,7 @@ async def submit_target_customer(customer: TargetCustomer):
         # LLM으로 페르소나 생성
         persona_data = await generate_persona(customer)
         # 프로젝트 상태에 저장
-        current_project["persona"] = persona_data.model_dump()
+        project["persona"] = persona_data.model_dump()
         
         print(f"✅ 1단계 완료: 페르소나 생성 성공")
         print(f"   타겟 고객: {customer.country}, {customer.age_range}")
@@ -278,23 +312,24 @@ async def submit_target_customer(customer: TargetCustomer):
         raise HTTPException(status_code=500, detail=f"1단계 페르소나 생성 실패: {str(e)}")
 
 @app.post("/step2/generate-ad-concept-with-images")
-async def generate_ad_concept_with_images(reference_images: Optional[List[ReferenceImage]] = Body(None)):
+async def generate_ad_concept_with_images(reference_images: Optional[List[ReferenceImage]] = Body(None), project_id: str = DEFAULT_PROJECT_ID):
     """2단계: Reference Image 업로드 + Persona → Overall Ad Concept 생성"""
+    project = _load_project(project_id)
     if not CLIENT_MODELS_AVAILABLE:
         raise HTTPException(status_code=500, detail="client.py 모델들을 찾을 수 없습니다.")
     
-    if not current_project["persona"]:
+    if not project["persona"]:
         raise HTTPException(status_code=400, detail="먼저 1단계를 완료해주세요.")
     
     try:
-        persona = PersonaData(**current_project["persona"])
+        persona = PersonaData(**project["persona"])
         
         processed_reference_images = []
         if reference_images:
-            current_project["reference_images"] = [img.model_dump() for img in reference_images]
+            project["reference_images"] = [img.model_dump() for img in reference_images]
             processed_reference_images = reference_images
         else:
-            current_project["reference_images"] = []
+            project["reference_images"] = []
         
         # LLM을 사용하여 광고 컨셉 생성
         concept_result = await create_ad_concept(persona, processed_reference_images)
@@ -302,8 +337,8 @@ async def generate_ad_concept_with_images(reference_images: Optional[List[Refere
         image_analyses_result = concept_result["image_analyses"]
 
         # 현재 프로젝트 상태에 각각 저장
-        current_project["ad_concept"] = ad_concept
-        current_project["analyzed_images"] = image_analyses_result
+        project["ad_concept"] = ad_concept
+        project["analyzed_images"] = image_analyses_result
         
         print(f"✅ 2단계 완료: 광고 컨셉 생성 성공")
         print(f"   참조 이미지: {len(processed_reference_images)}개")
@@ -322,25 +357,26 @@ async def generate_ad_concept_with_images(reference_images: Optional[List[Refere
         raise HTTPException(status_code=500, detail=f"2단계 광고 컨셉 생성 실패: {str(e)}")
 
 @app.post("/step3/video-input")
-async def set_user_video_input(video_input: UserVideoInput):
+async def set_user_video_input(video_input: UserVideoInput, project_id: str = DEFAULT_PROJECT_ID):
     """3단계: 사용자가 광고 컨셉을 수정하여 최종 확정한 비디오 내용 입력"""
+    project = _load_project(project_id)
     if not CLIENT_MODELS_AVAILABLE:
         raise HTTPException(status_code=500, detail="client.py 모델들을 찾을 수 없습니다.")
     
-    if not current_project["persona"]:
+    if not project["persona"]:
         raise HTTPException(status_code=400, detail="먼저 1단계를 완료해주세요.")
     
     try:
         # 사용자가 입력하지 않았거나 빈 문자열인 경우, 2단계 ad_concept을 기본값으로 사용
         if not video_input.user_description or not video_input.user_description.strip():
-            if current_project.get("ad_concept"):
-                video_input.user_description = current_project["ad_concept"]
+            if project.get("ad_concept"):
+                video_input.user_description = project["ad_concept"]
             else:
                 raise HTTPException(status_code=400, detail="광고 컨셉이 없습니다. 먼저 2단계를 완료하거나 직접 입력해주세요.")
         
         # 사용자 입력 저장
-        current_project["user_video_input"] = video_input.model_dump()
-        stored_reference_images = current_project.get("analyzed_images", [])
+        project["user_video_input"] = video_input.model_dump()
+        stored_reference_images = project.get("analyzed_images", [])
         
         print(f"✅ 3단계 완료: 사용자 비디오 입력 저장")
         print(f"   사용자 설명: {video_input.user_description[:50]}...")
@@ -357,24 +393,25 @@ async def set_user_video_input(video_input: UserVideoInput):
         raise HTTPException(status_code=500, detail=f"3단계 사용자 입력 저장 실패: {str(e)}")
 
 @app.post("/step3/generate-storyboard")
-async def generate_storyboard_prompts():
+async def generate_storyboard_prompts(project_id: str = DEFAULT_PROJECT_ID):
     """3단계: LLM이 광고 영상 제작 아이디어를 보고 장면별 프롬프트를 생성"""
+    project = _load_project(project_id)
     if not CLIENT_MODELS_AVAILABLE:
         raise HTTPException(status_code=500, detail="client.py 모델들을 찾을 수 없습니다.")
     
     # 필요한 데이터가 모두 있는지 확인
-    if not current_project["persona"]:
+    if not project["persona"]:
         raise HTTPException(status_code=400, detail="먼저 1단계(페르소나 생성)를 완료해주세요.")
     
-    if not current_project["user_video_input"]:
+    if not project["user_video_input"]:
         raise HTTPException(status_code=400, detail="사용자로부터 광고 영상 제작 아이디어를 입력받으세요.")
     
     try:
         # 모든 필요한 데이터 수집
-        persona_data = current_project.get("persona")
-        ad_concept = current_project.get("ad_concept", "")
-        user_input = current_project.get("user_video_input")
-        analyzed_images = current_project.get("analyzed_images", [])
+        persona_data = project.get("persona")
+        ad_concept = project.get("ad_concept", "")
+        user_input = project.get("user_video_input")
+        analyzed_images = project.get("analyzed_images", [])
 
         # 사용자 입력 데이터 추출
         user_input_text = user_input["user_description"]
@@ -397,7 +434,7 @@ async def generate_storyboard_prompts():
         )
         
         # 스토리보드 저장
-        current_project["storyboard"] = storyboard_prompts.model_dump()
+        project["storyboard"] = storyboard_prompts.model_dump()
         
         print(f"✅ 3단계 완료: 스토리보드 생성 성공")
         print(f"   생성된 장면: {len(storyboard_prompts.scenes)}개")
@@ -414,9 +451,11 @@ async def generate_storyboard_prompts():
 
 @app.post("/step4/generate-images")
 async def run_image_generation(
-    scenes_input: Optional[List[SceneImagePrompt]] = Body(None, alias="scenes")
+    scenes_input: Optional[List[SceneImagePrompt]] = Body(None, alias="scenes"),
+    project_id: str = DEFAULT_PROJECT_ID  # 프로젝트 ID (없으면 기본 프로젝트)
 ):
     """4단계: 스토리보드를 바탕으로 DALL-E 3 이미지 생성"""
+    project = _load_project(project_id)
     if not CLIENT_MODELS_AVAILABLE:
         raise HTTPException(status_code=500, detail="client.py 모델들을 찾을 수 없습니다.")
     
@@ -425,9 +464,9 @@ async def run_image_generation(
         scenes_to_process = []
         
         # 우선순위: 저장된 스토리보드 > 요청 본문
-        if current_project.get("storyboard"):
+        if project.get("storyboard"):
             print("✅ 저장된 스토리보드에서 장면을 가져와 이미지 생성을 시작합니다.")
-            storyboard_data = current_project["storyboard"]
+            storyboard_data = project["storyboard"]
             scenes_to_process = [SceneImagePrompt(**scene_data) for scene_data in storyboard_data.get("scenes", [])]
             print(f"📊 총 {len(scenes_to_process)}개 장면을 처리합니다.")
             
@@ -456,10 +495,10 @@ async def run_image_generation(
         if not openai_api_key:
             raise HTTPException(status_code=500, detail="OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
 
-        print(f"🎨 4단계: DALL-E 3 이미지 생성 시작...")
+        print(f"🎨 4단계: DALL-E 3 이미지 동시 생성 시작...")
         
         # DALL-E 3 이미지 생성
-        generated_images = await generate_images_sequentially(
+        generated_images = await generate_images_concurrently(
             scenes=scenes_to_process,
             api_key=openai_api_key
         )
@@ -470,8 +509,8 @@ async def run_image_generation(
         total_scenes = len(generated_images)
         success_rate = f"{(successful_count / total_scenes) * 100:.1f}%" if total_scenes > 0 else "0%"
 
-        # 4단계 결과를 current_project에 저장 (5단계에서 사용하기 위함)
-        current_project["images"] = generated_images
+        # 4단계 결과를 프로젝트 상태에 저장 (5단계에서 사용하기 위함)
+        project["images"] = generated_images
         print(f"✅ 4단계 완료: DALL-E 3 이미지 생성 성공 ({successful_count}개 성공)")
 
         return {
@@ -491,9 +530,195 @@ async def run_image_generation(
         raise HTTPException(status_code=500, detail=f"4단계 이미지 생성 실패: {str(e)}")
 
 @app.post("/step5/generate-videos")
-async def run_video_generation():
+async def run_video_generation(
+    project_id: str = DEFAULT_PROJECT_ID,  # 프로젝트 ID (없으면 기본 프로젝트)
+    background: bool = False  # True면 작업 ID를 바로 반환하고 백그라운드에서 실행 (GET /jobs/{job_id}로 확인)
+):
     """5단계: 4단계에서 생성된 이미지들을 Runway API로 비디오 변환"""
-    return await generate_videos()
+    if background:
+        return await _submit_pipeline_job("step5", project_id, {})
+    return await generate_videos(project_id)
+
+# ==================================================================================
+# 백그라운드 작업 (5, 6, 8단계)
+# ==================================================================================
+
+# 작업 종류별로 접수 시점의 프로젝트 상태에서 함께 저장할 값 (메모리 저장소에서 서버 재시작 후 복구용)
+JOB_PROJECT_KEYS = {
+    "step5": ("images",),
+    "step6": ("generated_videos",),
+    "step8": ()
+}
+
+async def _submit_pipeline_job(kind: str, project_id: str, kwargs: dict) -> dict:
+    """
+    파이프라인 단계를 작업 큐에 접수하고 작업 ID를 바로 반환
+    
+    Args:
+        kind: 작업 종류 ("step5", "step6", "step8")
+        project_id: 작업을 실행할 프로젝트 ID
+        kwargs: 엔드포인트에 그대로 전달할 인자
+    
+    Returns:
+        dict: 작업 ID와 상태 확인 URL
+    """
+    project = _load_project(project_id)
+    project_snapshot = {key: project.get(key) for key in JOB_PROJECT_KEYS[kind]}
+    job = await get_job_queue().submit(kind, {"project_id": project_id, "kwargs": kwargs, "project": project_snapshot})
+    return {
+        "success": True,
+        "message": "작업이 접수되었습니다. 상태 확인 URL로 진행 상황을 조회하세요.",
+        "project_id": project_id,
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.job_id}"
+    }
+
+async def _run_pipeline_job(job) -> dict:
+    """작업 큐 워커에서 호출: 저장된 인자로 해당 단계 실행"""
+    project_id = job.params.get("project_id", DEFAULT_PROJECT_ID)
+    if job.recovered:
+        # 서버 재시작으로 프로젝트 상태가 비어 있으면 접수 시점의 값으로 복원
+        project = _load_project(project_id)
+        for key, value in job.params.get("project", {}).items():
+            if value and not project.get(key):
+                project[key] = value
+    
+    kwargs = job.params.get("kwargs", {})
+    if job.kind == "step5":
+        report_job_progress("5단계: 이미지 → 비디오 변환 중", 10)
+        return await generate_videos(project_id)
+    if job.kind == "step6":
+        return await merge_videos_with_transitions(project_id=project_id, **kwargs)
+    if job.kind == "step8":
+        return await merge_video_with_custom_subtitles(project_id=project_id, **kwargs)
+    raise ValueError(f"알 수 없는 작업 종류: {job.kind}")
+
+for _job_kind in JOB_PROJECT_KEYS:
+    get_job_queue().register(_job_kind, _run_pipeline_job)
+
+@app.on_event("startup")
+async def start_job_queue():
+    """서버 시작시 작업 워커 실행 (이전에 끝나지 않은 작업 복구)"""
+    await get_job_queue().start()
+
+@app.on_event("startup")
+async def sync_media_index():
+    """서버 시작시 static/ 디렉토리를 한 번 훑어 미디어 인덱스와 맞추고 지난 실행의 SRT 파일 정리"""
+    await asyncio.to_thread(get_media_index().reconcile)
+    print("🧹 서버 시작 - 기존 작업 파일들 정리 중...")
+    srt_count = await asyncio.to_thread(_remove_indexed_srt_files)
+    if srt_count > 0:
+        print(f"   ✅ SRT 파일 {srt_count}개 정리 완료")
+    else:
+        print(f"   📋 정리할 SRT 파일 없음")
+
+@app.on_event("startup")
+async def start_media_gc():
+    """서버 시작시 생성된 미디어의 주기적 정리 시작 (미디어 인덱스 동기화 이후)"""
+    await get_media_gc().start()
+
+@app.on_event("startup")
+async def preload_effect_sounds():
+    """서버 시작시 트랜지션 효과음을 한 번 디코딩해 메모리에 올림 (numpy가 없으면 건너뜀)"""
+    try:
+        from effect_sounds import get_effect_sound_bank
+    except ImportError as e:
+        print(f"⚠️ 트랜지션 효과음 미리 로드 건너뜀: {e}")
+        return
+    await asyncio.to_thread(get_effect_sound_bank().preload)
+
+@app.on_event("shutdown")
+async def stop_media_gc():
+    """서버 종료시 주기적 정리 중지"""
+    await get_media_gc().stop()
+
+@app.get("/media/gc/report")
+async def get_media_gc_report():
+    """
+    보존 정책을 dry-run으로 실행해 지금 정리하면 삭제될 파일 목록 반환 (실제로 지우지 않음)
+    살아 있는 프로젝트가 참조하는 산출물은 삭제 대상에서 제외
+    """
+    media_gc = get_media_gc()
+    report = await asyncio.to_thread(media_gc.collect, True)
+    report["last_run"] = media_gc.last_report
+    return report
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    """서버 종료시 작업 워커 정리 (실행 중이던 작업은 다음 시작 때 다시 실행)"""
+    await get_job_queue().stop()
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """백그라운드 작업의 진행률, 소요 시간, 결과 URL 조회"""
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job.to_dict()
+
+@app.get("/jobs")
+async def list_jobs(status: Optional[str] = None, limit: int = 20):
+    """최근 백그라운드 작업 목록"""
+    job_queue = get_job_queue()
+    return {
+        "queue": job_queue.stats(),
+        "jobs": [job.to_dict() for job in job_queue.store.list(status=status, limit=min(max(limit, 1), 200))]
+    }
+
+# ==================================================================================
+# 프로젝트 관리 (각 단계 요청에 project_id를 넘기면 여러 프로젝트를 동시에 진행 가능)
+# ==================================================================================
+
+@app.post("/projects")
+async def create_project(project_id: Optional[str] = None):
+    """새 프로젝트 생성 (ID를 주지 않으면 자동 발급)"""
+    try:
+        project = get_project_store().create(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "message": "새 프로젝트가 생성되었습니다.",
+        "project_id": project.project_id
+    }
+
+@app.get("/projects")
+async def list_projects():
+    """저장된 프로젝트 목록과 완료된 단계"""
+    return {"projects": get_project_store().list()}
+
+@app.get("/projects/{project_id}")
+async def get_project_state(project_id: str):
+    """프로젝트의 단계별 결과 조회 (LLM/이미지/비디오 결과를 다시 생성하지 않고 재사용)"""
+    project_store = get_project_store()
+    try:
+        project = project_store.get(project_id, create=False)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if project is None:
+        raise HTTPException(status_code=404, detail=f"프로젝트를 찾을 수 없습니다: {project_id}")
+    return {"project_id": project_id, "project": project}
+
+@app.delete("/projects/{project_id}")
+async def delete_project(project_id: str):
+    """프로젝트 삭제"""
+    try:
+        deleted = get_project_store().delete(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"프로젝트를 찾을 수 없습니다: {project_id}")
+    get_artifact_manifest().remove(project_id)  # 산출물 기록도 함께 삭제 (파일은 유지)
+    return {"message": "프로젝트가 삭제되었습니다.", "project_id": project_id}
+
+@app.get("/projects/{project_id}/artifacts")
+async def list_project_artifacts(project_id: str, key: Optional[str] = None, kind: Optional[str] = None):
+    """프로젝트가 만든 파일 목록 (종류, 길이, 해시, 부모 산출물 포함, 최신순)"""
+    artifacts = get_artifact_manifest().list(project_id, key=key, kind=kind)
+    return {
+        "project_id": project_id,
+        "artifacts": [dict(artifact.to_dict(), exists=artifact.exists) for artifact in artifacts]
+    }
 
 # ==================================================================================
 # 기존 5-8단계 엔드포인트들
@@ -519,7 +744,10 @@ async def get_processing_status():
         "is_processing": video_processing_status["is_processing"],
         "current_step": video_processing_status["current_step"],
         "progress": video_processing_status["progress"],
-        "current_file": video_processing_status["current_file"]
+        "current_file": video_processing_status["current_file"],
+        "ffmpeg_jobs": get_ffmpeg_executor().stats(),  # FFmpeg 실행기 실행/대기 작업 수
+        "background_jobs": get_job_queue().stats(),  # 작업 큐 실행/대기 작업 수 (작업별 상태는 GET /jobs/{job_id})
+        "media_probe_cache": get_media_probe().stats()  # ffprobe 결과 캐시 적중/미스
     }
     
     if video_processing_status["start_time"] and video_processing_status["is_processing"]:
@@ -560,6 +788,12 @@ async def get_video_status():
         "available_endpoints": {
             "GET /video/status": "🏠 현재 페이지 - 전체 시스템 상태 확인",
             "GET /video/processing-status": "⏳ 실시간 비디오 처리 상태 확인 (진행률, 남은 시간 등)",
+            "GET /jobs/{job_id}": "🧵 백그라운드 작업 상태 확인 (5, 6, 8단계를 background=true로 요청한 경우)",
+            "GET /jobs": "🧵 최근 백그라운드 작업 목록",
+            "POST /projects": "🗂️ 새 프로젝트 생성 (각 단계 요청에 project_id로 전달, 생략시 기본 프로젝트)",
+            "GET /projects/{project_id}": "🗂️ 프로젝트의 단계별 결과 조회",
+            "GET /projects/{project_id}/artifacts": "🗂️ 프로젝트가 만든 파일 목록 (종류, 길이, 해시, 부모 산출물)",
+            "GET /media/gc/report": "🧹 미디어 정리 dry-run 보고서 (나이/용량 한도를 넘은 미참조 파일 목록)",
             
             "📊 1단계: 페르소나 분석": {
                 "POST /step1/target-customer": "타겟 고객 정보 → LLM 페르소나 생성"
@@ -587,7 +821,7 @@ async def get_video_status():
             },
             
             "✂️ 6단계: 비디오 + BGM 합치기": {
-                "POST /video/merge-with-transitions": "5단계 비디오들을 랜덤 트랜지션으로 합치기 (BGM on/off 선택 가능)"
+                "POST /video/merge-with-transitions": "5단계 비디오들을 랜덤 트랜지션으로 합치기 (BGM on/off, transition_style=xfade/smooth/mixed 선택 가능)"
             },
             
             "🎙️ 7단계: TTS 음성 생성": {
@@ -644,26 +878,242 @@ async def get_video_status():
         }
     }
 
+# 7단계 내레이션 스크립트 생성 설정
+NARRATION_SCRIPT_MODES = ("concurrent", "batch", "sequential")  # 장면별 동시 호출 / 단일 JSON 호출 / 순차 호출
+NARRATION_MAX_CONCURRENCY = 5  # 동시에 보낼 최대 LLM 요청 수
+NARRATION_REQUESTS_PER_MINUTE = 300  # gpt-4o-mini 분당 요청 한도
+NARRATION_MAX_CHARS = 35  # 내레이션 최대 글자 수 (3초 분량)
+
+NARRATION_SYSTEM_PROMPT = "당신은 광고 내레이션 전문가입니다. 각 장면에 맞는 매력적이고 설득력 있는 한국어 내레이션을 작성합니다."
+
+def _build_scene_narration_prompt(scene_number: int, scene: dict, persona_description: str, ad_concept: str) -> str:
+    """장면 하나에 대한 내레이션 생성 프롬프트 구성"""
+    return f"""
+당신은 전문 광고 내레이션 작가입니다. 
+주어진 정보를 바탕으로 해당 장면에 딱 맞는 짧고 임팩트 있는 TTS 내레이션을 한국어로 작성해주세요.
+
+**타겟 고객 (페르소나):**
+{persona_description}
+
+**전체 광고 컨셉:**
+{ad_concept}
+
+**현재 장면 정보 (장면 {scene_number}):**
+- 장면 설명: {scene.get("scene_description", "")}
+- 이미지 프롬프트: {scene.get("prompt_text", "")}
+
+**TTS 요구사항:**
+- 이 장면에 딱 맞는 내레이션 1문장
+- 20-35자 이내 (3초 분량)
+- 간결하고 임팩트 있게
+- 타겟 고객에게 어필할 수 있는 톤
+- 전체 광고 컨셉과 일치해야 함
+
+**출력 형식:**
+장면에 맞는 TTS 내레이션만 작성해주세요. 다른 설명은 필요 없습니다.
+
+TTS 내레이션:"""
+
+def _build_batch_narration_prompt(scenes: list, persona_description: str, ad_concept: str) -> str:
+    """모든 장면의 내레이션을 한 번에 요청하는 JSON 프롬프트 구성"""
+    scene_lines = "\n".join(
+        f"- 장면 {i}: 장면 설명: {scene.get('scene_description', '')} / 이미지 프롬프트: {scene.get('prompt_text', '')}"
+        for i, scene in enumerate(scenes, 1)
+    )
+    return f"""
+당신은 전문 광고 내레이션 작가입니다. 
+주어진 정보를 바탕으로 각 장면에 딱 맞는 짧고 임팩트 있는 TTS 내레이션을 한국어로 작성해주세요.
+
+**타겟 고객 (페르소나):**
+{persona_description}
+
+**전체 광고 컨셉:**
+{ad_concept}
+
+**장면 목록 (총 {len(scenes)}개):**
+{scene_lines}
+
+**TTS 요구사항:**
+- 장면마다 딱 맞는 내레이션 1문장
+- 20-35자 이내 (3초 분량)
+- 간결하고 임팩트 있게
+- 타겟 고객에게 어필할 수 있는 톤
+- 전체 광고 컨셉과 일치하고 장면끼리 자연스럽게 이어져야 함
+
+**출력 형식 (JSON만 출력):**
+{{"narrations": [{{"scene_number": 1, "text": "내레이션"}}, ...]}}"""
+
+def _clean_narration_text(generated_text: str, scene_number: int) -> str:
+    """LLM 응답에서 접두사를 제거하고 35자 제한 적용 (비어 있으면 기본 문구 사용)"""
+    generated_text = (generated_text or "").strip()
+    
+    # "TTS 내레이션:" 접두사 제거
+    if generated_text.startswith("TTS 내레이션:"):
+        generated_text = generated_text.replace("TTS 내레이션:", "").strip()
+    
+    # 길이 제한 (35자)
+    if len(generated_text) > NARRATION_MAX_CHARS:
+        generated_text = generated_text[:NARRATION_MAX_CHARS]
+        # 마지막 공백에서 자르기
+        last_space = generated_text.rfind(' ')
+        if last_space > 25:
+            generated_text = generated_text[:last_space]
+    
+    return generated_text or f"장면 {scene_number} 내레이션"
+
+async def _post_chat_completion(client: httpx.AsyncClient, limiter: TokenBucketLimiter, payload: dict, max_retries: int = 2) -> Optional[str]:
+    """gpt-4o-mini 호출 (429 응답은 속도 제한기에 반영 후 재시도), 실패시 None 반환"""
+    headers = {
+        "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
+        "Content-Type": "application/json"
+    }
+    
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        response = await client.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
+        limiter.update_from_headers(response.headers)
+        
+        if response.status_code == 429 and attempt < max_retries:
+            limiter.penalize(get_retry_after(response.headers) or 2 * (attempt + 1))
+            continue
+        
+        if response.status_code != 200:
+            print(f"   ❌ OpenAI API 오류: {response.text}")
+            return None
+        
+        return response.json()["choices"][0]["message"]["content"]
+    
+    return None
+
+async def _generate_single_scene_narration(client: httpx.AsyncClient, limiter: TokenBucketLimiter, scene_number: int, scene: dict, persona_description: str, ad_concept: str) -> str:
+    """장면 하나의 내레이션 생성 (실패시 기본 문구)"""
+    payload = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": NARRATION_SYSTEM_PROMPT},
+            {"role": "user", "content": _build_scene_narration_prompt(scene_number, scene, persona_description, ad_concept)}
+        ],
+        "max_tokens": 200,
+        "temperature": 0.7
+    }
+    
+    try:
+        print(f"   🌐 장면 {scene_number} OpenAI API 호출 중...")
+        generated_text = await _post_chat_completion(client, limiter, payload)
+    except Exception as api_error:
+        print(f"   ❌ 장면 {scene_number} OpenAI API 호출 실패: {api_error}")
+        generated_text = None
+    
+    narration = _clean_narration_text(generated_text, scene_number)
+    print(f"   ✅ 장면 {scene_number} TTS 생성 완료: {narration}")
+    return narration
+
+async def _generate_batch_narrations(client: httpx.AsyncClient, limiter: TokenBucketLimiter, scenes: list, persona_description: str, ad_concept: str) -> List[str]:
+    """모든 장면의 내레이션을 하나의 JSON 응답으로 생성 (누락된 장면은 기본 문구)"""
+    import json
+    
+    payload = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": NARRATION_SYSTEM_PROMPT + " 반드시 지정된 JSON 형식으로만 응답합니다."},
+            {"role": "user", "content": _build_batch_narration_prompt(scenes, persona_description, ad_concept)}
+        ],
+        "response_format": {"type": "json_object"},
+        "max_tokens": 80 * len(scenes) + 100,
+        "temperature": 0.7
+    }
+    
+    narrations_by_scene = {}
+    try:
+        print(f"   🌐 {len(scenes)}개 장면 내레이션 단일 OpenAI API 호출 중...")
+        content = await _post_chat_completion(client, limiter, payload)
+        if content:
+            response_data = json.loads(content)
+            items = response_data.get("narrations", []) if isinstance(response_data, dict) else []
+            for item in items if isinstance(items, list) else []:
+                # 형식이 잘못된 항목만 건너뛰고 나머지 장면은 그대로 사용
+                try:
+                    if not isinstance(item, dict):
+                        raise TypeError(f"내레이션 항목이 객체가 아닙니다: {item!r}")
+                    text = item.get("text", "")
+                    if not isinstance(text, str):
+                        raise TypeError(f"내레이션 text가 문자열이 아닙니다: {text!r}")
+                    narrations_by_scene[int(item.get("scene_number"))] = text
+                except (TypeError, ValueError) as item_error:
+                    print(f"   ⚠️ 잘못된 내레이션 항목을 건너뜁니다: {item_error}")
+                    continue
+    except Exception as api_error:
+        print(f"   ❌ 배치 내레이션 생성 실패: {api_error}")
+    
+    narrations = []
+    for i in range(1, len(scenes) + 1):
+        if i not in narrations_by_scene:
+            print(f"   ⚠️ 장면 {i} 내레이션이 응답에 없어 기본 문구를 사용합니다.")
+        narrations.append(_clean_narration_text(narrations_by_scene.get(i), i))
+    return narrations
+
+async def generate_scene_narrations(scenes: list, persona_description: str, ad_concept: str, mode: str = "concurrent") -> List[str]:
+    """
+    스토리보드 장면별 TTS 내레이션 생성
+    
+    Args:
+        scenes: 스토리보드 장면 리스트
+        persona_description: 페르소나 설명
+        ad_concept: 광고 컨셉
+        mode: "concurrent" (장면별 동시 호출), "batch" (단일 JSON 호출), "sequential" (순차 호출)
+        
+    Returns:
+        List[str]: 장면 순서대로 정렬된 내레이션 (35자 이내)
+    """
+    limiter = TokenBucketLimiter(NARRATION_REQUESTS_PER_MINUTE, capacity=NARRATION_MAX_CONCURRENCY, name="OpenAI")
+    limits = httpx.Limits(max_connections=NARRATION_MAX_CONCURRENCY, max_keepalive_connections=NARRATION_MAX_CONCURRENCY)
+    
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+        if mode == "batch":
+            return await _generate_batch_narrations(client, limiter, scenes, persona_description, ad_concept)
+        
+        if mode == "sequential":
+            return [
+                await _generate_single_scene_narration(client, limiter, i, scene, persona_description, ad_concept)
+                for i, scene in enumerate(scenes, 1)
+            ]
+        
+        semaphore = asyncio.Semaphore(NARRATION_MAX_CONCURRENCY)
+        
+        async def run_scene(i: int, scene: dict) -> str:
+            async with semaphore:
+                return await _generate_single_scene_narration(client, limiter, i, scene, persona_description, ad_concept)
+        
+        return list(await asyncio.gather(*[run_scene(i, scene) for i, scene in enumerate(scenes, 1)]))
+
 @app.post("/video/create-tts-from-storyboard")
-async def create_tts_from_storyboard():
-    """7단계: current_project의 스토리보드 기반 장면별 TTS 생성"""
+async def create_tts_from_storyboard(script_mode: str = "concurrent", project_id: str = DEFAULT_PROJECT_ID):
+    """
+    7단계: 프로젝트 스토리보드 기반 장면별 TTS 생성
+    
+    script_mode:
+        - concurrent: 장면별 LLM 호출을 동시에 실행 (기본값)
+        - batch: 모든 장면을 하나의 JSON 응답으로 생성
+        - sequential: 기존 방식대로 장면별 순차 호출
+    """
+    project = _load_project(project_id)
     try:
         print(f"🎙️ 7단계: 스토리보드 기반 장면별 TTS 내레이션 생성 시작...")
         
-        # current_project에서 필요한 데이터 확인
-        if not current_project.get("persona"):
+        # 프로젝트 상태에서 필요한 데이터 확인
+        if not project.get("persona"):
             raise HTTPException(status_code=400, detail="1단계 페르소나 데이터가 없습니다. 먼저 1단계를 완료해주세요.")
         
-        if not current_project.get("ad_concept"):
+        if not project.get("ad_concept"):
             raise HTTPException(status_code=400, detail="2단계 광고 컨셉이 없습니다. 먼저 2단계를 완료해주세요.")
         
-        if not current_project.get("storyboard"):
+        if not project.get("storyboard"):
             raise HTTPException(status_code=400, detail="3단계 스토리보드가 없습니다. 먼저 3단계를 완료해주세요.")
         
-        # current_project 데이터 추출
-        persona_data = current_project["persona"]
-        ad_concept = current_project["ad_concept"]
-        storyboard_data = current_project["storyboard"]
+        # 프로젝트 데이터 추출
+        persona_data = project["persona"]
+        ad_concept = project["ad_concept"]
+        storyboard_data = project["storyboard"]
         
         # 페르소나 정보 추출
         persona_description = persona_data.get("persona_description", "")
@@ -676,109 +1126,32 @@ async def create_tts_from_storyboard():
         if not scenes:
             raise HTTPException(status_code=400, detail="스토리보드에 장면이 없습니다.")
         
-        print(f"✅ current_project 데이터 로드 완료:")
+        print(f"✅ 프로젝트 데이터 로드 완료:")
         print(f"   📊 페르소나: {persona_description[:50]}{'...' if len(persona_description) > 50 else ''}")
         print(f"   💡 광고 컨셉: {ad_concept[:50]}{'...' if len(ad_concept) > 50 else ''}")
         print(f"   🎬 스토리보드 장면 수: {len(scenes)}개")
 
-        # 각 장면별로 TTS 스크립트 생성
-        tts_scripts = []
+        # 각 장면별로 TTS 스크립트 생성 (script_mode에 따라 순차 / 동시 / 단일 배치 호출)
+        if script_mode not in NARRATION_SCRIPT_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"지원하지 않는 script_mode입니다: {script_mode} (가능한 값: {', '.join(NARRATION_SCRIPT_MODES)})"
+            )
         
-        for i, scene in enumerate(scenes, 1):
-            scene_description = scene.get("scene_description", "")
-            scene_prompt = scene.get("prompt_text", "")
-            
-            print(f"\n🎤 [{i}/{len(scenes)}] 장면 {i} TTS 스크립트 생성 중...")
-            print(f"   📝 장면 설명: {scene_description[:60]}...")
-            
-            # 각 장면에 맞는 OpenAI LLM 프롬프트 생성
-            llm_prompt = f"""
-당신은 전문 광고 내레이션 작가입니다. 
-주어진 정보를 바탕으로 해당 장면에 딱 맞는 짧고 임팩트 있는 TTS 내레이션을 한국어로 작성해주세요.
-
-**타겟 고객 (페르소나):**
-{persona_description}
-
-**전체 광고 컨셉:**
-{ad_concept}
-
-**현재 장면 정보 (장면 {i}):**
-- 장면 설명: {scene_description}
-- 이미지 프롬프트: {scene_prompt}
-
-**TTS 요구사항:**
-- 이 장면에 딱 맞는 내레이션 1문장
-- 20-35자 이내 (3초 분량)
-- 간결하고 임팩트 있게
-- 타겟 고객에게 어필할 수 있는 톤
-- 전체 광고 컨셉과 일치해야 함
-
-**출력 형식:**
-장면에 맞는 TTS 내레이션만 작성해주세요. 다른 설명은 필요 없습니다.
-
-TTS 내레이션:"""
-            
-            # OpenAI API 호출
-            headers = {
-                "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "당신은 광고 내레이션 전문가입니다. 각 장면에 맞는 매력적이고 설득력 있는 한국어 내레이션을 작성합니다."
-                    },
-                    {
-                        "role": "user",
-                        "content": llm_prompt
-                    }
-                ],
-                "max_tokens": 200,
-                "temperature": 0.7
-            }
-            
-            try:
-                print(f"   🌐 OpenAI API 호출 중...")
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    response = await client.post(
-                        "https://api.openai.com/v1/chat/completions",
-                        headers=headers,
-                        json=payload
-                    )
-                    
-                    if response.status_code != 200:
-                        error_text = response.text
-                        print(f"   ❌ OpenAI API 오류: {error_text}")
-                        generated_text = f"장면 {i} 내레이션"  # 기본값
-                    else:
-                        response_data = response.json()
-                        generated_text = response_data["choices"][0]["message"]["content"].strip()
-                        
-                        # "TTS 내레이션:" 접두사 제거
-                        if generated_text.startswith("TTS 내레이션:"):
-                            generated_text = generated_text.replace("TTS 내레이션:", "").strip()
-                        
-                        # 길이 제한 (35자)
-                        if len(generated_text) > 35:
-                            generated_text = generated_text[:35]
-                            # 마지막 공백에서 자르기
-                            last_space = generated_text.rfind(' ')
-                            if last_space > 25:
-                                generated_text = generated_text[:last_space]
-                        
-                        print(f"   ✅ 장면 {i} TTS 생성 완료: {generated_text}")
-                        
-            except Exception as api_error:
-                print(f"   ❌ 장면 {i} OpenAI API 호출 실패: {api_error}")
-                generated_text = f"장면 {i} 내레이션"
-            
+        print(f"\n🎤 TTS 스크립트 생성 방식: {script_mode}")
+        narration_texts = await generate_scene_narrations(
+            scenes=scenes,
+            persona_description=persona_description,
+            ad_concept=ad_concept,
+            mode=script_mode
+        )
+        
+        tts_scripts = []
+        for i, (scene, generated_text) in enumerate(zip(scenes, narration_texts), 1):
             # TTS 스크립트 정보 저장
             tts_scripts.append({
                 "scene_number": i,
-                "scene_description": scene_description,
+                "scene_description": scene.get("scene_description", ""),
                 "text": generated_text,
                 "estimated_duration": min(len(generated_text) * 0.08, 3.5),
                 "char_count": len(generated_text),
@@ -860,32 +1233,46 @@ TTS 내레이션:"""
                     "error": str(tts_error)
                 })
 
-        # 7단계 결과를 current_project에 저장 (8단계에서 사용)
-        current_project["tts_result"] = {
+        # 7단계 결과를 프로젝트 상태에 저장 (8단계에서 사용)
+        project["tts_result"] = {
             "tts_scripts": tts_scripts,
             "successful_tts": successful_tts,
             "failed_tts": failed_tts,
             "total_scenes": len(scenes)
         }
         
-        # 7단계 완료 후 TTS 파일명들을 TXT 파일로 저장
-        print(f"📝 7단계 완료된 TTS 파일명 저장 중...")
-        tts_file_list_file = "tts_file_list.txt"
+        # 7단계 완료 후 장면별 TTS를 산출물 목록에 기록 (8단계에서 키로 조회)
+        print(f"📝 7단계 완료된 TTS 산출물 기록 중...")
         try:
-            with open(tts_file_list_file, 'w', encoding='utf-8') as f:
-                for tts in successful_tts:
-                    if tts.get("audio_file_path"):
-                        f.write(tts["audio_file_path"] + '\n')
-                        f.write(f"TEXT:{tts['text']}\n")  # 원본 텍스트도 함께 저장
-                        f.write(f"DURATION:{tts.get('duration', 3.0)}\n")  # 길이 정보도 저장
-                        f.write("---\n")  # 구분자
+            manifest = get_artifact_manifest()
+            generation = uuid.uuid4().hex  # 이번 실행에서 만든 장면 묶음 구분
+            registered_count = 0
+            for order, tts in enumerate(successful_tts):
+                if not tts.get("audio_file_path"):
+                    continue
+                artifact = await asyncio.to_thread(
+                    manifest.register,
+                    project_id,
+                    KEY_TTS_SCENE,
+                    "audio",
+                    tts["audio_file_path"],
+                    url=tts.get("audio_url"),
+                    duration=tts.get("duration"),
+                    metadata={
+                        "generation": generation,
+                        "order": order,
+                        "scene_number": tts["scene_number"],
+                        "text": tts["text"]  # 원본 텍스트도 함께 기록
+                    }
+                )
+                tts["artifact_id"] = artifact.artifact_id
+                index_media_file(tts["audio_file_path"], role="tts", project_id=project_id, sequence=tts["scene_number"])
+                registered_count += 1
             
-            print(f"✅ 7단계 TTS 파일명 저장 성공!")
-            print(f"   파일 위치: {os.path.abspath(tts_file_list_file)}")
-            print(f"   저장된 TTS 파일: {len(successful_tts)}개")
+            print(f"✅ 7단계 TTS 산출물 기록 완료: {registered_count}개")
             
         except Exception as e:
-            print(f"❌ 7단계 TTS 파일명 저장 실패: {e}")
+            print(f"❌ 7단계 TTS 산출물 기록 실패: {e}")
         
         print(f"\n✅ 7단계 완료: 장면별 TTS 생성 성공!")
         print(f"   📊 성공: {len(successful_tts)}개, 실패: {len(failed_tts)}개")
@@ -913,7 +1300,8 @@ TTS 내레이션:"""
                 "used_step1_persona": True,
                 "used_step2_ad_concept": True,
                 "used_step3_storyboard": True,
-                "scene_based_generation": True
+                "scene_based_generation": True,
+                "script_mode": script_mode
             }
         }
         
@@ -963,21 +1351,22 @@ def create_srt_content(sequence_number: int, start_time: float, end_time: float,
 {text}
 
 """
-async def generate_videos():
+async def generate_videos(project_id: str = DEFAULT_PROJECT_ID):
     """5단계: 4단계에서 생성된 이미지들을 비디오로 변환"""
+    project = _load_project(project_id)
     
-    # video_server.py의 current_project에서 4단계 이미지들 가져오기
-    if not current_project.get("images"):
+    # 프로젝트 상태에서 4단계 이미지들 가져오기
+    if not project.get("images"):
         raise HTTPException(
             status_code=400,
             detail="4단계에서 생성된 이미지가 없습니다. 먼저 4단계를 완료해주세요."
         )
     
     # 4단계에서 생성된 이미지 URL들 추출
-    image_data_list = current_project["images"]
+    image_data_list = project["images"]
     image_urls = []
     
-    print(f"🔧 current_project['images'] 내용: {len(image_data_list)}개")
+    print(f"🔧 프로젝트 images 내용: {len(image_data_list)}개")
     
     for i, img_data in enumerate(image_data_list):
         print(f"🔧 이미지 {i+1} 데이터: {type(img_data)} - {str(img_data)[:100]}...")
@@ -1009,7 +1398,7 @@ async def generate_videos():
     print("🎬 5단계: 4단계 이미지들 → 비디오 변환 시작...")
     
     # video_models.py 설정 사용
-    from video_models import ImageToVideoRequest, VideoGenerationResult
+    from video_models import ImageToVideoRequest
     
     video_request = ImageToVideoRequest(
         image_urls=image_urls,
@@ -1023,96 +1412,30 @@ async def generate_videos():
     print(f"   - 해상도: {video_request.resolution}")
     print(f"   - 장면당 길이: {video_request.duration_per_scene}초")
     
-    # Runway API를 통한 이미지 → 동영상 변환
-    generated_videos = []
+    # Runway API를 통한 이미지 → 동영상 변환 (장면별 작업을 동시에 제출하고 함께 폴링)
+    runway_api_key = os.getenv("RUNWAY_API_KEY")
+    
+    if not runway_api_key:
+        raise HTTPException(
+            status_code=500,
+            detail="RUNWAY_API_KEY 환경 변수가 설정되지 않았습니다."
+        )
     
     try:
-        runway_api_key = os.getenv("RUNWAY_API_KEY")
-        
-        if not runway_api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="RUNWAY_API_KEY 환경 변수가 설정되지 않았습니다."
-            )
-        
-        print("🚀 Runway API를 통한 이미지 → 동영상 변환 시작...")
-        
-        headers = {
-            "Authorization": f"Bearer {runway_api_key}",
-            "Content-Type": "application/json",
-            "X-Runway-Version": "2024-11-06"
-        }
-        
-        base_url = "https://api.dev.runwayml.com/v1"
-        
-        async with httpx.AsyncClient(timeout=300) as client:
-            for i, image_url in enumerate(image_urls, 1):
-                print(f"\n🎬 [{i}/{len(image_urls)}] 이미지 → 동영상 변환 중...")
-                print(f"   🖼️ 소스 이미지: {image_url}")
-                
-                payload = {
-                    "model": video_request.model,
-                    "promptImage": image_url,
-                    "duration": video_request.duration_per_scene,
-                    "ratio": video_request.resolution,
-                    "seed": 42
-                }
-                
-                try:
-                    # 동영상 생성 작업 요청
-                    print(f"📤 Runway API 요청: 이미지 → 동영상 변환...")
-                    response = await client.post(f"{base_url}/image_to_video", headers=headers, json=payload)
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"API 요청 실패: {response.text}")
-                    
-                    task_id = response.json()["id"]
-                    print(f"  -> 작업 ID: {task_id}")
-
-                    # 작업 완료까지 폴링
-                    for attempt in range(60):
-                        await asyncio.sleep(5)
-                        
-                        status_response = await client.get(f"{base_url}/tasks/{task_id}", headers=headers)
-                        status_data = status_response.json()
-                        
-                        if status_data["status"] == "SUCCEEDED":
-                            video_url = status_data["output"][0]
-                            print(f"  ✅ 동영상 생성 완료: {video_url}")
-                            
-                            result = VideoGenerationResult(
-                                scene_number=i,
-                                status="success",
-                                video_url=video_url,
-                                duration=video_request.duration_per_scene,
-                                resolution=video_request.resolution
-                            )
-                            generated_videos.append(result.model_dump())
-                            break
-                        elif status_data["status"] == "FAILED":
-                            print(f"  ❌ 동영상 생성 실패: {status_data.get('failure')}")
-                            result = VideoGenerationResult(
-                                scene_number=i,
-                                status="error",
-                                error=f"생성 실패: {status_data.get('failure')}",
-                                duration=video_request.duration_per_scene,
-                                resolution=video_request.resolution
-                            )
-                            generated_videos.append(result.model_dump())
-                            break
-                        else:
-                            print(f"  ⏳ 작업 진행 중... ({attempt + 1}/60) 상태: {status_data['status']}")
-                
-                except Exception as video_error:
-                    print(f"  ❌ 장면 {i} 처리 중 오류: {video_error}")
-                    result = VideoGenerationResult(
-                        scene_number=i,
-                        status="error",
-                        error=str(video_error),
-                        duration=video_request.duration_per_scene,
-                        resolution=video_request.resolution
-                    )
-                    generated_videos.append(result.model_dump())
+        print(f"🚀 Runway API를 통한 이미지 → 동영상 변환 시작... (동시 작업: 최대 {video_request.max_concurrency}개)")
+        
+        results = await generate_videos_concurrently(
+            image_urls=video_request.image_urls,
+            duration_per_scene=video_request.duration_per_scene,
+            resolution=video_request.resolution,
+            model=video_request.model,
+            seed=42,
+            api_key=runway_api_key,
+            max_concurrency=video_request.max_concurrency,
+            max_attempts=60,
+            failure_status="error"
+        )
+        generated_videos = [result.model_dump() for result in results]
     
     except Exception as api_error:
         print(f"⚠️ Runway API 호출 실패: {api_error}")
@@ -1126,9 +1449,9 @@ async def generate_videos():
     failed_count = len(generated_videos) - successful_count
     success_rate = f"{(successful_count / len(generated_videos)) * 100:.1f}%" if generated_videos else "0%"
     
-    # 5단계 결과를 current_project에 저장
-    current_project["generated_videos"] = generated_videos
-    print(f"✅ 5단계 결과를 current_project에 저장했습니다. ({successful_count}개 성공)")
+    # 5단계 결과를 프로젝트 상태에 저장
+    project["generated_videos"] = generated_videos
+    print(f"✅ 5단계 결과를 프로젝트 상태에 저장했습니다. ({successful_count}개 성공)")
     
     return {
         "step": "5단계_비디오_생성",
@@ -1148,7 +1471,8 @@ async def generate_videos():
 async def generate_bgm_and_wait(
     keyword: str = "happy",
     duration: int = 70,
-    max_wait_minutes: int = 5
+    max_wait_minutes: int = 5,
+    project_id: Optional[str] = None
 ):
     """
     SUNO API를 사용한 BGM 생성 및 자동 대기 (파일까지 완전히 생성)
@@ -1172,7 +1496,7 @@ async def generate_bgm_and_wait(
             print(f"🔄 [{attempt}/{max_attempts}] BGM 생성 상태 확인 중... ({attempt * 15}초 경과)")
             
             try:
-                result = await check_suno_task_and_download(task_id)
+                result = await check_suno_task_and_download(task_id, project_id)
                 
                 if result["success"]:
                     print(f"🎉 BGM 생성 및 다운로드 완료!")
@@ -1223,14 +1547,30 @@ async def generate_bgm_and_wait(
 async def merge_videos_with_transitions(
     enable_bgm: bool = True,        # BGM 포함 여부
     bgm_volume: float = 0.4,        # BGM 볼륨 (0.1-1.0)
-    transition_duration: float = 1.0  # 트랜지션 시간 (초)
+    transition_duration: float = 1.0,  # 트랜지션 시간 (초, 0이면 하드컷 - 클립 파라미터가 같으면 재인코딩 없이 이어 붙임)
+    transition_style: str = "xfade",  # 트랜지션 후보: xfade(기본), smooth(줌/패닝/회전), mixed(둘 다)
+    background: bool = False,          # True면 작업 ID를 바로 반환하고 백그라운드에서 실행
+    project_id: str = DEFAULT_PROJECT_ID  # 프로젝트 ID (없으면 기본 프로젝트)
 ):
     """
     6단계: 5단계에서 생성된 영상들을 랜덤 트랜지션으로 합치기 (BGM 선택 가능)
     """
+    project = _load_project(project_id)
+    if transition_style not in TRANSITION_STYLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"transition_style은 {', '.join(TRANSITION_STYLES)} 중 하나여야 합니다."
+        )
+    if background:
+        return await _submit_pipeline_job("step6", project_id, {
+            "enable_bgm": enable_bgm,
+            "bgm_volume": bgm_volume,
+            "transition_duration": transition_duration,
+            "transition_style": transition_style
+        })
     
     # 처리 상태 초기화
-    video_processing_status.update({
+    _update_processing_status({
         "is_processing": True,
         "current_step": "6단계: 비디오 합치기 준비 중",
         "progress": 0,
@@ -1245,7 +1585,7 @@ async def merge_videos_with_transitions(
         example_video_urls = []
         
         # 상태 업데이트: 영상 확인 중
-        video_processing_status.update({
+        _update_processing_status({
             "current_step": "6단계: 생성된 영상 확인 중",
             "progress": 10
         })
@@ -1254,7 +1594,7 @@ async def merge_videos_with_transitions(
         video_urls = []
         use_example_videos = False
         
-        if not current_project.get("generated_videos"):
+        if not project.get("generated_videos"):
             print("❌ 5단계에서 생성된 영상이 없습니다.")
             raise HTTPException(
                 status_code=400, 
@@ -1264,7 +1604,7 @@ async def merge_videos_with_transitions(
             print("📋 6단계: 5단계에서 생성된 영상들을 확인합니다...")
             
             # 생성된 영상 URL들 추출
-            generated_videos = current_project["generated_videos"]
+            generated_videos = project["generated_videos"]
             
             # 성공적으로 생성된 영상 URL들만 추출
             for video in generated_videos:
@@ -1279,7 +1619,7 @@ async def merge_videos_with_transitions(
                 )
         
         # 상태 업데이트: 병합 준비
-        video_processing_status.update({
+        _update_processing_status({
             "current_step": "6단계: 비디오 병합 준비 중",
             "progress": 20
         })
@@ -1298,7 +1638,7 @@ async def merge_videos_with_transitions(
                 print(f"   영상 {i}: {url}")
         
         # 상태 업데이트: 병합 시작
-        video_processing_status.update({
+        _update_processing_status({
             "current_step": "6단계: 비디오 다운로드 및 병합 중",
             "progress": 30,
             "current_file": f"{len(video_urls)}개 비디오 처리 중"
@@ -1306,23 +1646,21 @@ async def merge_videos_with_transitions(
         
         # SUNO BGM 파일 찾기 - request.enable_bgm에 따라 선택적 처리
         selected_bgm_file = None
-        bgm_audio_dir = "static/audio"
         
         if enable_bgm:  # BGM이 활성화된 경우에만 BGM 파일 검색
             try:
-                if os.path.exists(bgm_audio_dir):
-                    # SUNO API로 생성된 BGM 파일만 찾기 (suno_bgm_ 접두사)
-                    suno_bgm_files = [f for f in os.listdir(bgm_audio_dir) 
-                                     if f.startswith('suno_bgm_') and f.endswith('.mp3')]
-                    if suno_bgm_files:
-                        # 가장 최근에 생성된 SUNO BGM 파일 사용
-                        suno_bgm_files.sort(key=lambda x: os.path.getctime(os.path.join(bgm_audio_dir, x)), reverse=True)
-                        selected_bgm_file = os.path.join(bgm_audio_dir, suno_bgm_files[0])
-                        print(f"✅ SUNO BGM 파일 발견: {suno_bgm_files[0]} (BGM과 함께 합칠 예정)")
-                    else:
-                        print("ℹ️ SUNO BGM 파일이 없습니다. BGM 없이 트랜지션만 적용합니다.")
+                # SUNO API로 생성된 BGM 중 가장 최근 파일 (이 프로젝트의 BGM 우선, 없으면 전체에서)
+                media_index = get_media_index()
+                bgm_entry = await asyncio.to_thread(
+                    media_index.latest, category="audio", role="suno_bgm", project_id=project_id, extensions=[".mp3"]
+                ) or await asyncio.to_thread(
+                    media_index.latest, category="audio", role="suno_bgm", extensions=[".mp3"]
+                )
+                if bgm_entry:
+                    selected_bgm_file = bgm_entry["path"]
+                    print(f"✅ SUNO BGM 파일 발견: {bgm_entry['filename']} (BGM과 함께 합칠 예정)")
                 else:
-                    print("ℹ️ BGM 디렉토리가 없습니다. BGM 없이 트랜지션만 적용합니다.")
+                    print("ℹ️ SUNO BGM 파일이 없습니다. BGM 없이 트랜지션만 적용합니다.")
             except Exception as e:
                 print(f"⚠️ BGM 검색 중 에러 발생: {e}. BGM 없이 진행합니다.")
                 selected_bgm_file = None
@@ -1348,18 +1686,29 @@ async def merge_videos_with_transitions(
         
         # 먼저 트랜지션 비디오 생성 (BGM 옵션 포함)
         print(f"🎬 트랜지션 효과로 비디오 합치는 중...")
-        video_processing_status.update({
+        _update_processing_status({
             "current_step": f"6단계: 트랜지션 효과 적용 중 ({bgm_status})",
             "progress": 50,
             "current_file": f"트랜지션: {len(video_urls)}개 영상"
         })
         
-        temp_video_path = merger.merge_videos_with_frame_transitions(
+        # 다운로드와 FFmpeg 처리 중에도 상태 조회 등 다른 요청에 응답하도록 비동기 버전 사용
+        if hasattr(merger, "merge_videos_with_frame_transitions_async"):
+            merge_function = merger.merge_videos_with_frame_transitions_async
+        else:
+            async def merge_function(*args, **kwargs):
+                return await asyncio.to_thread(merger.merge_videos_with_frame_transitions, *args, **kwargs)
+        
+        temp_video_path = await merge_function(
             video_urls,
             output_filename,
             bgm_file=selected_bgm_file,  # BGM을 매개변수로 전달
-            bgm_volume=bgm_volume  # BGM 볼륨도 전달
+            bgm_volume=bgm_volume,  # BGM 볼륨도 전달
+            transition_duration=transition_duration,  # 요청한 트랜지션 길이 (클립 길이에 맞게 제한됨)
+            transition_style=transition_style,  # 랜덤 트랜지션 후보 (smooth/mixed는 줌/패닝/회전 custom xfade)
+            plan_dir=os.path.join(RENDER_PLAN_DIR, os.path.splitext(output_filename)[0])  # 8단계 단일 패스 렌더링용 원본 클립 보관
         )
+        render_plan_path = getattr(merger, "last_render_plan_path", None)
         
         print(f"✅ 비디오 합치기 완료!")
         
@@ -1369,7 +1718,7 @@ async def merge_videos_with_transitions(
         video_url = merger.get_video_url(output_filename)
         
         # 상태 업데이트: 후처리
-        video_processing_status.update({
+        _update_processing_status({
             "current_step": "6단계: 파일 저장 및 후처리 중",
             "progress": 90,
             "current_file": output_filename
@@ -1378,48 +1727,54 @@ async def merge_videos_with_transitions(
         print(f"🎉 6단계 완료: 영상이 성공적으로 합쳐졌습니다!")
         print(f"📱 브라우저에서 확인: {video_url}")
         
-        # 6단계 완료 후 트랜지션 영상 로그를 TXT 파일로 저장
-        print(f"📝 6단계 완료된 트랜지션 영상 로그 저장 중...")
-        transition_video_log_file = "transition_video_log.txt"
+        # 6단계 완료 후 트랜지션 영상과 렌더 계획을 산출물 목록에 기록 (8단계에서 키로 조회)
+        print(f"📝 6단계 완료된 트랜지션 영상 산출물 기록 중...")
         try:
             if final_video_path:
-                if os.path.isabs(final_video_path):
-                    actual_video_path = final_video_path
-                else:
-                    actual_video_path = os.path.abspath(final_video_path)
+                actual_video_path = os.path.abspath(final_video_path)
             else:
                 actual_video_path = os.path.abspath(os.path.join("static", "videos", output_filename))
             
-            with open(transition_video_log_file, 'w', encoding='utf-8') as f:
-                f.write(f"TRANSITION_VIDEO:{actual_video_path}\n")
-                f.write(f"CREATED_TIME:{time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"SOURCE_VIDEOS:{len(video_urls)}\n")
-                f.write(f"BGM_ENABLED:{enable_bgm}\n")
-                if selected_bgm_file:
-                    f.write(f"BGM_FILE:{selected_bgm_file}\n")
-                    f.write(f"BGM_VOLUME:{bgm_volume}\n")
-                f.write(f"OUTPUT_FILENAME:{output_filename}\n")
-                f.write(f"VIDEO_URL:{video_url}\n")
-                f.write("SOURCE_VIDEO_URLS:\n")
-                for i, url in enumerate(video_urls, 1):
-                    f.write(f"  {i}: {url}\n")
-                f.write("---\n")
+            manifest = get_artifact_manifest()
+            parents = []
+            if render_plan_path:
+                plan_artifact = await asyncio.to_thread(
+                    manifest.register, project_id, KEY_RENDER_PLAN, "render_plan", render_plan_path,
+                    metadata={"source_video_urls": video_urls}
+                )
+                parents.append(plan_artifact.artifact_id)
             
-            print(f"✅ 6단계 트랜지션 영상 로그 저장 성공!")
-            print(f"   파일 위치: {os.path.abspath(transition_video_log_file)}")
+            index_media_file(actual_video_path, project_id=project_id)
+            video_info = await asyncio.to_thread(probe_media, actual_video_path)
+            transition_artifact = await asyncio.to_thread(
+                manifest.register,
+                project_id,
+                KEY_TRANSITION_VIDEO,
+                "video",
+                actual_video_path,
+                url=video_url,
+                duration=video_info.get("duration"),
+                parents=parents,
+                metadata={
+                    "output_filename": output_filename,
+                    "source_video_urls": video_urls,
+                    "bgm_enabled": enable_bgm,
+                    "bgm_file": selected_bgm_file,
+                    "bgm_volume": bgm_volume if selected_bgm_file else None,
+                    "transition_duration": transition_duration,
+                    "transition_style": transition_style
+                }
+            )
+            
+            print(f"✅ 6단계 트랜지션 영상 산출물 기록 완료: {transition_artifact.artifact_id}")
             print(f"   저장된 영상: {actual_video_path}")
             print(f"   소스 영상 수: {len(video_urls)}개")
             
-            # 기존 merged_video_list.txt도 유지 (호환성을 위해)
-            merged_video_list_file = "merged_video_list.txt"
-            with open(merged_video_list_file, 'w', encoding='utf-8') as f:
-                f.write(actual_video_path + '\n')
-            
         except Exception as e:
-            print(f"❌ 6단계 트랜지션 영상 로그 저장 실패: {e}")
+            print(f"❌ 6단계 트랜지션 영상 산출물 기록 실패: {e}")
         
         # 상태 업데이트: 완료
-        video_processing_status.update({
+        _update_processing_status({
             "is_processing": False,
             "current_step": "6단계: 완료",
             "progress": 100,
@@ -1439,7 +1794,8 @@ async def merge_videos_with_transitions(
                 "file": os.path.basename(selected_bgm_file) if selected_bgm_file else None
             },
             "transition_settings": {
-                "duration": transition_duration
+                "duration": transition_duration,
+                "style": transition_style
             },
             "output_file": output_filename,
             "url": video_url,
@@ -1450,7 +1806,7 @@ async def merge_videos_with_transitions(
         
     except Exception as e:
         # 에러 발생 시 상태 초기화
-        video_processing_status.update({
+        _update_processing_status({
             "is_processing": False,
             "current_step": f"6단계: 오류 발생 - {str(e)}",
             "progress": 0,
@@ -1460,6 +1816,99 @@ async def merge_videos_with_transitions(
         print(f"❌ 6단계 비디오 병합 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"비디오 병합 실패: {str(e)}")
 
+async def _get_combined_tts_artifact(project_id: str):
+    """
+    7단계 장면별 TTS를 순서대로 이어 붙인 내레이션 트랙 산출물 반환
+    같은 장면 묶음으로 이미 만든 트랙이 있으면 재사용하고, 없으면 FFmpeg로 합쳐서 기록
+    
+    Args:
+        project_id: 프로젝트 ID
+    
+    Returns:
+        Optional[Artifact]: 내레이션 트랙 산출물 (TTS가 없으면 None)
+    """
+    manifest = get_artifact_manifest()
+    combined = manifest.get(project_id, KEY_COMBINED_TTS)
+    scenes = [scene for scene in manifest.latest_generation(project_id, KEY_TTS_SCENE) if scene.exists]
+    if not scenes:
+        return combined
+    
+    scene_ids = [scene.artifact_id for scene in scenes]
+    if combined and combined.parents == scene_ids:
+        print(f"♻️ 기존 내레이션 트랙 재사용: {os.path.basename(combined.path)}")
+        return combined
+    
+    output_path = os.path.abspath(os.path.join("static", "videos", f"combined_tts_{project_id}_{int(time.time() * 1000)}.mp3"))
+    if len(scenes) == 1:
+        shutil.copyfile(scenes[0].path, output_path)
+    else:
+        cmd = ["ffmpeg"]
+        for scene in scenes:
+            cmd += ["-i", scene.path]
+        concat_inputs = "".join(f"[{i}:a]" for i in range(len(scenes)))
+        cmd += [
+            "-filter_complex", f"{concat_inputs}concat=n={len(scenes)}:v=0:a=1[aout]",
+            "-map", "[aout]",
+            "-c:a", "libmp3lame",
+            "-q:a", "2",
+            output_path,
+            "-y"
+        ]
+        result = await run_ffmpeg_async(cmd, timeout=120)
+        if result.returncode != 0:
+            print(f"❌ 내레이션 트랙 합치기 실패: {result.stderr[-500:]}")
+            return None
+    
+    durations = [scene.duration for scene in scenes]
+    total_duration = sum(durations) if all(d is not None for d in durations) else None
+    print(f"🎙️ 장면별 TTS {len(scenes)}개를 내레이션 트랙으로 합침: {os.path.basename(output_path)}")
+    index_media_file(output_path, role="combined_tts", project_id=project_id)
+    return await asyncio.to_thread(
+        manifest.register,
+        project_id,
+        KEY_COMBINED_TTS,
+        "audio",
+        output_path,
+        url=f"/static/videos/{os.path.basename(output_path)}",
+        duration=total_duration,
+        parents=scene_ids
+    )
+
+def _render_final_video_from_plan(
+    render_plan_path: str,
+    output_path: str,
+    subtitle_file_path: Optional[str],
+    subtitle_style: str,
+    tts_path: Optional[str]
+) -> bool:
+    """
+    6단계에서 저장한 렌더 계획에 TTS와 자막을 더해 원본 클립으로부터 최종 영상을 한 번에 렌더링
+    
+    Returns:
+        bool: 성공 여부 (실패시 호출자가 기존 방식으로 처리)
+    """
+    try:
+        plan = RenderPlan.load(render_plan_path)
+        missing = [clip for clip in plan.clips if not os.path.exists(clip)]
+        if missing:
+            print(f"⚠️ 렌더 계획의 원본 클립이 없어 기존 방식으로 처리합니다: {len(missing)}개 누락")
+            return False
+        
+        if subtitle_file_path and os.path.exists(subtitle_file_path):
+            plan.subtitle_file = subtitle_file_path
+            plan.subtitle_style = subtitle_style
+        if tts_path:
+            plan.tts_tracks = [{"path": tts_path, "start": 0.0}]
+            plan.tts_volume = 5.0
+            plan.bgm_volume = plan.bgm_volume * 0.4  # 기존 8단계 믹싱 비율 (BGM 영상 오디오 x0.4) 유지
+        plan.preset = "medium"
+        
+        plan.render(output_path, timeout=300)
+        return True
+    except Exception as e:
+        print(f"⚠️ 단일 패스 최종 렌더링 실패, 기존 방식으로 처리: {e}")
+        return False
+
 # 커스텀 자막 엔드포인트
 @app.post("/video/merge-with-custom-subtitles")
 async def merge_video_with_custom_subtitles(
@@ -1470,15 +1919,34 @@ async def merge_video_with_custom_subtitles(
     scale: int = 30,                    # 비율 (x, y 통합)
     outline_color: str = "&H000000",    # 아웃라인 색
     outline_width: int = 2,             # 아웃라인 굵기
-    enable_bold: bool = True            # 볼드
+    enable_bold: bool = True,           # 볼드
+    single_pass: bool = True,           # 6단계 렌더 계획이 있으면 원본 클립에서 한 번에 렌더링
+    background: bool = False,           # True면 작업 ID를 바로 반환하고 백그라운드에서 실행
+    project_id: str = DEFAULT_PROJECT_ID  # 프로젝트 ID (없으면 기본 프로젝트)
 ):
     """
     커스텀 자막 적용: SRT 파일과 폰트 설정으로 자막 커스터마이징
     - 기존 비디오에 사용자 지정 SRT 파일과 폰트 설정 적용
     - 폰트 크기, 색상, 위치, 스케일 등 세부 조정 가능
+    - single_pass: 6단계 렌더 계획으로 트랜지션 + BGM + TTS + 자막을 인코딩 1회로 처리 (실패시 기존 방식)
+    - background: 작업 ID를 바로 반환하고 GET /jobs/{job_id}로 진행 상황 확인
     """
+    if background:
+        return await _submit_pipeline_job("step8", project_id, {
+            "position": position,
+            "font_size": font_size,
+            "font_name": font_name,
+            "font_color": font_color,
+            "scale": scale,
+            "outline_color": outline_color,
+            "outline_width": outline_width,
+            "enable_bold": enable_bold,
+            "single_pass": single_pass
+        })
+    
     try:
         print(f"🎨 커스텀 자막 적용 시작...")
+        report_job_progress("8단계: 입력 파일 확인 중", 5)
         
         if not SUBTITLE_AVAILABLE:
             raise HTTPException(
@@ -1486,95 +1954,48 @@ async def merge_video_with_custom_subtitles(
                 detail="자막 모듈이 사용할 수 없습니다."
             )
         
-        # 필수 파일들 사전 검증
-        tts_file_list_file = "tts_file_list.txt"
-        if not os.path.exists(tts_file_list_file) or os.path.getsize(tts_file_list_file) == 0:
+        # 6, 7단계 산출물 조회 (프로젝트 산출물 목록에서 키로 조회)
+        manifest = get_artifact_manifest()
+        if not manifest.latest_generation(project_id, KEY_TTS_SCENE) and not manifest.get(project_id, KEY_COMBINED_TTS):
             raise HTTPException(
                 status_code=400,
-                detail="TTS 파일 목록이 없거나 비어있습니다. 먼저 7단계 TTS 생성을 완료해주세요."
+                detail="TTS 산출물이 없습니다. 먼저 7단계 TTS 생성을 완료해주세요."
             )
         
-        transition_video_log_file = "transition_video_log.txt"
-        if not os.path.exists(transition_video_log_file) or os.path.getsize(transition_video_log_file) == 0:
+        transition_artifact = manifest.get(project_id, KEY_TRANSITION_VIDEO)
+        if not transition_artifact:
             raise HTTPException(
                 status_code=400,
-                detail="트랜지션 영상 로그가 없거나 비어있습니다. 먼저 6단계 트랜지션 영상 생성을 완료해주세요."
+                detail="트랜지션 영상이 없습니다. 먼저 6단계 트랜지션 영상 생성을 완료해주세요."
             )
         
-        print(f"✅ 필수 파일 검증 완료 - TTS 목록과 트랜지션 로그 존재")
-        
-        # 1. 트랜지션 영상 로그에서 비디오 파일 찾기 (우선)
-        transition_video_log_file = "transition_video_log.txt"
-        video_file_path = None
-        
-        if os.path.exists(transition_video_log_file):
-            try:
-                with open(transition_video_log_file, 'r', encoding='utf-8') as f:
-                    log_content = f.read()
-                    
-                # 로그에서 트랜지션 영상 경로 추출
-                for line in log_content.split('\n'):
-                    if line.startswith('TRANSITION_VIDEO:'):
-                        transition_video_path = line.split(':', 1)[1].strip()
-                        if os.path.exists(transition_video_path):
-                            video_file_path = transition_video_path
-                            print(f"✅ 트랜지션 영상 로그에서 비디오 사용: {os.path.basename(video_file_path)}")
-                            break
-                            
-            except Exception as e:
-                print(f"⚠️ 트랜지션 영상 로그 읽기 실패: {e}")
-        
-        # 트랜지션 로그에서 찾지 못한 경우 기존 방식으로 폴백
-        if not video_file_path:
-            video_dir = "static/videos"
-            video_files = []
-            
-            if os.path.exists(video_dir):
-                for file in os.listdir(video_dir):
-                    if file.endswith(".mp4") and not file.startswith("custom_subtitle_"):
-                        video_path = os.path.join(video_dir, file)
-                        video_files.append((video_path, os.path.getmtime(video_path)))
-            
-            if not video_files:
-                raise HTTPException(
-                    status_code=404,
-                    detail="비디오 파일을 찾을 수 없습니다. 먼저 트랜지션 비디오를 생성하세요."
-                )
-            
-            # 가장 최근 파일 선택
-            video_files.sort(key=lambda x: x[1], reverse=True)
-            video_file_path = video_files[0][0]
-            print(f"✅ 최근 비디오 파일 사용 (폴백): {os.path.basename(video_file_path)}")
+        video_file_path = transition_artifact.path
+        render_plan_path = None
+        for parent_id in transition_artifact.parents:
+            parent = manifest.get_by_id(parent_id)
+            if parent and parent.key == KEY_RENDER_PLAN and parent.exists:
+                render_plan_path = parent.path
         
         print(f"📹 사용할 비디오: {os.path.basename(video_file_path)}")
         
-        # video_dir 변수 정의 (TTS 파일 검색을 위해)
         video_dir = "static/videos"
         
         # 2. SRT 파일 처리 (자동 TTS 파일에서 생성)
         subtitle_file_path = None
-        # 자동 생성된 SRT 파일 찾기
         from subtitle_utils import transcribe_audio_with_whisper, create_sequential_subtitle_file
         
-        # TTS 파일 찾기
-        tts_files = []
-        for file in os.listdir(video_dir):
-            if file.startswith("combined_tts_") and file.endswith(".mp3"):
-                tts_path = os.path.join(video_dir, file)
-                tts_files.append((tts_path, os.path.getmtime(tts_path)))
-        
-        if not tts_files:
+        # 장면별 TTS를 이어 붙인 내레이션 트랙 (같은 장면 묶음으로 이미 만든 적이 있으면 재사용)
+        combined_tts_artifact = await _get_combined_tts_artifact(project_id)
+        if not combined_tts_artifact:
             raise HTTPException(
                 status_code=404,
                 detail="TTS 파일을 찾을 수 없습니다. 먼저 TTS를 생성하세요."
             )
-        
-        # 가장 최근 TTS 파일 사용
-        tts_files.sort(key=lambda x: x[1], reverse=True)
-        combined_tts_path = tts_files[0][0]
+        combined_tts_path = combined_tts_artifact.path
         print(f"🎙️ 사용할 TTS: {os.path.basename(combined_tts_path)}")
         
         # Whisper로 자막 생성
+        report_job_progress("8단계: 자막 생성 중", 30)
         subtitle_result = await transcribe_audio_with_whisper(
             audio_file_path=combined_tts_path,
             language="ko",
@@ -1599,90 +2020,23 @@ async def merge_video_with_custom_subtitles(
         )
         print(f"✅ 자막 생성 완료: {os.path.basename(subtitle_file_path)}")
         
-        # 자막 생성 완료 후 txt 파일들과 srt 파일들 정리
+        # 자막 생성 완료 후 srt 파일들 정리
         print(f"🧹 커스텀 자막 생성 완료 - 파일들 정리 중...")
-        txt_files_to_clean = [
-            "tts_file_list.txt",
-            "merged_video_list.txt",
-            "transition_video_log.txt",  # 트랜지션 로그도 정리
-            "subtitle_file_list.txt"     # 자막 파일 리스트도 정리
-        ]
         
         # SRT 파일들도 정리 (static/videos 디렉토리에서)
-        video_dir = "static/videos"
-        srt_files_to_clean = []
-        if os.path.exists(video_dir):
-            for file in os.listdir(video_dir):
-                if file.endswith(".srt"):
-                    srt_files_to_clean.append(os.path.join(video_dir, file))
-        
-        # TXT 파일들 정리
-        for txt_file in txt_files_to_clean:
-            if os.path.exists(txt_file):
-                try:
-                    with open(txt_file, 'w', encoding='utf-8') as f:
-                        f.write("")  # 파일 내용 비우기
-                    print(f"   ✅ {txt_file} 내용 정리 완료")
-                except Exception as e:
-                    print(f"   ⚠️ {txt_file} 정리 실패: {e}")
-            else:
-                print(f"   📋 {txt_file} 파일 없음 (정리 불필요)")
-        
-        # SRT 파일들 삭제
-        for srt_file in srt_files_to_clean:
-            if os.path.exists(srt_file):
-                try:
-                    os.remove(srt_file)
-                    print(f"   ✅ {os.path.basename(srt_file)} 삭제 완료")
-                except Exception as e:
-                    print(f"   ⚠️ {os.path.basename(srt_file)} 삭제 실패: {e}")
-            else:
-                print(f"   📋 {os.path.basename(srt_file)} 파일 없음 (삭제 불필요)")
-        
-        # 3. 커스텀 자막 스타일 생성
-        def create_custom_subtitle_style():
-            # 모든 위치에서 중앙 정렬 사용 (Alignment=2 = 하단 중앙)
-            alignment = 2  # 항상 중앙 정렬
-            
-            # 위치별 여백 설정 (정렬은 항상 중앙)
-            if position == "top":
-                margin_v_val = 50  # 상단 여백
-            elif position == "middle":
-                margin_v_val = 0   # 중앙 여백
-            elif position == "bottom":
-                margin_v_val = 80  # 하단 여백
-            else:  # custom - 기본값 사용
-                margin_v_val = 80  # 기본 여백
-            
-            # 고정 여백값 설정
-            margin_l_val = 300
-            margin_r_val = 300
-            
-            style_options = [
-                f"FontSize={font_size}",
-                f"FontName={font_name}",
-                f"PrimaryColour={font_color}",
-                f"Alignment={alignment}",
-                f"MarginV={margin_v_val}",
-                f"MarginL={margin_l_val}",
-                f"MarginR={margin_r_val}",
-                "WrapStyle=0",
-                f"ScaleX={scale}",  # 통합된 스케일 사용
-                f"ScaleY={scale}",  # 통합된 스케일 사용
-                f"Bold={1 if enable_bold else 0}",  # Bold 설정
-                "PlayResX=1920",
-                "PlayResY=1080",
-            ]
-            
-            # 아웃라인 항상 적용 (enable_outline 제거)
-            style_options.extend([
-                f"OutlineColour={outline_color}",
-                "BorderStyle=1",
-                f"Outline={outline_width}",  # 외곽선 두께 설정
-                "Shadow=0"
-            ])
-            
-            return ",".join(style_options)
+        _remove_indexed_srt_files()
+        
+        # 3. 커스텀 자막 스타일 생성 (모든 위치에서 하단 중앙 정렬, 아웃라인 항상 적용)
+        custom_style = build_subtitle_force_style(
+            position=position,
+            font_size=font_size,
+            font_name=font_name,
+            font_color=font_color,
+            scale=scale,
+            outline_color=outline_color,
+            outline_width=outline_width,
+            enable_bold=enable_bold
+        )
         
         # 4. 최종 비디오 생성 (TTS 오디오 포함)
         output_filename = f"custom_subtitle_video_{int(time.time())}.mp4"
@@ -1694,30 +2048,12 @@ async def merge_video_with_custom_subtitles(
         # 자막 파일 경로를 Windows 호환 형식으로 변환
         subtitle_path_fixed = subtitle_file_path.replace("\\", "/").replace(":", "\\:")
         
-        # 커스텀 자막 스타일 적용
-        custom_style = create_custom_subtitle_style()
-        
-        # TTS 파일이 있는지 확인
-        tts_files = []
-        for file in os.listdir(video_dir):
-            if file.startswith("combined_tts_") and file.endswith(".mp3"):
-                tts_path = os.path.join(video_dir, file)
-                tts_files.append((tts_path, os.path.getmtime(tts_path)))
-        
         # TTS 파일이 있으면 오디오와 함께 합치기
-        if tts_files:
-            # 가장 최근 TTS 파일 사용
-            tts_files.sort(key=lambda x: x[1], reverse=True)
-            combined_tts_path = tts_files[0][0]
+        if combined_tts_path:
             print(f"🎙️ TTS 오디오 추가: {os.path.basename(combined_tts_path)}")
             
-            # subprocess 모듈 import
-            import subprocess
-            
-            # 비디오에 기존 오디오가 있는지 확인
-            probe_cmd = [ffmpeg_path, '-i', video_file_path, '-hide_banner', '-f', 'null', '-']
-            probe_result = subprocess.run(probe_cmd, capture_output=True, text=True)
-            has_audio = 'Audio:' in probe_result.stderr
+            # 비디오에 기존 오디오가 있는지 확인 (디코딩 없이 MP4 트랙 헤더만 확인)
+            has_audio = await asyncio.to_thread(has_audio_stream, video_file_path, ffmpeg_path)
             
             if has_audio:
                 # 기존 BGM + TTS 믹싱
@@ -1775,13 +2111,27 @@ async def merge_video_with_custom_subtitles(
         print(f"   Bold: {enable_bold}")
         print(f"   아웃라인: {outline_color} (굵기: {outline_width})")
         
-        import subprocess
-        result = subprocess.run(final_cmd, capture_output=True, text=True, timeout=300)
+        report_job_progress("8단계: 최종 영상 렌더링 중", 60, output_filename)
         
-        if result.returncode != 0:
-            error_msg = f"FFmpeg 처리 실패:\n   반환 코드: {result.returncode}\n   표준 출력: {result.stdout}\n   표준 오류: {result.stderr}"
-            print(f"❌ {error_msg}")
-            raise HTTPException(status_code=500, detail="커스텀 자막 적용 실패")
+        # 6단계 렌더 계획이 있으면 원본 클립에서 트랜지션 + BGM + TTS + 자막을 한 번에 인코딩
+        rendered_single_pass = False
+        if single_pass and render_plan_path:
+            rendered_single_pass = await asyncio.to_thread(
+                _render_final_video_from_plan,
+                render_plan_path,
+                output_path,
+                subtitle_file_path,
+                custom_style,
+                combined_tts_path
+            )
+        
+        if not rendered_single_pass:
+            result = await run_ffmpeg_async(final_cmd, timeout=300)
+            
+            if result.returncode != 0:
+                error_msg = f"FFmpeg 처리 실패:\n   반환 코드: {result.returncode}\n   표준 출력: {result.stdout}\n   표준 오류: {result.stderr}"
+                print(f"❌ {error_msg}")
+                raise HTTPException(status_code=500, detail="커스텀 자막 적용 실패")
         
         # 성공 응답
         file_size = os.path.getsize(output_path)
@@ -1790,25 +2140,33 @@ async def merge_video_with_custom_subtitles(
         print(f"✅ 커스텀 자막 비디오 생성 완료!")
         print(f"📁 파일: {output_filename} ({file_size_mb:.2f} MB)")
         
-        # 커스텀 자막 비디오 생성 완료 후 모든 파일들 정리
-        print(f"🧹 커스텀 자막 비디오 완료 - 모든 파일들 정리 중...")
-        txt_files_to_clean = [
-            "tts_file_list.txt",
-            "merged_video_list.txt",
-            "transition_video_log.txt",  # 트랜지션 로그도 정리
-            "subtitle_file_list.txt"     # 자막 파일 리스트도 정리
-        ]
+        # 자막과 최종 영상을 산출물 목록에 기록 (입력 산출물을 부모로 연결)
+        final_parents = [transition_artifact.artifact_id, combined_tts_artifact.artifact_id]
+        if os.path.exists(subtitle_file_path):
+            subtitle_artifact = await asyncio.to_thread(
+                manifest.register, project_id, KEY_SUBTITLE, "subtitle", subtitle_file_path,
+                parents=[combined_tts_artifact.artifact_id]
+            )
+            final_parents.append(subtitle_artifact.artifact_id)
+        index_media_file(output_path, role="custom_subtitle_video", project_id=project_id)
+        final_artifact = await asyncio.to_thread(
+            manifest.register,
+            project_id,
+            KEY_FINAL_VIDEO,
+            "video",
+            output_path,
+            url=f"/static/videos/{output_filename}",
+            parents=final_parents,
+            metadata={"single_pass": rendered_single_pass, "subtitle_style": custom_style}
+        )
         
-        video_dir = "static/videos"
-        srt_files_to_clean = []
+        # 커스텀 자막 비디오 생성 완료 후 임시 파일들 정리
+        print(f"🧹 커스텀 자막 비디오 완료 - 임시 파일들 정리 중...")
         
         # 타임스탬프가 포함된 TTS 리스트 파일들과 SRT 파일들도 정리
-        if os.path.exists(video_dir):
-            for file in os.listdir(video_dir):
-                if file.startswith("tts_list_") and file.endswith(".txt"):
-                    txt_files_to_clean.append(os.path.join(video_dir, file))
-                elif file.endswith(".srt"):
-                    srt_files_to_clean.append(os.path.join(video_dir, file))
+        txt_files_to_clean = [
+            entry["path"] for entry in get_media_index().query(category="videos", role="tts_list", extensions=[".txt"])
+        ]
         
         # TXT 파일들 정리
         for txt_file in txt_files_to_clean:
@@ -1823,15 +2181,7 @@ async def merge_video_with_custom_subtitles(
                 print(f"   📋 {os.path.basename(txt_file)} 파일 없음 (정리 불필요)")
         
         # SRT 파일들 삭제
-        for srt_file in srt_files_to_clean:
-            if os.path.exists(srt_file):
-                try:
-                    os.remove(srt_file)
-                    print(f"   ✅ {os.path.basename(srt_file)} 삭제 완료")
-                except Exception as e:
-                    print(f"   ⚠️ {os.path.basename(srt_file)} 삭제 실패: {e}")
-            else:
-                print(f"   📋 {os.path.basename(srt_file)} 파일 없음 (삭제 불필요)")
+        _remove_indexed_srt_files()
         
         return {
             "step": "커스텀_자막_적용",
@@ -1840,6 +2190,9 @@ async def merge_video_with_custom_subtitles(
             "output_file": f"static/videos/{output_filename}",
             "video_url": f"http://localhost:8001/static/videos/{output_filename}",
             "file_size_mb": round(file_size_mb, 2),
+            "single_pass": rendered_single_pass,
+            "project_id": project_id,
+            "artifact_id": final_artifact.artifact_id,
             "subtitle_settings": {
                 "font_name": font_name,
                 "font_size": font_size,
@@ -1861,7 +2214,7 @@ async def merge_video_with_custom_subtitles(
         raise HTTPException(status_code=500, detail=error_msg)
 
 @app.get("/bgm/status/{task_id}")
-async def check_bgm_status(task_id: str):
+async def check_bgm_status(task_id: str, project_id: Optional[str] = None):
     """
     SUNO BGM 생성 상태 확인 및 다운로드
     """
@@ -1872,7 +2225,7 @@ async def check_bgm_status(task_id: str):
             raise HTTPException(status_code=500, detail="SUNO_API_KEY가 설정되지 않았습니다.")
         
         # 태스크 상태 확인 및 다운로드
-        result = await check_suno_task_and_download(task_id)
+        result = await check_suno_task_and_download(task_id, project_id)
         
         if result["success"]:
             return {
@@ -1910,42 +2263,7 @@ def start_video_server():
     """비디오 서버 시작 함수"""
     print("🚀 비디오 서버를 시작합니다...")
     
-    # 서버 시작 시 기존 작업 파일들 정리
-    print("🧹 서버 시작 - 기존 작업 파일들 정리 중...")
-    cleanup_files = [
-        "tts_file_list.txt",
-        "merged_video_list.txt", 
-        "transition_video_log.txt",
-        "subtitle_file_list.txt"
-    ]
-    
-    for cleanup_file in cleanup_files:
-        if os.path.exists(cleanup_file):
-            try:
-                with open(cleanup_file, 'w', encoding='utf-8') as f:
-                    f.write("")  # 파일 내용 비우기
-                print(f"   ✅ {cleanup_file} 정리 완료")
-            except Exception as e:
-                print(f"   ⚠️ {cleanup_file} 정리 실패: {e}")
-        else:
-            print(f"   📋 {cleanup_file} 파일 없음")
-    
-    # SRT 파일들도 정리
-    video_dir = "static/videos"
-    if os.path.exists(video_dir):
-        srt_count = 0
-        for file in os.listdir(video_dir):
-            if file.endswith(".srt"):
-                try:
-                    os.remove(os.path.join(video_dir, file))
-                    srt_count += 1
-                except Exception as e:
-                    print(f"   ⚠️ {file} 삭제 실패: {e}")
-        if srt_count > 0:
-            print(f"   ✅ SRT 파일 {srt_count}개 정리 완료")
-        else:
-            print(f"   📋 정리할 SRT 파일 없음")
-    
+    # 기존 작업 파일(SRT) 정리는 startup 이벤트에서 미디어 인덱스 동기화 후 처리
     print("📡 서버 정보:")
     print("   - 호스트: 0.0.0.0")
     print("   - 포트: 8004")
@@ -3,21 +3,28 @@ FastAPI 웹사이트용 TTS + 배경음악 + 자막 통합 API
 """
 import asyncio
 import os
-import subprocess
 import glob
 import random
 import time
 from typing import Optional, Dict, Any, List
 from subtitle_utils import (
+    SubtitleConfig,
     create_tts_synced_subtitle_file, 
     get_korean_subtitle_style, 
-    create_precise_whisper_subtitles,
+    create_aligned_subtitles,
     create_srt_list_file,
     read_srt_list_file,
     merge_srt_files_sequentially,
     cleanup_srt_list_file
 )
-from tts_utils import create_tts_audio, get_elevenlabs_api_key
+from tts_utils import create_tts_audio, create_multiple_tts_audio, get_elevenlabs_api_key
+from ffmpeg_executor import run_ffmpeg_async
+
+def _wants_tts_timestamps(subtitle_alignment: Optional[str]) -> Optional[bool]:
+    """자막 정렬 방식이 "timestamps"면 TTS 요청시 문자 타임스탬프도 받도록 지정 (그 외는 TTS 설정값)"""
+    if (subtitle_alignment or SubtitleConfig.ALIGNMENT_MODE).lower() == "timestamps":
+        return True
+    return None
 
 async def create_multiple_videos_with_sequential_subtitles(
     video_files: List[str],
@@ -31,7 +38,8 @@ async def create_multiple_videos_with_sequential_subtitles(
     specific_bgm: Optional[str] = None,
     output_dir: str = "./static/videos",
     enable_subtitle_outline: bool = True,  # 자막 외곽선 사용 여부
-    subtitle_font_name: str = "Malgun Gothic"  # 자막 폰트명 (subtitle_utils.py와 동일)
+    subtitle_font_name: str = "Malgun Gothic",  # 자막 폰트명 (subtitle_utils.py와 동일)
+    subtitle_alignment: Optional[str] = None  # 자막 정렬 방식 ("whisper" / "local", None이면 설정값)
 ) -> Dict[str, Any]:
     """
     여러 비디오에 대해 TTS와 자막을 생성하고, srt_list.txt로 관리하여 순서대로 합치는 함수
@@ -50,6 +58,7 @@ async def create_multiple_videos_with_sequential_subtitles(
         output_dir: 출력 디렉토리
         enable_subtitle_outline: 자막 외곽선 사용 여부 (기본 True)
         subtitle_font_name: 자막 폰트명 (기본 "Malgun Gothic")
+        subtitle_alignment: 자막 정렬 방식 ("local"은 대본 + 오디오 분석, "timestamps"는 TTS 문자 타임스탬프 사용)
         
     Returns:
         Dict[str, Any]: 처리 결과
@@ -82,25 +91,22 @@ async def create_multiple_videos_with_sequential_subtitles(
                 "error": "ElevenLabs API 키를 찾을 수 없습니다."
             }
         
-        tts_results = []
-        for i, text in enumerate(tts_texts):
-            print(f"   TTS {i+1}/{len(tts_texts)}: {text[:30]}{'...' if len(text) > 30 else ''}")
-            
-            tts_result = await create_tts_audio(
-                text=text,
-                voice_id=voice_id,
-                api_key=api_key,
-                output_dir="./static/audio"
-            )
-            
+        # 공용 동시 TTS 엔진으로 모든 음성을 한 번에 생성 (결과는 텍스트 순서 유지)
+        tts_results = await create_multiple_tts_audio(
+            text_list=tts_texts,
+            voice_id=voice_id,
+            api_key=api_key,
+            output_dir="./static/audio",
+            with_timestamps=_wants_tts_timestamps(subtitle_alignment)
+        )
+        
+        for i, tts_result in enumerate(tts_results):
             if not tts_result.success:
                 return {
                     "success": False,
                     "error": f"TTS {i+1} 생성 실패: {tts_result.error}"
                 }
-            
-            tts_results.append(tts_result)
-            print(f"   ✅ TTS {i+1} 완료: {os.path.basename(tts_result.audio_file_path)} ({tts_result.duration:.2f}초)")
+            print(f"   ✅ TTS {i+1} 완료: {os.path.basename(tts_result.audio_file_path)} ({tts_result.duration or 0:.2f}초)")
         
         # 2단계: 모든 자막 생성 및 srt_list.txt 생성
         print("\n📝 2단계: 모든 자막 생성 및 SRT 목록 생성 중...")
@@ -109,16 +115,19 @@ async def create_multiple_videos_with_sequential_subtitles(
         for i, (text, tts_result) in enumerate(zip(tts_texts, tts_results)):
             print(f"   자막 {i+1}/{len(tts_texts)} 생성 중...")
             
-            # Whisper AI로 정밀 자막 생성 시도
-            whisper_result = await create_precise_whisper_subtitles(
+            # Whisper AI 또는 로컬 정렬로 정밀 자막 생성 시도
+            whisper_result = await create_aligned_subtitles(
+                text=text,
                 audio_file_path=tts_result.audio_file_path,
                 output_dir="./static/subtitles",
-                language="ko"
+                language="ko",
+                alignment_mode=subtitle_alignment,
+                max_chars=max_chars_per_line
             )
             
             if whisper_result["success"]:
                 subtitle_file = whisper_result["subtitle_file_path"]
-                print(f"   ✅ Whisper 자막 {i+1} 완료: {os.path.basename(subtitle_file)}")
+                print(f"   ✅ 정밀 자막 {i+1} 완료: {os.path.basename(subtitle_file)}")
             else:
                 # 기본 자막 생성으로 폴백
                 synced_subtitle_path = f"./static/subtitles/tts_synced_subtitle_{timestamp}_{i+1}.srt"
@@ -227,8 +236,8 @@ async def create_multiple_videos_with_sequential_subtitles(
         
         print(f"🔧 FFmpeg 실행 중... ({mode})")
         
-        # FFmpeg 실행
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # FFmpeg 실행 (공용 실행기, 이벤트 루프를 막지 않음)
+        result = await run_ffmpeg_async(cmd)
         
         if result.returncode != 0:
             return {
@@ -304,7 +313,8 @@ async def create_enhanced_video_with_tts_and_subtitles(
     specific_bgm: Optional[str] = None,
     output_dir: str = "./static/videos",
     enable_subtitle_outline: bool = True,  # 자막 외곽선 사용 여부
-    subtitle_font_name: str = "Malgun Gothic"  # 자막 폰트명 (subtitle_utils.py와 동일)
+    subtitle_font_name: str = "Malgun Gothic",  # 자막 폰트명 (subtitle_utils.py와 동일)
+    subtitle_alignment: Optional[str] = None  # 자막 정렬 방식 ("whisper" / "local", None이면 설정값)
 ) -> Dict[str, Any]:
     """
     비디오에 TTS 음성, 배경음악, 동기화된 자막을 모두 추가하는 통합 함수
@@ -323,6 +333,7 @@ async def create_enhanced_video_with_tts_and_subtitles(
         output_dir: 출력 디렉토리
         enable_subtitle_outline: 자막 외곽선 사용 여부 (기본 True)
         subtitle_font_name: 자막 폰트명 (기본 "Malgun Gothic")
+        subtitle_alignment: 자막 정렬 방식 ("local"은 대본 + 오디오 분석, "timestamps"는 TTS 문자 타임스탬프 사용)
         
     Returns:
         Dict[str, Any]: 처리 결과
@@ -360,7 +371,8 @@ async def create_enhanced_video_with_tts_and_subtitles(
             text=tts_text,
             voice_id=voice_id,
             api_key=api_key,
-            output_dir="./static/audio"
+            output_dir="./static/audio",
+            with_timestamps=_wants_tts_timestamps(subtitle_alignment)
         )
         
         if not tts_result.success:
@@ -388,17 +400,20 @@ async def create_enhanced_video_with_tts_and_subtitles(
                     print("⚠️ BGM 파일을 찾을 수 없습니다. BGM 없이 진행합니다.")
                     enable_bgm = False
         
-        # 3단계: Whisper AI로 0.1초 단위 정밀 자막 생성
-        print("\n📝 3단계: Whisper AI로 0.1초 단위 정밀 자막 생성 중...")
+        # 3단계: Whisper AI 또는 로컬 정렬로 정밀 자막 생성
+        print("\n📝 3단계: 정밀 자막 생성 중...")
         
-        whisper_result = await create_precise_whisper_subtitles(
+        whisper_result = await create_aligned_subtitles(
+            text=tts_text,
             audio_file_path=tts_result.audio_file_path,
             output_dir="./static/subtitles",
-            language="ko"
+            language="ko",
+            alignment_mode=subtitle_alignment,
+            max_chars=max_chars_per_line
         )
         
         if not whisper_result["success"]:
-            print(f"⚠️ Whisper 자막 생성 실패, 기본 자막으로 대체합니다.")
+            print(f"⚠️ 정밀 자막 생성 실패, 기본 자막으로 대체합니다.")
             # 기본 자막 생성으로 폴백
             synced_subtitle_path = f"./static/subtitles/tts_synced_subtitle_{timestamp}.srt"
             subtitle_file = create_tts_synced_subtitle_file(
@@ -411,7 +426,7 @@ async def create_enhanced_video_with_tts_and_subtitles(
             )
         else:
             subtitle_file = whisper_result["subtitle_file_path"]
-            print(f"✅ Whisper 정밀 자막 생성 완료: {os.path.basename(subtitle_file)}")
+            print(f"✅ 정밀 자막 생성 완료: {os.path.basename(subtitle_file)}")
             print(f"   자막 개수: {whisper_result['subtitle_count']}개")
             print(f"   타이밍: {whisper_result['first_timing']} ~ {whisper_result['last_timing']}")
             print(f"   텍스트: {whisper_result['transcription'][:50]}{'...' if len(whisper_result['transcription']) > 50 else ''}")
@@ -479,8 +494,8 @@ async def create_enhanced_video_with_tts_and_subtitles(
         
         print(f"🔧 FFmpeg 실행 중... ({mode})")
         
-        # FFmpeg 실행
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # FFmpeg 실행 (공용 실행기, 이벤트 루프를 막지 않음)
+        result = await run_ffmpeg_async(cmd)
         
         if result.returncode != 0:
             return {
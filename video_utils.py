@@ -3,6 +3,7 @@
 """
 import asyncio  # 비동기 처리를 위한 모듈
 import os  # 환경변수 읽기용
+import time  # 소요 시간 측정용
 from typing import List, Optional  # 타입 힌트용
 from video_models import VideoGenerationResult, VideoConfig  # 데이터 모델 import
 
@@ -140,77 +141,207 @@ async def create_video_with_runway(
         print("❌ 영상 생성 시간 초과")  # 타임아웃 메시지 출력
         raise Exception("영상 생성 시간 초과 (10분)")  # 타임아웃 예외 발생
 
-async def generate_videos_from_images(
+RUNWAY_BASE_URL = "https://api.dev.runwayml.com/v1"  # Runway API 기본 주소
+
+async def _submit_runway_task(
+    client,  # 공유 httpx.AsyncClient
+    headers: dict,  # 인증 헤더
+    payload: dict,  # image_to_video 요청 데이터
+    max_retries: int = 3  # 429(요청 한도 초과) 응답시 재시도 횟수
+) -> str:  # 리턴: Runway 작업 ID
+    """Runway image_to_video 작업을 제출하고 작업 ID 반환 (429 응답은 잠시 대기 후 재시도)"""
+    for retry in range(max_retries + 1):  # 최초 시도 + 재시도
+        response = await client.post(f"{RUNWAY_BASE_URL}/image_to_video", headers=headers, json=payload)
+        
+        if response.status_code == 429 and retry < max_retries:  # 동시 작업 한도 초과
+            wait_seconds = float(response.headers.get("Retry-After", 5 * (retry + 1)))  # 서버 권장 대기 시간 우선
+            print(f"   ⏳ Runway 요청 한도 초과, {wait_seconds:.0f}초 후 재시도 ({retry + 1}/{max_retries})")
+            await asyncio.sleep(wait_seconds)
+            continue
+        
+        if response.status_code != 200:  # 요청이 실패한 경우
+            raise Exception(f"영상 생성 요청 실패: {response.status_code} - {response.text}")
+        
+        task_id = response.json().get("id")  # 작업 ID 추출
+        if not task_id:
+            raise Exception("작업 ID를 받을 수 없습니다.")
+        return task_id
+    
+    raise Exception("영상 생성 요청 실패: 요청 한도 초과")
+
+async def _poll_runway_task(
+    client,  # 공유 httpx.AsyncClient
+    headers: dict,  # 인증 헤더
+    task_id: str,  # 확인할 작업 ID
+    scene_num: int,  # 로그용 장면 번호
+    poll_interval: float = VideoConfig.RUNWAY_POLL_INTERVAL,  # 상태 확인 간격 (초)
+    max_attempts: int = VideoConfig.RUNWAY_MAX_POLL_ATTEMPTS  # 최대 상태 확인 횟수
+) -> str:  # 리턴: 생성된 영상 URL
+    """Runway 작업이 끝날 때까지 상태를 확인하고 영상 URL 반환"""
+    for attempt in range(max_attempts):
+        await asyncio.sleep(poll_interval)  # 다른 장면 작업들과 번갈아 가며 대기
+        
+        status_response = await client.get(f"{RUNWAY_BASE_URL}/tasks/{task_id}", headers=headers)
+        if status_response.status_code != 200:  # 상태 확인 실패시 다음 주기에 재시도
+            print(f"   ⚠️ 장면 {scene_num} 상태 확인 실패: {status_response.status_code}")
+            continue
+        
+        status_data = status_response.json()
+        status = status_data.get("status")  # PENDING, RUNNING, SUCCEEDED, FAILED 등
+        
+        if status == "SUCCEEDED":
+            video_output = status_data.get("output")
+            if not video_output:
+                raise Exception("영상 URL을 찾을 수 없습니다.")
+            # Runway API는 때때로 영상 URL을 리스트로 반환함
+            return video_output[0] if isinstance(video_output, list) else video_output
+        elif status == "FAILED":
+            error_msg = status_data.get("failure") or status_data.get("error", "알 수 없는 오류")
+            raise Exception(f"생성 실패: {error_msg}")
+        elif status in ["PENDING", "RUNNING", "THROTTLED"]:
+            progress = status_data.get("progress", 0) or 0
+            print(f"   ⏳ 장면 {scene_num} 진행 중... ({attempt + 1}/{max_attempts}) 상태: {status}, 진행도: {progress}")
+        else:
+            raise Exception(f"알 수 없는 작업 상태: {status}")
+    
+    raise Exception(f"영상 생성 시간 초과 ({int(poll_interval * max_attempts)}초)")
+
+async def generate_videos_concurrently(
     image_urls: List[str],  # 변환할 이미지 URL들의 리스트
     duration_per_scene: int = VideoConfig.DEFAULT_DURATION,  # 각 영상의 길이 (기본값 5초)
-    resolution: str = f"{VideoConfig.RESOLUTION_WIDTH}:{VideoConfig.RESOLUTION_HEIGHT}",  # 해상도 (기본값 768:1280)
-    api_key: str = None  # Runway API 인증키
-) -> List[VideoGenerationResult]:  # 리턴: 각 영상 생성 결과를 담은 리스트
+    resolution: str = f"{VideoConfig.RESOLUTION_WIDTH}:{VideoConfig.RESOLUTION_HEIGHT}",  # 해상도
+    model: str = "gen4_image",  # Runway AI 모델명
+    seed: Optional[int] = None,  # 시드값 (선택사항)
+    api_key: str = None,  # Runway API 인증키
+    max_concurrency: int = VideoConfig.RUNWAY_MAX_CONCURRENCY,  # 동시에 진행할 작업 수
+    poll_interval: float = VideoConfig.RUNWAY_POLL_INTERVAL,  # 상태 확인 간격 (초)
+    max_attempts: int = VideoConfig.RUNWAY_MAX_POLL_ATTEMPTS,  # 최대 상태 확인 횟수
+    failure_status: str = "failed"  # 실패한 장면에 기록할 상태 문자열
+) -> List[VideoGenerationResult]:  # 리턴: 장면 순서대로 정렬된 결과 리스트
     """
-    여러 이미지를 순차적으로 영상으로 변환
+    여러 이미지를 Runway API로 동시에 영상 변환 (동시 작업 수 제한)
+    
+    모든 장면 작업을 최대 max_concurrency개까지 한꺼번에 제출하고 함께 폴링합니다.
+    하나의 HTTP 클라이언트를 공유하며, 결과는 완료 순서와 관계없이 장면 순서로 반환됩니다.
     
     Args:
         image_urls: 이미지 URL 리스트
         duration_per_scene: 각 영상의 길이 (초)
         resolution: 해상도
+        model: Runway 영상 모델
+        seed: 시드값 (선택사항)
         api_key: Runway API 키
+        max_concurrency: 동시에 진행할 최대 작업 수
+        poll_interval: 상태 확인 간격 (초)
+        max_attempts: 작업당 최대 상태 확인 횟수
+        failure_status: 실패 결과의 status 값
         
     Returns:
-        List[VideoGenerationResult]: 각 영상 생성 결과
+        List[VideoGenerationResult]: 장면 순서대로 정렬된 영상 생성 결과
     """
+    import httpx  # HTTP 클라이언트 라이브러리
+    
     if not api_key:  # API 키가 없으면 에러 발생
         raise ValueError("Runway API 키가 필요합니다.")
     
     if not image_urls:  # 이미지 URL 리스트가 비어있으면 에러 발생
         raise ValueError("이미지 URL이 하나 이상 필요합니다.")
     
-    results = []  # 각 영상 생성 결과를 저장할 리스트
-    successful_count = 0  # 성공한 영상 개수 카운터
-    failed_count = 0  # 실패한 영상 개수 카운터
+    max_concurrency = max(1, max_concurrency)  # 최소 1개는 진행
+    semaphore = asyncio.Semaphore(max_concurrency)  # 동시에 진행 중인 작업 수 제한
+    
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "X-Runway-Version": "2024-11-06"
+    }
     
-    print(f"🎬 총 {len(image_urls)}개 이미지를 영상으로 변환을 시작합니다...")  # 전체 작업 시작 메시지
-    print(f"   설정: {duration_per_scene}초씩, {resolution} 해상도")  # 설정 정보 출력
+    print(f"🎬 총 {len(image_urls)}개 이미지를 동시에 영상으로 변환합니다 (최대 동시 작업: {max_concurrency}개)")
+    print(f"   설정: {model}, {duration_per_scene}초씩, {resolution} 해상도")
     
-    for i, image_url in enumerate(image_urls):  # 각 이미지 URL에 대해 순차적으로 처리
-        scene_num = i + 1  # 씬 번호 (1부터 시작)
-        print(f"\n⏳ 영상 {scene_num}/{len(image_urls)} 생성 시작...")  # 현재 처리 중인 영상 번호 출력
+    async def run_scene(client, scene_num: int, image_url: str) -> VideoGenerationResult:
+        payload = {
+            "promptImage": image_url,
+            "model": model,
+            "duration": duration_per_scene,
+            "ratio": resolution
+        }
+        if seed is not None:
+            payload["seed"] = seed
         
-        try:  # 영상 생성 시도
-            video_url = await create_video_with_runway(  # 위에서 정의한 함수 호출
-                image_url=image_url,  # 현재 처리할 이미지 URL
-                duration=duration_per_scene,  # 영상 길이
-                resolution=resolution,  # 해상도
-                api_key=api_key  # API 키
-            )
-            
-            print(f"✅ 영상 {scene_num} 생성 완료!")  # 성공 메시지 출력
-            result = VideoGenerationResult(  # 성공 결과 객체 생성
-                scene_number=scene_num,  # 씬 번호
-                status="success",  # 상태: 성공
-                video_url=video_url,  # 생성된 영상 URL
-                error=None,  # 에러 없음
-                duration=duration_per_scene,  # 영상 길이
-                resolution=resolution  # 해상도
-            )
-            results.append(result)  # 결과 리스트에 추가
-            successful_count += 1  # 성공 카운터 증가
-            
-        except Exception as e:  # 영상 생성 실패한 경우
-            print(f"❌ 영상 {scene_num} 생성 실패: {e}")  # 실패 메시지 출력
-            result = VideoGenerationResult(  # 실패 결과 객체 생성
-                scene_number=scene_num,  # 씬 번호
-                status="failed",  # 상태: 실패
-                video_url=None,  # 영상 URL 없음
-                error=str(e),  # 에러 메시지 저장
-                duration=duration_per_scene,  # 영상 길이 (설정값)
-                resolution=resolution  # 해상도 (설정값)
-            )
-            results.append(result)  # 결과 리스트에 추가 (실패해도 기록)
-            failed_count += 1  # 실패 카운터 증가
+        async with semaphore:  # 제출부터 완료까지 슬롯 하나를 점유
+            try:
+                task_id = await _submit_runway_task(client, headers, payload)
+                print(f"📤 장면 {scene_num} 작업 제출 완료 - 작업 ID: {task_id}")
+                
+                video_url = await _poll_runway_task(
+                    client, headers, task_id, scene_num,
+                    poll_interval=poll_interval, max_attempts=max_attempts
+                )
+                print(f"✅ 장면 {scene_num} 영상 생성 완료: {video_url}")
+                return VideoGenerationResult(
+                    scene_number=scene_num,
+                    status="success",
+                    video_url=video_url,
+                    duration=duration_per_scene,
+                    resolution=resolution
+                )
+            except Exception as e:  # 한 장면의 실패가 다른 장면에 영향을 주지 않도록 결과로 기록
+                print(f"❌ 장면 {scene_num} 영상 생성 실패: {e}")
+                return VideoGenerationResult(
+                    scene_number=scene_num,
+                    status=failure_status,
+                    video_url=None,
+                    error=str(e),
+                    duration=duration_per_scene,
+                    resolution=resolution
+                )
+    
+    start_time = time.time()
+    limits = httpx.Limits(max_connections=max_concurrency * 2, max_keepalive_connections=max_concurrency)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:  # 모든 장면이 연결 풀을 공유
+        results = await asyncio.gather(*[
+            run_scene(client, i, image_url) for i, image_url in enumerate(image_urls, 1)
+        ])  # gather는 입력 순서를 유지하므로 결과가 장면 순서대로 정렬됨
+    
+    successful_count = sum(1 for r in results if r.status == "success")
+    print(f"\n🎉 영상 생성 완료! ({time.time() - start_time:.1f}초 소요)")
+    print(f"   성공: {successful_count}/{len(image_urls)}")
+    print(f"   실패: {len(image_urls) - successful_count}/{len(image_urls)}")
+    
+    return list(results)
+
+async def generate_videos_from_images(
+    image_urls: List[str],  # 변환할 이미지 URL들의 리스트
+    duration_per_scene: int = VideoConfig.DEFAULT_DURATION,  # 각 영상의 길이 (기본값 5초)
+    resolution: str = f"{VideoConfig.RESOLUTION_WIDTH}:{VideoConfig.RESOLUTION_HEIGHT}",  # 해상도 (기본값 768:1280)
+    api_key: str = None,  # Runway API 인증키
+    max_concurrency: int = VideoConfig.RUNWAY_MAX_CONCURRENCY  # 동시에 진행할 작업 수
+) -> List[VideoGenerationResult]:  # 리턴: 각 영상 생성 결과를 담은 리스트
+    """
+    여러 이미지를 영상으로 변환 (generate_videos_concurrently 사용)
+    
+    Args:
+        image_urls: 이미지 URL 리스트
+        duration_per_scene: 각 영상의 길이 (초)
+        resolution: 해상도
+        api_key: Runway API 키
+        max_concurrency: 동시에 진행할 최대 작업 수
+        
+    Returns:
+        List[VideoGenerationResult]: 각 영상 생성 결과 (장면 순서)
+    """
+    results = await generate_videos_concurrently(
+        image_urls=image_urls,
+        duration_per_scene=duration_per_scene,
+        resolution=resolution,
+        model="gen4_image",  # create_video_with_runway와 동일한 기본 모델
+        api_key=api_key,
+        max_concurrency=max_concurrency,
+        failure_status="failed"
+    )
     
-    print(f"\n🎉 영상 생성 완료!")  # 전체 작업 완료 메시지
-    print(f"   성공: {successful_count}/{len(image_urls)}")  # 성공/전체 비율 출력
-    print(f"   실패: {failed_count}/{len(image_urls)}")  # 실패/전체 비율 출력
+    successful_count = sum(1 for r in results if r.status == "success")
     print(f"   총 영상 길이: {successful_count * duration_per_scene}초")  # 성공한 영상들의 총 길이
     
     return results  # 모든 결과 리스트 반환
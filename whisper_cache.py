@@ -0,0 +1,134 @@
+"""
+Whisper 전사 결과 디스크 캐시
+같은 오디오(내용 해시)를 같은 언어/형식/모델로 다시 전사하지 않도록 SRT/JSON 응답을 저장
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+import httpx
+
+from file_hash import file_sha256
+
+WHISPER_API_URL = "https://api.openai.com/v1/audio/transcriptions"
+
+
+class WhisperTranscriptCache:
+    """(오디오 SHA-256, 언어, 응답 형식, 모델) 기준 Whisper 응답 캐시"""
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(audio_sha256: str, language: Optional[str], response_format: str, model: str, **options) -> str:
+        """캐시 키 생성 (temperature 등 결과에 영향을 주는 추가 옵션도 포함)"""
+        key_source = json.dumps({
+            "audio_sha256": audio_sha256,
+            "language": language or "auto",
+            "response_format": response_format,
+            "model": model,
+            "options": options
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 응답 본문 반환 (없으면 None)"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, content: str):
+        """응답 본문 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Whisper 캐시 저장 실패: {e}")
+
+
+_whisper_cache: Optional[WhisperTranscriptCache] = None
+
+
+def get_whisper_cache() -> Optional[WhisperTranscriptCache]:
+    """환경 설정에 따라 공용 Whisper 캐시 인스턴스 반환 (비활성화시 None)"""
+    global _whisper_cache
+    if os.getenv("WHISPER_CACHE_ENABLED", "true").lower() == "false":
+        return None
+    if _whisper_cache is None:
+        _whisper_cache = WhisperTranscriptCache(os.getenv("WHISPER_CACHE_DIR", os.path.join("cache", "whisper")))
+    return _whisper_cache
+
+
+async def transcribe_with_cache(
+    audio_file_path: str,
+    api_key: str,
+    response_format: str = "srt",
+    language: Optional[str] = None,
+    model: str = "whisper-1",
+    timeout: float = 120.0,
+    **options
+) -> str:
+    """
+    Whisper API 전사 (캐시 적중시 네트워크 호출 없이 저장된 응답 반환)
+
+    Args:
+        audio_file_path: 전사할 오디오 파일 경로
+        api_key: OpenAI API 키
+        response_format: 응답 형식 (srt, vtt, json, verbose_json, text)
+        language: 언어 코드 (None이면 자동 감지)
+        model: Whisper 모델명
+        timeout: 요청 타임아웃 (초)
+        **options: temperature 등 추가 요청 파라미터
+
+    Returns:
+        str: Whisper 응답 본문 (SRT/VTT 텍스트 또는 JSON 문자열)
+    """
+    cache = get_whisper_cache()
+    cache_key = None
+    if cache:
+        cache_key = cache.make_key(file_sha256(audio_file_path), language, response_format, model, **options)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"♻️ Whisper 캐시 적중: {os.path.basename(audio_file_path)} ({response_format})")
+            return cached
+
+    data = {"model": model, "response_format": response_format}
+    if language:
+        data["language"] = language
+    data.update(options)
+
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        with open(audio_file_path, "rb") as audio_file:
+            files = {"file": (os.path.basename(audio_file_path), audio_file, "audio/mpeg")}
+            response = await client.post(
+                WHISPER_API_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                files=files,
+                data=data
+            )
+
+    if response.status_code != 200:
+        raise Exception(f"Whisper API 요청 실패: {response.status_code} - {response.text}")
+
+    content = response.text
+    if cache and cache_key and content.strip():
+        cache.put(cache_key, content)
+    return content
@@ -11,6 +11,7 @@ import os
 from dotenv import load_dotenv
 import asyncio
 import httpx
+from rate_limiter import TokenBucketLimiter, get_retry_after
 
 # LangChain imports
 # 
@@ -24,6 +25,10 @@ load_dotenv()
 # OpenAI API 키 가져오기
 OpenAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# DALL-E 3 동시 생성 설정 (계정 등급에 맞게 환경 변수로 조정)
+DALLE_MAX_CONCURRENCY = int(os.getenv("DALLE_MAX_CONCURRENCY", "5"))  # 동시에 보낼 최대 요청 수
+DALLE_REQUESTS_PER_MINUTE = int(os.getenv("DALLE_REQUESTS_PER_MINUTE", "7"))  # 분당 요청 한도
+
 # 비용 효율적인 LLM 설정
 # 텍스트 생성용 - 사용자가 요청한 모델로 변경
 text_llm = ChatOpenAI(
@@ -530,6 +535,125 @@ async def generate_images_sequentially(
     return generated_images
 
 
+async def _generate_single_dalle_image(
+    client: httpx.AsyncClient,
+    scene_number: int,
+    scene: SceneImagePrompt,
+    headers: Dict,
+    limiter: TokenBucketLimiter,
+    max_retries: int = 3
+) -> Dict:
+    """장면 하나의 DALL-E 3 이미지를 생성합니다. 429 응답은 속도 제한기에 반영한 뒤 재시도합니다."""
+    payload = {
+        "model": "dall-e-3",
+        "prompt": scene.prompt_text,
+        "n": 1,
+        "size": "1024x1024",  # DALL-E 3 지원 크기
+        "quality": "standard",
+        "response_format": "url"
+    }
+    
+    try:
+        for attempt in range(max_retries + 1):
+            await limiter.acquire()
+            print(f"🎨 [장면 {scene_number}] DALL-E 3 API 요청: {scene.prompt_text[:50]}...")
+            response = await client.post("https://api.openai.com/v1/images/generations", headers=headers, json=payload)
+            limiter.update_from_headers(response.headers)
+            
+            if response.status_code == 429 and attempt < max_retries:
+                limiter.penalize(get_retry_after(response.headers) or 5 * (attempt + 1))
+                continue
+            
+            if response.status_code != 200:
+                error_text = response.text
+                print(f"❌ [장면 {scene_number}] DALL-E 3 API 오류: {error_text}")
+                return {
+                    "scene_number": scene_number,
+                    "status": "error",
+                    "error": f"DALL-E 3 API 요청 실패: {error_text}",
+                    "prompt": scene.prompt_text
+                }
+            
+            response_data = response.json()
+            if "data" in response_data and len(response_data["data"]) > 0:
+                image_url = response_data["data"][0]["url"]
+                revised_prompt = response_data["data"][0].get("revised_prompt", scene.prompt_text)
+                print(f"✅ [장면 {scene_number}] DALL-E 3 이미지 생성 완료!")
+                return {
+                    "scene_number": scene_number,
+                    "status": "success",
+                    "image_url": image_url,
+                    "url": image_url,  # 호환성을 위한 필드
+                    "generated_image_url": image_url,  # 호환성을 위한 필드
+                    "original_prompt": scene.prompt_text,
+                    "revised_prompt": revised_prompt,
+                    "model": "dall-e-3"
+                }
+            
+            print(f"❌ [장면 {scene_number}] DALL-E 3 응답에 이미지 데이터 없음")
+            return {
+                "scene_number": scene_number,
+                "status": "error",
+                "error": "DALL-E 3 응답에 이미지 데이터 없음",
+                "prompt": scene.prompt_text
+            }
+    except Exception as e:
+        print(f"❌ [장면 {scene_number}] 처리 중 오류 발생: {e}")
+        return {
+            "scene_number": scene_number,
+            "status": "error",
+            "error": str(e),
+            "prompt": scene.prompt_text
+        }
+
+
+async def generate_images_concurrently(
+    scenes: List[SceneImagePrompt],
+    api_key: str,
+    max_concurrency: int = DALLE_MAX_CONCURRENCY,
+    requests_per_minute: int = DALLE_REQUESTS_PER_MINUTE
+) -> List[Dict]:
+    """
+    여러 장면 프롬프트의 DALL-E 3 이미지를 동시에 생성합니다.
+    
+    하나의 연결 풀을 공유하고, 고정 대기 대신 rate-limit 헤더와 429 응답을 반영하는
+    토큰 버킷으로 호출 속도를 조절합니다. 결과는 scene_number 순서로 반환합니다.
+    """
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    total_scenes = len(scenes)
+    max_concurrency = max(1, max_concurrency)
+    
+    print(f"\n🚀 총 {total_scenes}개의 이미지를 DALL-E 3으로 동시 생성 시작... (최대 동시 요청: {max_concurrency}개)")
+    
+    limiter = TokenBucketLimiter(requests_per_minute, capacity=max_concurrency, name="DALL-E 3")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    
+    async def run_scene(client: httpx.AsyncClient, scene_number: int, scene: SceneImagePrompt) -> Dict:
+        async with semaphore:
+            return await _generate_single_dalle_image(client, scene_number, scene, headers, limiter)
+    
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        generated_images = await asyncio.gather(*[
+            run_scene(client, i + 1, scene) for i, scene in enumerate(scenes)
+        ])
+    
+    generated_images = sorted(generated_images, key=lambda img: img["scene_number"])
+    
+    print(f"\n🎉 모든 DALL-E 3 이미지 생성 작업 완료!")
+    
+    # 결과 통계
+    successful_count = sum(1 for img in generated_images if img.get("status") == "success")
+    failed_count = total_scenes - successful_count
+    
+    print(f"📊 생성 결과 통계:")
+    print(f"   ✅ 성공: {successful_count}개")
+    print(f"   ❌ 실패: {failed_count}개")
+    if total_scenes:
+        print(f"   📈 성공률: {(successful_count / total_scenes) * 100:.1f}%")
+    
+    return generated_images
+
 # ==================================================================================
 """참조 이미지 분석 : 참조 이미지를 분석해 광고 콘셉트 및 크리에이티브 방향성을 도출"""
 